@@ -94,6 +94,29 @@ DATABASES = {
     }
 }
 
+# Cache
+# LocMemCache descarta as entradas menos usadas ao passar de MAX_ENTRIES.
+# O alias "reports" guarda os relatorios exportados, separado do cache padrao.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'financemartins-default',
+    },
+    'reports': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'financemartins-reports',
+        'TIMEOUT': 60 * 60,
+        'OPTIONS': {'MAX_ENTRIES': 200},
+    },
+}
+
+# Atualizacoes ao vivo (SSE em /api/live/, so sob ASGI)
+# Com varios workers, defina um intervalo > 0 para cada stream consultar a UserDataVersion
+# e avisar sobre escritas feitas em outros processos.
+
+LIVE_UPDATES_DB_POLL_SECONDS = int(os.getenv('LIVE_UPDATES_DB_POLL_SECONDS', 0))
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -136,6 +159,14 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Entrega de comprovantes
+# Com 'x-accel-redirect' (nginx) ou 'x-sendfile' (Apache/lighttpd) o Django so confere o dono
+# e o servidor web envia o arquivo. No nginx, a location de RECEIPT_SENDFILE_PREFIX precisa
+# ser 'internal' e apontar para o MEDIA_ROOT. Vazio: o proprio Django envia.
+
+RECEIPT_SENDFILE_MODE = os.getenv('RECEIPT_SENDFILE_MODE', '')
+RECEIPT_SENDFILE_PREFIX = os.getenv('RECEIPT_SENDFILE_PREFIX', '/protected-media/')
+
 LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/login/'
@@ -1,6 +1,16 @@
 from django.contrib import admin
 
-from .models import Bank, Event, Payable, PayableCategory, Transaction, UserDashboardLayout
+from .models import (
+    Bank,
+    Event,
+    MonthlyBankBalance,
+    Payable,
+    PayableCategory,
+    Receipt,
+    ReportJob,
+    Transaction,
+    UserDashboardLayout,
+)
 
 
 @admin.register(Bank)
@@ -40,3 +50,23 @@ class PayableCategoryAdmin(admin.ModelAdmin):
 class UserDashboardLayoutAdmin(admin.ModelAdmin):
     list_display = ("user", "updated_at")
     search_fields = ("user__username", "user__email")
+
+
+@admin.register(MonthlyBankBalance)
+class MonthlyBankBalanceAdmin(admin.ModelAdmin):
+    list_display = ("owner", "bank", "month", "income", "expense", "income_count", "expense_count")
+    list_filter = ("month",)
+    search_fields = ("owner__username", "bank__name")
+
+
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    list_display = ("file_name", "owner", "report_format", "status", "created_at", "finished_at")
+    list_filter = ("status", "report_type", "report_format")
+    search_fields = ("file_name", "owner__username")
+
+
+@admin.register(Receipt)
+class ReceiptAdmin(admin.ModelAdmin):
+    list_display = ("sha256", "owner", "size", "ref_count", "created_at")
+    search_fields = ("sha256", "owner__username")
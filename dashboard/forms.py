@@ -54,6 +54,9 @@ class PayableForm(forms.ModelForm):
             self.fields["category"].queryset = (
                 PayableCategory.objects.filter(owner=user) if user else PayableCategory.objects.none()
             )
+        if "recurrence_period" in self.fields:
+            # Clientes antigos nao enviam a periodicidade; vale a mensal.
+            self.fields["recurrence_period"].required = False
 
     class Meta:
         model = Payable
@@ -71,6 +74,7 @@ class PayableForm(forms.ModelForm):
             "installment_number",
             "installment_total",
             "is_recurring",
+            "recurrence_period",
         ]
         widgets = {
             "due_date": forms.DateInput(attrs={"type": "date"}),
@@ -125,6 +129,9 @@ class PayableForm(forms.ModelForm):
 
         if payable_type != Payable.PayableType.SUBSCRIPTION:
             cleaned_data["is_recurring"] = False
+        cleaned_data["recurrence_period"] = (
+            cleaned_data.get("recurrence_period") or Payable.RecurrencePeriod.MONTHLY
+        )
 
         status = cleaned_data.get("status")
         if status == Payable.PayableStatus.PAID:
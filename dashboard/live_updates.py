@@ -0,0 +1,53 @@
+import asyncio
+from collections import defaultdict
+import threading
+
+
+class LiveUpdateBroker:
+    # Pub/sub em memoria: cada conexao SSE tem uma fila no loop do proprio worker ASGI.
+    # As publicacoes vem de signals (threads sincronas), por isso o call_soon_threadsafe.
+
+    def __init__(self, max_queue_size=100):
+        self.max_queue_size = max_queue_size
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, user_id):
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(maxsize=self.max_queue_size))
+        with self._lock:
+            self._subscribers[user_id].add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, user_id, subscriber):
+        with self._lock:
+            user_subscribers = self._subscribers.get(user_id)
+            if not user_subscribers:
+                return
+            user_subscribers.discard(subscriber)
+            if not user_subscribers:
+                del self._subscribers[user_id]
+
+    def subscriber_count(self, user_id):
+        with self._lock:
+            return len(self._subscribers.get(user_id, ()))
+
+    def publish(self, user_id, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for subscriber in subscribers:
+            loop, queue = subscriber
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, message)
+            except RuntimeError:
+                # Loop ja encerrado: a conexao morreu sem passar pelo unsubscribe.
+                self.unsubscribe(user_id, subscriber)
+
+    @staticmethod
+    def _offer(queue, message):
+        if queue.full():
+            # Cliente lento: descarta a notificacao mais antiga, o /api/sync/ cobre a diferenca.
+            queue.get_nowait()
+        queue.put_nowait(message)
+
+
+live_update_broker = LiveUpdateBroker()
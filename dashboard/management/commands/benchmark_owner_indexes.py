@@ -0,0 +1,173 @@
+from datetime import timedelta
+from decimal import Decimal
+import random
+import time
+from uuid import uuid4
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from dashboard.models import Bank, Event, Payable, Transaction
+
+
+BENCHMARK_USERNAME_PREFIX = "benchmark-indexes-"
+INDEXED_MODELS = [Transaction, Payable, Event]
+
+
+class Command(BaseCommand):
+    help = (
+        "Gera uma massa sintetica e mostra os planos EXPLAIN das consultas por owner "
+        "com e sem os indices compostos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000, help="Total de transacoes e de contas sinteticas.")
+        parser.add_argument("--users", type=int, default=50, help="Quantidade de usuarios sinteticos.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--compare",
+            action="store_true",
+            help="Remove temporariamente os indices compostos para comparar os planos antes/depois.",
+        )
+        parser.add_argument("--skip-seed", action="store_true", help="Reaproveita a massa ja gerada.")
+        parser.add_argument("--cleanup", action="store_true", help="Remove os usuarios sinteticos e sai.")
+
+    def handle(self, *args, **options):
+        user_model = get_user_model()
+        if options["cleanup"]:
+            deleted, _details = user_model.objects.filter(username__startswith=BENCHMARK_USERNAME_PREFIX).delete()
+            self.stdout.write(self.style.SUCCESS(f"Registros removidos: {deleted}"))
+            return
+
+        users = self._get_benchmark_users(options["users"])
+        if not options["skip_seed"]:
+            self._seed(users, options["rows"], options["batch_size"])
+
+        target_user = users[0]
+        if options["compare"]:
+            self.stdout.write(self.style.MIGRATE_HEADING("== Sem indices compostos =="))
+            with connection.schema_editor() as schema_editor:
+                for model in INDEXED_MODELS:
+                    for index in model._meta.indexes:
+                        schema_editor.remove_index(model, index)
+            try:
+                self._explain_queries(target_user)
+            finally:
+                with connection.schema_editor() as schema_editor:
+                    for model in INDEXED_MODELS:
+                        for index in model._meta.indexes:
+                            schema_editor.add_index(model, index)
+
+        self.stdout.write(self.style.MIGRATE_HEADING("== Com indices compostos =="))
+        self._explain_queries(target_user)
+
+    def _get_benchmark_users(self, total_users):
+        user_model = get_user_model()
+        users = []
+        for index in range(max(1, total_users)):
+            user, _created = user_model.objects.get_or_create(username=f"{BENCHMARK_USERNAME_PREFIX}{index}")
+            users.append(user)
+        return users
+
+    def _seed(self, users, total_rows, batch_size):
+        today = timezone.localdate()
+        banks = {}
+        for user in users:
+            bank, _created = Bank.objects.get_or_create(
+                owner=user,
+                slug="benchmark",
+                defaults={"name": "Benchmark"},
+            )
+            banks[user.id] = bank
+
+        existing_rows = Transaction.objects.filter(owner__in=users).count()
+        rows_to_create = max(0, total_rows - existing_rows)
+        self.stdout.write(f"Gerando {rows_to_create} transacoes, contas e {rows_to_create // 10} eventos...")
+
+        created = 0
+        while created < rows_to_create:
+            current_batch = min(batch_size, rows_to_create - created)
+            transactions = []
+            payables = []
+            events = []
+            for offset in range(current_batch):
+                user = users[(created + offset) % len(users)]
+                day_offset = random.randint(-1800, 365)
+                amount = Decimal(random.randint(100, 500000)) / 100
+                transactions.append(
+                    Transaction(
+                        owner=user,
+                        bank=banks[user.id],
+                        title=f"Transacao {created + offset}",
+                        transaction_type=random.choice(Transaction.TransactionType.values),
+                        amount=amount,
+                        transaction_date=today + timedelta(days=day_offset),
+                    )
+                )
+                payables.append(
+                    Payable(
+                        owner=user,
+                        bank=banks[user.id],
+                        title=f"Conta {created + offset}",
+                        payable_type=Payable.PayableType.INSTALLMENT,
+                        status=random.choice(Payable.PayableStatus.values),
+                        amount=amount,
+                        due_date=today + timedelta(days=day_offset),
+                        installment_number=1,
+                        installment_total=1,
+                        installment_group=uuid4(),
+                    )
+                )
+                if (created + offset) % 10 == 0:
+                    events.append(
+                        Event(
+                            owner=user,
+                            title=f"Evento {created + offset}",
+                            starts_at=timezone.now() + timedelta(days=day_offset),
+                        )
+                    )
+            Transaction.objects.bulk_create(transactions, batch_size=batch_size)
+            Payable.objects.bulk_create(payables, batch_size=batch_size)
+            Event.objects.bulk_create(events, batch_size=batch_size)
+            created += current_batch
+            self.stdout.write(f"  {created}/{rows_to_create}")
+
+    def _explain_queries(self, user):
+        today = timezone.localdate()
+        sample_group = (
+            Payable.objects.filter(owner=user, installment_group__isnull=False)
+            .values_list("installment_group", flat=True)
+            .first()
+        )
+        queries = [
+            (
+                "Transacoes do dashboard (owner, -transaction_date, -id)",
+                Transaction.objects.filter(owner=user).order_by("-transaction_date", "-id")[:100],
+            ),
+            (
+                "Relatorio de contas (owner, due_date, id)",
+                Payable.objects.filter(owner=user).order_by("due_date", "id")[:100],
+            ),
+            (
+                "Contas pendentes vencendo (owner, status, due_date)",
+                Payable.objects.filter(owner=user, status=Payable.PayableStatus.PENDING, due_date__lte=today)
+                .order_by("due_date")[:100],
+            ),
+            (
+                "Parcelas de um grupo (owner, installment_group, installment_number)",
+                Payable.objects.filter(owner=user, installment_group=sample_group).order_by("installment_number"),
+            ),
+            (
+                "Eventos da agenda (owner, starts_at)",
+                Event.objects.filter(owner=user).order_by("starts_at", "id")[:100],
+            ),
+        ]
+        for label, queryset in queries:
+            started_at = time.perf_counter()
+            list(queryset)
+            elapsed_ms = (time.perf_counter() - started_at) * 1000
+            self.stdout.write(self.style.HTTP_INFO(f"-- {label} ({elapsed_ms:.1f} ms)"))
+            self.stdout.write(queryset.explain())
+            self.stdout.write("")
@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from dashboard.models import DEFAULT_BANKS, Bank, Payable
+from dashboard.views import normalize_legacy_installments
+
+
+class Command(BaseCommand):
+    help = (
+        "Cria os bancos padrao para usuarios sem banco e agrupa as parcelas legadas "
+        "(sem installment_group) de todos os usuarios, em lotes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=200, help="Usuarios processados por lote.")
+        parser.add_argument(
+            "--start-after",
+            type=int,
+            default=0,
+            help="Retoma a partir do usuario seguinte a este id (mostrado no progresso).",
+        )
+        parser.add_argument("--skip-banks", action="store_true", help="Nao cria bancos padrao.")
+        parser.add_argument("--skip-installments", action="store_true", help="Nao normaliza parcelas legadas.")
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        if not options["skip_banks"]:
+            self._bootstrap_banks(batch_size, options["start_after"])
+        if not options["skip_installments"]:
+            self._normalize_installments(batch_size, options["start_after"])
+
+    def _bootstrap_banks(self, batch_size, start_after):
+        user_ids = list(
+            get_user_model().objects.filter(id__gt=start_after, banks__isnull=True)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        self.stdout.write(f"Usuarios sem banco: {len(user_ids)}")
+        for offset in range(0, len(user_ids), batch_size):
+            batch_ids = user_ids[offset:offset + batch_size]
+            Bank.objects.bulk_create(
+                [Bank(owner_id=user_id, **bank_data) for user_id in batch_ids for bank_data in DEFAULT_BANKS],
+                ignore_conflicts=True,
+            )
+            self.stdout.write(f"  bancos: {offset + len(batch_ids)}/{len(user_ids)} (ultimo usuario: {batch_ids[-1]})")
+
+    def _normalize_installments(self, batch_size, start_after):
+        # A consulta so encontra parcelas ainda sem grupo, entao rodar de novo retoma de onde parou.
+        owner_ids = list(
+            Payable.objects.filter(
+                owner_id__gt=start_after,
+                payable_type=Payable.PayableType.INSTALLMENT,
+                installment_total__gt=1,
+                installment_group__isnull=True,
+            )
+            .order_by("owner_id")
+            .values_list("owner_id", flat=True)
+            .distinct()
+        )
+        self.stdout.write(f"Usuarios com parcelas legadas: {len(owner_ids)}")
+        user_model = get_user_model()
+        for offset in range(0, len(owner_ids), batch_size):
+            batch_ids = owner_ids[offset:offset + batch_size]
+            owners = user_model.objects.in_bulk(batch_ids)
+            for owner_id in batch_ids:
+                normalize_legacy_installments(owners[owner_id])
+            self.stdout.write(
+                f"  parcelas: {offset + len(batch_ids)}/{len(owner_ids)} (ultimo usuario: {batch_ids[-1]})"
+            )
+        self.stdout.write(self.style.SUCCESS("Normalizacao concluida."))
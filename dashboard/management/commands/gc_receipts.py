@@ -0,0 +1,99 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Q
+from django.utils import timezone
+
+from dashboard.models import Payable, Receipt
+
+
+RECEIPT_BLOB_ROOT = "receipts"
+
+
+class Command(BaseCommand):
+    help = "Remove blobs de comprovantes sem nenhuma conta apontando para eles."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-minutes",
+            type=int,
+            default=60,
+            help="So remove blobs soltos ha mais tempo que isso (protege uploads em andamento).",
+        )
+        parser.add_argument("--batch-size", type=int, default=500, help="Blobs removidos por lote.")
+        parser.add_argument(
+            "--recount",
+            action="store_true",
+            help="Recalcula o ref_count a partir das contas antes de coletar.",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(minutes=max(0, options["grace_minutes"]))
+        batch_size = max(1, options["batch_size"])
+        storage = Receipt._meta.get_field("file").storage
+
+        recounted = self._recount(batch_size) if options["recount"] else 0
+
+        referenced = Payable.objects.filter(receipt_id=OuterRef("pk"))
+        candidates = (
+            Receipt.objects.filter(ref_count=0, created_at__lt=cutoff)
+            .filter(Q(released_at__isnull=True) | Q(released_at__lt=cutoff))
+            .filter(~Exists(referenced))
+            .order_by("id")
+        )
+        removed = 0
+        while True:
+            with transaction.atomic():
+                # O lock segura um upload concorrente no acquire ate o blob sumir da tabela.
+                batch = list(candidates.select_for_update(skip_locked=True).values_list("id", "file")[:batch_size])
+                if not batch:
+                    break
+                Receipt.objects.filter(id__in=[receipt_id for receipt_id, _name in batch]).delete()
+            for _receipt_id, name in batch:
+                storage.delete(name)
+            removed += len(batch)
+
+        orphan_files = self._delete_orphan_files(storage, cutoff)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Blobs removidos: {removed} | arquivos orfaos: {orphan_files} | contagens corrigidas: {recounted}"
+            )
+        )
+
+    def _recount(self, batch_size):
+        fixed = 0
+        rows = (
+            Receipt.objects.annotate(real_count=Count("payables"))
+            .order_by()
+            .values_list("id", "ref_count", "real_count")
+        )
+        for receipt_id, ref_count, real_count in rows.iterator(chunk_size=batch_size):
+            if ref_count != real_count:
+                Receipt.objects.filter(pk=receipt_id).update(ref_count=real_count)
+                fixed += 1
+        return fixed
+
+    def _delete_orphan_files(self, storage, cutoff):
+        # Arquivos que sobraram de uploads abortados ou de usuarios apagados (o cascade nao mexe no disco).
+        try:
+            storage.listdir(RECEIPT_BLOB_ROOT)
+        except (FileNotFoundError, NotImplementedError):
+            return 0
+
+        removed = 0
+        pending_dirs = [RECEIPT_BLOB_ROOT]
+        while pending_dirs:
+            current_dir = pending_dirs.pop()
+            sub_dirs, file_names = storage.listdir(current_dir)
+            pending_dirs.extend(f"{current_dir}/{sub_dir}" for sub_dir in sub_dirs)
+            names = [f"{current_dir}/{file_name}" for file_name in file_names]
+            if not names:
+                continue
+            known_names = set(Receipt.objects.filter(file__in=names).values_list("file", flat=True))
+            for name in names:
+                if name in known_names or storage.get_modified_time(name) >= cutoff:
+                    continue
+                storage.delete(name)
+                removed += 1
+        return removed
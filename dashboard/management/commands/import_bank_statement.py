@@ -0,0 +1,47 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from dashboard.models import Bank
+from dashboard.views import import_bank_statement
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa um extrato bancario (CSV ou OFX) para as transacoes de um usuario, "
+        "em lotes e ignorando linhas ja importadas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Caminho do arquivo CSV ou OFX.")
+        parser.add_argument("--user", required=True, help="Username do dono das transacoes.")
+        parser.add_argument("--bank", required=True, help="Slug ou id do banco do usuario.")
+
+    def handle(self, *args, **options):
+        owner = get_user_model().objects.filter(username=options["user"]).first()
+        if owner is None:
+            raise CommandError(f"Usuario nao encontrado: {options['user']}")
+        bank_filter = Q(slug=options["bank"])
+        if options["bank"].isdigit():
+            bank_filter |= Q(id=int(options["bank"]))
+        bank = Bank.objects.filter(bank_filter, owner=owner).first()
+        if bank is None:
+            raise CommandError(f"Banco nao encontrado para {owner.get_username()}: {options['bank']}")
+
+        try:
+            with open(options["path"], "rb") as statement_file:
+                summary = import_bank_statement(owner, bank, statement_file, file_name=options["path"])
+        except OSError as exc:
+            raise CommandError(f"Nao foi possivel ler o arquivo: {exc}") from exc
+        except ValueError as exc:
+            _field, message = exc.args
+            raise CommandError(message) from exc
+
+        for error in summary["errors"]:
+            self.stderr.write(error)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Importadas: {summary['imported']} | ja existentes: {summary['skipped']} "
+                f"| com erro: {summary['error_count']}"
+            )
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.views import RECURRENCE_HORIZON_DAYS, materialize_recurring_payables
+
+
+class Command(BaseCommand):
+    help = "Gera as proximas ocorrencias das assinaturas recorrentes de todos os usuarios, ate o horizonte."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--horizon-days",
+            type=int,
+            default=RECURRENCE_HORIZON_DAYS,
+            help="Dias a frente para gerar ocorrencias.",
+        )
+
+    def handle(self, *args, **options):
+        created = materialize_recurring_payables(horizon_days=max(0, options["horizon_days"]))
+        self.stdout.write(self.style.SUCCESS(f"Ocorrencias geradas: {created}"))
@@ -0,0 +1,22 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from dashboard.models import SyncTombstone
+from dashboard.views import SYNC_TOMBSTONE_RETENTION_DAYS
+
+
+class Command(BaseCommand):
+    help = (
+        "Remove os registros de exclusao usados pelo /api/sync/ mais antigos que a retencao. "
+        "Clientes com token mais antigo recebem full_reload."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=SYNC_TOMBSTONE_RETENTION_DAYS)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=max(1, options["days"]))
+        deleted, _details = SyncTombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"Registros removidos: {deleted}"))
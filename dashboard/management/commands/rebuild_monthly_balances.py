@@ -0,0 +1,24 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.models import MonthlyBankBalance
+
+
+class Command(BaseCommand):
+    help = "Recalcula a tabela MonthlyBankBalance a partir das transacoes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Username de um unico usuario. Sem isso recalcula todos.")
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.order_by("id")
+        if options["user"]:
+            users = users.filter(username=options["user"])
+            if not users.exists():
+                raise CommandError(f"Usuario {options['user']} nao encontrado.")
+
+        total_users = 0
+        for user in users.iterator():
+            MonthlyBankBalance.objects.rebuild_for_owner(user)
+            total_users += 1
+        self.stdout.write(self.style.SUCCESS(f"Saldos mensais recalculados para {total_users} usuario(s)."))
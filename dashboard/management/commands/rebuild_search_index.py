@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.models import Payable, Transaction, refresh_search_text_for
+
+
+class Command(BaseCommand):
+    help = "Recalcula o search_text (texto de busca sem acentos) de transacoes e contas a pagar, em lotes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Registros atualizados por lote.")
+        parser.add_argument("--only-empty", action="store_true", help="So preenche registros ainda sem search_text.")
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        transactions = Transaction.objects.select_related("bank")
+        payables = Payable.objects.select_related("bank", "category")
+        if options["only_empty"]:
+            transactions = transactions.filter(search_text="")
+            payables = payables.filter(search_text="")
+
+        refreshed_transactions = refresh_search_text_for(transactions, batch_size=batch_size)
+        refreshed_payables = refresh_search_text_for(payables, batch_size=batch_size)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indice de busca atualizado. Transacoes: {refreshed_transactions} | contas: {refreshed_payables}"
+            )
+        )
@@ -0,0 +1,94 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from dashboard.models import ReportJob
+from dashboard.views import process_report_job
+
+
+class Command(BaseCommand):
+    help = "Processa a fila de relatorios em segundo plano usando um pool de threads local."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=2,
+            help="Quantidade de threads. Com 1 os jobs rodam na thread atual.",
+        )
+        parser.add_argument("--batch-size", type=int, default=10, help="Jobs buscados por rodada.")
+        parser.add_argument("--poll-interval", type=float, default=5.0, help="Segundos de espera com a fila vazia.")
+        parser.add_argument(
+            "--stale-minutes",
+            type=int,
+            default=30,
+            help="Jobs em processamento ha mais tempo que isso voltam para a fila.",
+        )
+        parser.add_argument("--once", action="store_true", help="Esvazia a fila e sai.")
+
+    def handle(self, *args, **options):
+        workers = max(1, options["workers"])
+        batch_size = max(1, options["batch_size"])
+
+        executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+        processed = 0
+        try:
+            while True:
+                # A cada rodada: um worker que morreu depois deste iniciar tambem deixa jobs travados.
+                self._requeue_stale_jobs(options["stale_minutes"])
+                job_ids = list(
+                    ReportJob.objects.filter(status=ReportJob.ReportJobStatus.PENDING)
+                    .order_by("created_at", "id")
+                    .values_list("id", flat=True)[:batch_size]
+                )
+                if not job_ids:
+                    if options["once"]:
+                        break
+                    time.sleep(options["poll_interval"])
+                    continue
+
+                if executor:
+                    results = list(executor.map(self._run_job_in_thread, job_ids))
+                else:
+                    results = [self._run_job(job_id) for job_id in job_ids]
+                processed += sum(1 for job in results if job)
+        finally:
+            if executor:
+                executor.shutdown(wait=True)
+
+        self.stdout.write(self.style.SUCCESS(f"Relatorios processados: {processed}"))
+
+    def _requeue_stale_jobs(self, stale_minutes):
+        cutoff = timezone.now() - timedelta(minutes=stale_minutes)
+        requeued = ReportJob.objects.filter(
+            status=ReportJob.ReportJobStatus.RUNNING,
+            started_at__lt=cutoff,
+        ).update(status=ReportJob.ReportJobStatus.PENDING, started_at=None)
+        if requeued:
+            self.stdout.write(f"Jobs travados devolvidos para a fila: {requeued}")
+
+    def _run_job(self, job_id):
+        # O update condicional garante que so um worker assume o job.
+        claimed = ReportJob.objects.filter(
+            pk=job_id,
+            status=ReportJob.ReportJobStatus.PENDING,
+        ).update(status=ReportJob.ReportJobStatus.RUNNING, started_at=timezone.now())
+        if not claimed:
+            return None
+
+        job = ReportJob.objects.select_related("owner", "bank").get(pk=job_id)
+        job = process_report_job(job)
+        label = "ok" if job.status == ReportJob.ReportJobStatus.DONE else f"falhou: {job.error_message}"
+        self.stdout.write(f"  #{job.id} {job.file_name} ({label})")
+        return job
+
+    def _run_job_in_thread(self, job_id):
+        try:
+            return self._run_job(job_id)
+        finally:
+            # Cada thread do pool abre a propria conexao; fecha ao terminar o job.
+            connection.close()
@@ -0,0 +1,122 @@
+from collections import defaultdict
+from datetime import timedelta
+import smtplib
+import time
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from dashboard.models import Event
+
+
+class Command(BaseCommand):
+    help = (
+        "Envia os lembretes de eventos vencidos (starts_at - reminder_minutes_before <= agora) "
+        "reaproveitando uma unica conexao SMTP."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Eventos lidos por lote.")
+        parser.add_argument(
+            "--grace-hours",
+            type=int,
+            default=12,
+            help="Eventos que ja comecaram ha mais tempo que isso nao geram lembrete.",
+        )
+        parser.add_argument("--loop", action="store_true", help="Fica rodando como daemon.")
+        parser.add_argument("--interval", type=int, default=60, help="Segundos entre as rodadas com --loop.")
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        while True:
+            self._backfill_remind_at(batch_size)
+            self._send_due_reminders(batch_size, options["grace_hours"])
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+
+    def _backfill_remind_at(self, batch_size):
+        # Eventos gravados antes da coluna remind_at existir.
+        while True:
+            events = list(Event.objects.filter(remind_at__isnull=True).order_by("id")[:batch_size])
+            if not events:
+                return
+            for event in events:
+                event.sync_remind_at()
+            Event.objects.bulk_update(events, ["remind_at", "last_reminded_at"])
+
+    def _send_due_reminders(self, batch_size, grace_hours):
+        now = timezone.now()
+        due_filter = {
+            "status": Event.EventStatus.PENDING,
+            "last_reminded_at__isnull": True,
+            "remind_at__lte": now,
+            "starts_at__gte": now - timedelta(hours=grace_hours),
+        }
+        sent_total = 0
+        skipped_total = 0
+        failed_ids = set()
+        connection = get_connection()
+        connection.open()
+        try:
+            while True:
+                events = list(
+                    Event.objects.select_related("owner")
+                    .filter(**due_filter)
+                    .exclude(id__in=failed_ids)
+                    .order_by("remind_at", "id")[:batch_size]
+                )
+                if not events:
+                    break
+
+                events_by_owner = defaultdict(list)
+                stamped_ids = []
+                for event in events:
+                    if event.owner and event.owner.email:
+                        events_by_owner[event.owner].append(event)
+                    else:
+                        # Sem destinatario: marca para nao voltar na proxima rodada.
+                        stamped_ids.append(event.id)
+                        skipped_total += 1
+
+                for owner, owner_events in events_by_owner.items():
+                    try:
+                        connection.send_messages([self._build_message(owner, owner_events, connection)])
+                    except (smtplib.SMTPException, OSError) as exc:
+                        failed_ids.update(event.id for event in owner_events)
+                        self.stderr.write(f"Falha ao enviar para {owner.email}: {exc}")
+                        continue
+                    stamped_ids.extend(event.id for event in owner_events)
+                    sent_total += len(owner_events)
+
+                Event.objects.filter(id__in=stamped_ids).update(last_reminded_at=now)
+        finally:
+            connection.close()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Lembretes enviados: {sent_total} | sem e-mail: {skipped_total} | falhas: {len(failed_ids)}"
+            )
+        )
+
+    def _build_message(self, owner, events, connection):
+        lines = [f"Ola, {owner.get_full_name() or owner.get_username()}!", ""]
+        if len(events) == 1:
+            subject = f"Lembrete: {events[0].title}"
+        else:
+            subject = f"Lembretes da agenda ({len(events)})"
+        lines.append("Voce tem compromissos chegando:")
+        for event in events:
+            starts_at = timezone.localtime(event.starts_at)
+            when = starts_at.strftime("%d/%m/%Y") if event.all_day else starts_at.strftime("%d/%m/%Y %H:%M")
+            location = f" - {event.location}" if event.location else ""
+            lines.append(f"- {when} | {event.title}{location}")
+        return EmailMessage(
+            subject=subject,
+            body="\n".join(lines),
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[owner.email],
+            connection=connection,
+        )
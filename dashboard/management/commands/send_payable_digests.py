@@ -0,0 +1,155 @@
+from datetime import timedelta
+from decimal import Decimal
+from itertools import groupby
+import smtplib
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db.models import Exists, OuterRef
+from django.template.loader import get_template
+from django.utils import timezone
+
+from dashboard.models import Payable, PayableDigestLog
+from dashboard.views import _format_currency_br
+
+
+DIGEST_TEMPLATE_NAME = "dashboard/emails/payable_digest.txt"
+DIGEST_FIELDS = (
+    "owner_id",
+    "owner__email",
+    "owner__username",
+    "owner__first_name",
+    "title",
+    "amount",
+    "due_date",
+    "installment_number",
+    "installment_total",
+)
+
+
+class Command(BaseCommand):
+    help = "Envia por e-mail o resumo diario das contas vencidas e a vencer de cada usuario."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days-ahead", type=int, default=3, help="Janela de contas a vencer, em dias.")
+        parser.add_argument("--batch-size", type=int, default=200, help="E-mails enviados por lote.")
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        days_ahead = max(0, options["days_ahead"])
+        batch_size = max(1, options["batch_size"])
+        template = get_template(DIGEST_TEMPLATE_NAME)
+
+        # Uma unica consulta, ordenada por dono, percorre o indice (owner, status, due_date);
+        # quem ja recebeu o resumo do dia fica de fora, entao rodar de novo nao duplica.
+        already_sent = PayableDigestLog.objects.filter(owner_id=OuterRef("owner_id"), digest_date=today)
+        rows = (
+            Payable.objects.filter(
+                owner__isnull=False,
+                status=Payable.PayableStatus.PENDING,
+                due_date__lte=today + timedelta(days=days_ahead),
+            )
+            .exclude(owner__email="")
+            .filter(~Exists(already_sent))
+            .order_by("owner_id", "due_date", "id")
+            .values(*DIGEST_FIELDS)
+        )
+
+        sent_total = 0
+        failed_total = 0
+        pending_messages = []
+        connection = get_connection()
+        connection.open()
+        try:
+            for owner_id, owner_rows in groupby(rows.iterator(chunk_size=2000), key=lambda row: row["owner_id"]):
+                message, log_entry = self._build_digest(template, today, days_ahead, list(owner_rows), connection)
+                pending_messages.append((message, log_entry))
+                if len(pending_messages) >= batch_size:
+                    sent, failed = self._flush(connection, pending_messages)
+                    sent_total += sent
+                    failed_total += failed
+                    pending_messages = []
+            if pending_messages:
+                sent, failed = self._flush(connection, pending_messages)
+                sent_total += sent
+                failed_total += failed
+        finally:
+            connection.close()
+
+        self.stdout.write(self.style.SUCCESS(f"Resumos enviados: {sent_total} | falhas: {failed_total}"))
+
+    def _build_digest(self, template, today, days_ahead, owner_rows, connection):
+        buckets = {"overdue": [], "due_today": [], "upcoming": []}
+        totals = {"overdue": Decimal("0.00"), "due_today": Decimal("0.00"), "upcoming": Decimal("0.00")}
+        for row in owner_rows:
+            if row["due_date"] < today:
+                bucket = "overdue"
+            elif row["due_date"] == today:
+                bucket = "due_today"
+            else:
+                bucket = "upcoming"
+            installment_label = ""
+            if row["installment_number"] and row["installment_total"]:
+                installment_label = f"{row['installment_number']}/{row['installment_total']}"
+            buckets[bucket].append(
+                {
+                    "title": row["title"],
+                    "due_date": row["due_date"],
+                    "amount": _format_currency_br(row["amount"]),
+                    "installment_label": installment_label,
+                }
+            )
+            totals[bucket] += row["amount"]
+
+        first_row = owner_rows[0]
+        grand_total = sum(totals.values(), Decimal("0.00"))
+        body = template.render(
+            {
+                "owner_name": first_row["owner__first_name"] or first_row["owner__username"],
+                "today": today,
+                "days_ahead": days_ahead,
+                "overdue": buckets["overdue"],
+                "overdue_total": _format_currency_br(totals["overdue"]),
+                "due_today": buckets["due_today"],
+                "due_today_total": _format_currency_br(totals["due_today"]),
+                "upcoming": buckets["upcoming"],
+                "upcoming_total": _format_currency_br(totals["upcoming"]),
+                "grand_total": _format_currency_br(grand_total),
+            }
+        )
+        subject_parts = []
+        if buckets["overdue"]:
+            subject_parts.append(f"{len(buckets['overdue'])} vencida(s)")
+        if buckets["due_today"]:
+            subject_parts.append(f"{len(buckets['due_today'])} vence(m) hoje")
+        if buckets["upcoming"]:
+            subject_parts.append(f"{len(buckets['upcoming'])} a vencer")
+        message = EmailMessage(
+            subject=f"Contas a pagar: {', '.join(subject_parts)}",
+            body=body,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[first_row["owner__email"]],
+            connection=connection,
+        )
+        log_entry = PayableDigestLog(
+            owner_id=first_row["owner_id"],
+            digest_date=today,
+            payable_count=len(owner_rows),
+            total_amount=grand_total,
+        )
+        return message, log_entry
+
+    def _flush(self, connection, pending_messages):
+        delivered_logs = []
+        failed = 0
+        for message, log_entry in pending_messages:
+            try:
+                connection.send_messages([message])
+            except (smtplib.SMTPException, OSError) as exc:
+                failed += 1
+                self.stderr.write(f"Falha ao enviar para {message.to[0]}: {exc}")
+                continue
+            delivered_logs.append(log_entry)
+        PayableDigestLog.objects.bulk_create(delivered_logs, ignore_conflicts=True)
+        return len(delivered_logs), failed
@@ -1,10 +1,83 @@
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
 from decimal import Decimal
+import unicodedata
+from uuid import uuid4
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Greatest, TruncMonth
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+
+DEFAULT_BANKS = [
+    {"name": "Nubank", "slug": "nubank", "color": "#8A05BE", "icon": "ph-credit-card"},
+    {"name": "Itau", "slug": "itau", "color": "#EC7000", "icon": "ph-bank"},
+    {"name": "Inter", "slug": "inter", "color": "#FF7A00", "icon": "ph-wallet"},
+]
+
+
+_bulk_write_active = ContextVar("bulk_write_active", default=False)
+
+
+@contextmanager
+def bulk_write():
+    # Rotinas em lote gravam rollup, tombstones, versao e aviso ao vivo de uma vez so;
+    # dentro deste bloco os signals por linha nao repetem esse trabalho.
+    token = _bulk_write_active.set(True)
+    try:
+        yield
+    finally:
+        _bulk_write_active.reset(token)
+
+
+def is_bulk_write():
+    return _bulk_write_active.get()
+
+
+def fold_search_text(*parts):
+    text = " ".join(str(part) for part in parts if part)
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii").lower()
+
+
+def build_search_text(title, *details):
+    # O titulo fica na primeira linha para a busca conseguir pontuar mais os acertos nele.
+    return f"{fold_search_text(title)}\n{fold_search_text(*details)}"
+
+
+def refresh_search_text_for(queryset, batch_size=500, touch_updated_at=False):
+    model = queryset.model
+    # touch_updated_at: o nome de banco/categoria tambem vai no JSON, entao a sincronizacao precisa rever a linha.
+    fields = ["search_text", "updated_at"] if touch_updated_at else ["search_text"]
+    current_timestamp = timezone.now()
+    batch = []
+    refreshed = 0
+    for record in queryset.order_by("id").iterator(chunk_size=batch_size):
+        record.refresh_search_text()
+        if touch_updated_at:
+            record.updated_at = current_timestamp
+        batch.append(record)
+        if len(batch) >= batch_size:
+            model.objects.bulk_update(batch, fields)
+            refreshed += len(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_update(batch, fields)
+        refreshed += len(batch)
+    return refreshed
+
+
+class BankManager(models.Manager):
+    def create_defaults(self, owner):
+        if self.filter(owner=owner).exists():
+            return []
+        return self.bulk_create([self.model(owner=owner, **bank_data) for bank_data in DEFAULT_BANKS])
 
 
 class Bank(models.Model):
@@ -19,6 +92,9 @@ class Bank(models.Model):
     slug = models.SlugField(max_length=50)
     color = models.CharField(max_length=7, default="#4F46E5")
     icon = models.CharField(max_length=60, default="ph-bank")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = BankManager()
 
     class Meta:
         ordering = ["name"]
@@ -48,6 +124,7 @@ class PayableCategory(models.Model):
     name = models.CharField(max_length=80)
     slug = models.SlugField(max_length=50)
     color = models.CharField(max_length=7, default="#5D7084")
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["name"]
@@ -91,11 +168,34 @@ class Transaction(models.Model):
         choices=TransactionType.choices,
     )
     transaction_date = models.DateField(default=timezone.localdate)
+    # Hash do conteudo da linha do extrato importado; reimportar o mesmo arquivo nao duplica.
+    import_hash = models.CharField(max_length=64, null=True, blank=True, editable=False)
+    search_text = models.TextField(blank=True, default="", editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-transaction_date", "-id"]
+        indexes = [
+            models.Index(fields=["owner", "transaction_date", "id"], name="tx_owner_date_id_idx"),
+            models.Index(fields=["owner", "updated_at"], name="tx_owner_updated_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["owner", "import_hash"], name="tx_owner_import_hash_uniq"),
+        ]
+
+    SEARCH_SOURCE_FIELDS = {"title", "description", "bank", "bank_id"}
+
+    def refresh_search_text(self):
+        self.search_text = build_search_text(self.title, self.description, self.bank.name if self.bank_id else "")
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or self.SEARCH_SOURCE_FIELDS.intersection(update_fields):
+            self.refresh_search_text()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "search_text"}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.title} ({self.get_transaction_type_display()})"
@@ -142,12 +242,19 @@ class Event(models.Model):
         validators=[MinValueValidator(0)],
     )
     all_day = models.BooleanField(default=False)
+    # starts_at - reminder_minutes_before, gravado para a busca de lembretes usar indice.
+    remind_at = models.DateTimeField(null=True, blank=True, editable=False)
     last_reminded_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["starts_at", "id"]
+        indexes = [
+            models.Index(fields=["owner", "starts_at"], name="event_owner_starts_idx"),
+            models.Index(fields=["owner", "updated_at"], name="event_owner_updated_idx"),
+            models.Index(fields=["status", "last_reminded_at", "remind_at"], name="event_reminder_due_idx"),
+        ]
 
     def clean(self):
         errors = {}
@@ -166,10 +273,84 @@ class Event(models.Model):
         if errors:
             raise ValidationError(errors)
 
+    def sync_remind_at(self):
+        starts_at = self.starts_at
+        if isinstance(starts_at, str):
+            starts_at = parse_datetime(starts_at)
+        if not starts_at:
+            return False
+        remind_at = starts_at - timedelta(minutes=self.reminder_minutes_before or 0)
+        if remind_at == self.remind_at:
+            return False
+        # Reagendar o evento (ou mudar a antecedencia) libera um novo lembrete.
+        self.remind_at = remind_at
+        self.last_reminded_at = None
+        return True
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if self.sync_remind_at() and update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "remind_at", "last_reminded_at"}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.title} ({self.get_importance_display()})"
 
 
+def receipt_blob_path(instance, filename):
+    # Um diretorio por hash: o mesmo conteudo vira sempre o mesmo blob e o nome
+    # original continua no caminho para exibicao e download.
+    return f"receipts/{instance.owner_id}/{instance.sha256[:2]}/{instance.sha256}/{filename}"
+
+
+class ReceiptManager(models.Manager):
+    def acquire(self, receipt_id):
+        # Devolve 0 se o gc_receipts removeu o blob no meio tempo.
+        return self.filter(pk=receipt_id).update(ref_count=F("ref_count") + 1, released_at=None)
+
+    def release(self, receipt_ids, batch_size=1000):
+        counts = Counter(receipt_id for receipt_id in receipt_ids if receipt_id)
+        ids_by_count = defaultdict(list)
+        for receipt_id, count in counts.items():
+            ids_by_count[count].append(receipt_id)
+        released_at = timezone.now()
+        for count, ids in ids_by_count.items():
+            for offset in range(0, len(ids), batch_size):
+                self.filter(pk__in=ids[offset:offset + batch_size]).update(
+                    ref_count=Greatest(F("ref_count") - count, 0),
+                    released_at=released_at,
+                )
+
+
+class Receipt(models.Model):
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="receipts",
+    )
+    sha256 = models.CharField(max_length=64)
+    file = models.FileField(upload_to=receipt_blob_path, max_length=255)
+    size = models.PositiveBigIntegerField(default=0)
+    # Quantas contas apontam para o blob; em zero ele fica para o gc_receipts.
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    released_at = models.DateTimeField(null=True, blank=True)
+
+    objects = ReceiptManager()
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(fields=["ref_count", "released_at"], name="receipt_refcount_released_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["owner", "sha256"], name="receipt_owner_sha256_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.ref_count} ref.)"
+
+
 class Payable(models.Model):
     class PayableType(models.TextChoices):
         INVOICE = "invoice", "Fatura"
@@ -182,6 +363,11 @@ class Payable(models.Model):
         PENDING = "pending", "Pendente"
         PAID = "paid", "Pago"
 
+    class RecurrencePeriod(models.TextChoices):
+        WEEKLY = "weekly", "Semanal"
+        MONTHLY = "monthly", "Mensal"
+        YEARLY = "yearly", "Anual"
+
     owner = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -222,7 +408,16 @@ class Payable(models.Model):
     due_date = models.DateField(default=timezone.localdate)
     payment_date = models.DateField(null=True, blank=True)
     payment_note = models.CharField(max_length=255, blank=True)
-    payment_receipt = models.FileField(upload_to="payable_receipts/%Y/%m/", null=True, blank=True)
+    payment_receipt = models.FileField(upload_to="payable_receipts/%Y/%m/", max_length=255, null=True, blank=True)
+    # Comprovantes novos apontam para um blob compartilhado; sem receipt o arquivo e legado e exclusivo da conta.
+    receipt = models.ForeignKey(
+        Receipt,
+        on_delete=models.RESTRICT,
+        related_name="payables",
+        null=True,
+        blank=True,
+        editable=False,
+    )
     installment_number = models.PositiveIntegerField(
         null=True,
         blank=True,
@@ -235,11 +430,35 @@ class Payable(models.Model):
     )
     installment_group = models.UUIDField(null=True, blank=True, db_index=True, editable=False)
     is_recurring = models.BooleanField(default=False)
+    recurrence_period = models.CharField(
+        max_length=10,
+        choices=RecurrencePeriod.choices,
+        default=RecurrencePeriod.MONTHLY,
+    )
+    # Todas as ocorrencias de uma assinatura recorrente compartilham o grupo e sao numeradas a partir de 0;
+    # a chave (grupo + sequencia) impede gerar a mesma ocorrencia duas vezes, mesmo se o vencimento mudar.
+    recurrence_group = models.UUIDField(null=True, blank=True, editable=False)
+    recurrence_sequence = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    recurrence_key = models.CharField(max_length=64, null=True, blank=True, editable=False)
+    search_text = models.TextField(blank=True, default="", editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["due_date", "id"]
+        indexes = [
+            models.Index(fields=["owner", "due_date", "id"], name="payable_owner_due_id_idx"),
+            models.Index(fields=["owner", "status", "due_date"], name="payable_owner_status_due_idx"),
+            models.Index(
+                fields=["owner", "installment_group", "installment_number"],
+                name="payable_owner_group_num_idx",
+            ),
+            models.Index(fields=["owner", "updated_at"], name="payable_owner_updated_idx"),
+            models.Index(fields=["recurrence_group", "recurrence_sequence"], name="payable_recur_group_seq_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["owner", "recurrence_key"], name="payable_owner_recur_key_uniq"),
+        ]
 
     def clean(self):
         errors = {}
@@ -262,6 +481,7 @@ class Payable(models.Model):
 
         if self.payable_type != self.PayableType.SUBSCRIPTION:
             self.is_recurring = False
+            self.recurrence_period = self.RecurrencePeriod.MONTHLY
 
         if self.status == self.PayableStatus.PAID and not self.payment_date:
             self.payment_date = timezone.localdate()
@@ -274,6 +494,30 @@ class Payable(models.Model):
         if errors:
             raise ValidationError(errors)
 
+    SEARCH_SOURCE_FIELDS = {"title", "description", "bank", "bank_id", "category", "category_id", "payment_note"}
+
+    def refresh_search_text(self):
+        self.search_text = build_search_text(
+            self.title,
+            self.description,
+            self.bank.name if self.bank_id else "",
+            self.category.name if self.category_id else "",
+            self.payment_note,
+        )
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or self.SEARCH_SOURCE_FIELDS.intersection(update_fields):
+            self.refresh_search_text()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "search_text"}
+        if self.is_recurring and self.recurrence_group is None:
+            self.recurrence_group = uuid4()
+            self.recurrence_sequence = 0
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "recurrence_group", "recurrence_sequence"}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.title} ({self.get_payable_type_display()})"
 
@@ -322,3 +566,252 @@ class UserDashboardLayout(models.Model):
 
     def __str__(self):
         return f"Layout {self.user}"
+
+
+class MonthlyBankBalanceManager(models.Manager):
+    def apply_delta(
+        self,
+        owner_id,
+        bank_id,
+        month,
+        income=Decimal("0.00"),
+        expense=Decimal("0.00"),
+        income_count=0,
+        expense_count=0,
+    ):
+        if not owner_id or not bank_id:
+            return
+        rollup_filter = {"owner_id": owner_id, "bank_id": bank_id, "month": month.replace(day=1)}
+        updates = {
+            "income": F("income") + income,
+            "expense": F("expense") + expense,
+            "income_count": F("income_count") + income_count,
+            "expense_count": F("expense_count") + expense_count,
+        }
+        if self.filter(**rollup_filter).update(**updates):
+            return
+        try:
+            with transaction.atomic():
+                self.create(
+                    income=income,
+                    expense=expense,
+                    income_count=income_count,
+                    expense_count=expense_count,
+                    **rollup_filter,
+                )
+        except IntegrityError:
+            self.filter(**rollup_filter).update(**updates)
+
+    def apply_transaction(self, transaction_values, sign=1):
+        amount = Decimal(str(transaction_values["amount"])) * sign
+        is_income = transaction_values["transaction_type"] == Transaction.TransactionType.INCOME
+        transaction_date = transaction_values["transaction_date"]
+        if isinstance(transaction_date, str):
+            transaction_date = parse_date(transaction_date)
+        self.apply_delta(
+            transaction_values["owner_id"],
+            transaction_values["bank_id"],
+            transaction_date,
+            income=amount if is_income else Decimal("0.00"),
+            expense=Decimal("0.00") if is_income else amount,
+            income_count=sign if is_income else 0,
+            expense_count=0 if is_income else sign,
+        )
+
+    def rebuild_for_owner(self, owner):
+        monthly_rows = (
+            Transaction.objects.filter(owner=owner)
+            .order_by()
+            .annotate(month=TruncMonth("transaction_date"))
+            .values("bank_id", "month")
+            .annotate(
+                income=Sum("amount", filter=Q(transaction_type=Transaction.TransactionType.INCOME)),
+                expense=Sum("amount", filter=Q(transaction_type=Transaction.TransactionType.EXPENSE)),
+                income_count=Count("id", filter=Q(transaction_type=Transaction.TransactionType.INCOME)),
+                expense_count=Count("id", filter=Q(transaction_type=Transaction.TransactionType.EXPENSE)),
+            )
+        )
+        with transaction.atomic():
+            self.filter(owner=owner).delete()
+            self.bulk_create(
+                [
+                    self.model(
+                        owner=owner,
+                        bank_id=row["bank_id"],
+                        month=row["month"],
+                        income=row["income"] or Decimal("0.00"),
+                        expense=row["expense"] or Decimal("0.00"),
+                        income_count=row["income_count"],
+                        expense_count=row["expense_count"],
+                    )
+                    for row in monthly_rows
+                ]
+            )
+
+
+class MonthlyBankBalance(models.Model):
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="monthly_bank_balances",
+    )
+    bank = models.ForeignKey(Bank, on_delete=models.CASCADE, related_name="monthly_balances")
+    month = models.DateField()
+    income = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    expense = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    income_count = models.IntegerField(default=0)
+    expense_count = models.IntegerField(default=0)
+
+    objects = MonthlyBankBalanceManager()
+
+    class Meta:
+        ordering = ["month", "bank_id"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["owner", "bank", "month"],
+                name="uniq_monthly_balance_per_bank",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.bank} {self.month:%Y-%m}"
+
+
+class ReportJob(models.Model):
+    class ReportJobStatus(models.TextChoices):
+        PENDING = "pending", "Na fila"
+        RUNNING = "running", "Processando"
+        DONE = "done", "Concluido"
+        FAILED = "failed", "Falhou"
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="report_jobs",
+    )
+    bank = models.ForeignKey(
+        Bank,
+        on_delete=models.CASCADE,
+        related_name="report_jobs",
+        null=True,
+        blank=True,
+    )
+    report_type = models.CharField(max_length=20)
+    report_format = models.CharField(max_length=10)
+    detail_level = models.CharField(max_length=20, default="both")
+    start_date = models.DateField(null=True, blank=True)
+    end_date = models.DateField(null=True, blank=True)
+    status = models.CharField(
+        max_length=12,
+        choices=ReportJobStatus.choices,
+        default=ReportJobStatus.PENDING,
+    )
+    # Preenchido so enquanto o job esta na fila/processando: o unique impede
+    # dois jobs identicos em andamento (NULL nao conflita).
+    active_key = models.CharField(max_length=64, null=True, blank=True, unique=True, editable=False)
+    file_name = models.CharField(max_length=255)
+    file = models.FileField(upload_to="report_jobs/%Y/%m/", null=True, blank=True)
+    error_message = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="report_job_status_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.file_name} ({self.get_status_display()})"
+
+
+class UserDataVersionManager(models.Manager):
+    def bump(self, user_id):
+        if not user_id:
+            return
+        updates = {"version": F("version") + 1, "updated_at": timezone.now()}
+        if self.filter(user_id=user_id).update(**updates):
+            return
+        try:
+            with transaction.atomic():
+                self.create(user_id=user_id, version=1)
+        except IntegrityError:
+            self.filter(user_id=user_id).update(**updates)
+
+    def bump_many(self, user_ids, batch_size=1000):
+        # Versao de varios usuarios em poucas consultas, para rotinas em lote.
+        user_ids = sorted({user_id for user_id in user_ids if user_id})
+        for offset in range(0, len(user_ids), batch_size):
+            batch_ids = user_ids[offset:offset + batch_size]
+            self.bulk_create([self.model(user_id=user_id, version=0) for user_id in batch_ids], ignore_conflicts=True)
+            self.filter(user_id__in=batch_ids).update(version=F("version") + 1, updated_at=timezone.now())
+
+    def get_version(self, user_id):
+        return self.filter(user_id=user_id).values_list("version", flat=True).first() or 0
+
+
+class UserDataVersion(models.Model):
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="data_version",
+    )
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = UserDataVersionManager()
+
+    def __str__(self):
+        return f"{self.user} v{self.version}"
+
+
+class PayableDigestLog(models.Model):
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="payable_digests",
+    )
+    digest_date = models.DateField()
+    payable_count = models.PositiveIntegerField(default=0)
+    total_amount = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-digest_date", "owner_id"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["owner", "digest_date"],
+                name="uniq_payable_digest_per_day",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Resumo {self.owner} {self.digest_date:%d/%m/%Y}"
+
+
+class SyncTombstone(models.Model):
+    class SyncModel(models.TextChoices):
+        TRANSACTION = "transaction", "Transacao"
+        PAYABLE = "payable", "Conta"
+        EVENT = "event", "Evento"
+        BANK = "bank", "Banco"
+        CATEGORY = "category", "Categoria"
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="sync_tombstones",
+    )
+    model_name = models.CharField(max_length=20, choices=SyncModel.choices)
+    object_id = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["deleted_at", "id"]
+        indexes = [
+            models.Index(fields=["owner", "deleted_at"], name="tombstone_owner_deleted_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.model_name} #{self.object_id} removido"
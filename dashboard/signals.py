@@ -0,0 +1,192 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction as db_transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .live_updates import live_update_broker
+from .models import (
+    Bank,
+    Event,
+    MonthlyBankBalance,
+    Payable,
+    PayableCategory,
+    SyncTombstone,
+    Transaction,
+    UserDataVersion,
+    is_bulk_write,
+    refresh_search_text_for,
+)
+
+
+ROLLUP_FIELDS = ("owner_id", "bank_id", "transaction_date", "transaction_type", "amount")
+
+
+def _rollup_values(transaction):
+    return {field: getattr(transaction, field) for field in ROLLUP_FIELDS}
+
+
+@receiver(pre_save, sender=Transaction)
+def capture_previous_transaction_rollup(sender, instance, raw=False, **kwargs):
+    instance._previous_rollup_values = None
+    if raw or not instance.pk:
+        return
+    instance._previous_rollup_values = (
+        Transaction.objects.filter(pk=instance.pk).values(*ROLLUP_FIELDS).first()
+    )
+
+
+@receiver(post_save, sender=Transaction)
+def apply_transaction_rollup(sender, instance, raw=False, **kwargs):
+    if raw or is_bulk_write():
+        return
+    previous_values = getattr(instance, "_previous_rollup_values", None)
+    current_values = _rollup_values(instance)
+    if previous_values == current_values:
+        return
+    if previous_values:
+        MonthlyBankBalance.objects.apply_transaction(previous_values, sign=-1)
+    MonthlyBankBalance.objects.apply_transaction(current_values, sign=1)
+
+
+@receiver(post_delete, sender=Transaction)
+def revert_transaction_rollup(sender, instance, **kwargs):
+    if is_bulk_write():
+        return
+    MonthlyBankBalance.objects.apply_transaction(_rollup_values(instance), sign=-1)
+
+
+def _is_owner_cascade(origin):
+    # Quando o proprio usuario esta sendo apagado nao ha o que versionar; recriar
+    # linhas apontando para ele quebraria a FK no fim da exclusao em cascata.
+    user_model = get_user_model()
+    if isinstance(origin, user_model):
+        return True
+    return isinstance(origin, QuerySet) and origin.model is user_model
+
+
+# Qualquer escrita nos dados do usuario invalida os relatorios em cache e os ETags das leituras.
+@receiver(post_save, sender=Transaction)
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=Payable)
+@receiver(post_save, sender=Bank)
+@receiver(post_save, sender=PayableCategory)
+@receiver(post_delete, sender=Transaction)
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=Payable)
+@receiver(post_delete, sender=Bank)
+@receiver(post_delete, sender=PayableCategory)
+def bump_user_data_version(sender, instance, raw=False, origin=None, **kwargs):
+    if raw or is_bulk_write() or _is_owner_cascade(origin):
+        return
+    UserDataVersion.objects.bump(instance.owner_id)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def bootstrap_user_banks(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        Bank.objects.create_defaults(instance)
+
+
+TOMBSTONE_MODEL_NAMES = {
+    Transaction: SyncTombstone.SyncModel.TRANSACTION,
+    Payable: SyncTombstone.SyncModel.PAYABLE,
+    Event: SyncTombstone.SyncModel.EVENT,
+    Bank: SyncTombstone.SyncModel.BANK,
+    PayableCategory: SyncTombstone.SyncModel.CATEGORY,
+}
+
+
+@receiver(post_delete, sender=Transaction)
+@receiver(post_delete, sender=Payable)
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=Bank)
+@receiver(post_delete, sender=PayableCategory)
+def record_sync_tombstone(sender, instance, origin=None, **kwargs):
+    if not instance.owner_id or is_bulk_write() or _is_owner_cascade(origin):
+        return
+    SyncTombstone.objects.create(
+        owner_id=instance.owner_id,
+        model_name=TOMBSTONE_MODEL_NAMES[sender],
+        object_id=instance.pk,
+    )
+
+
+LIVE_UPDATE_TYPES = {
+    Transaction: "transaction",
+    Payable: "payable",
+    Event: "event",
+}
+
+
+def _publish_live_update(instance, action):
+    owner_id = instance.owner_id
+    message = {"type": LIVE_UPDATE_TYPES[type(instance)], "action": action, "id": instance.pk}
+    # So notifica depois do commit para o cliente nao buscar um estado que ainda nao existe.
+    db_transaction.on_commit(lambda: live_update_broker.publish(owner_id, message))
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_save, sender=Payable)
+@receiver(post_save, sender=Event)
+def publish_saved_live_update(sender, instance, created, raw=False, **kwargs):
+    if raw or not instance.owner_id or is_bulk_write():
+        return
+    _publish_live_update(instance, "created" if created else "updated")
+
+
+@receiver(post_delete, sender=Transaction)
+@receiver(post_delete, sender=Payable)
+@receiver(post_delete, sender=Event)
+def publish_deleted_live_update(sender, instance, origin=None, **kwargs):
+    if not instance.owner_id or is_bulk_write() or _is_owner_cascade(origin):
+        return
+    _publish_live_update(instance, "deleted")
+
+
+# O search_text de transacoes e contas copia o nome do banco e da categoria.
+@receiver(pre_save, sender=Bank)
+@receiver(pre_save, sender=PayableCategory)
+def capture_previous_search_name(sender, instance, raw=False, **kwargs):
+    instance._previous_search_name = None
+    if raw or not instance.pk:
+        return
+    instance._previous_search_name = sender.objects.filter(pk=instance.pk).values_list("name", flat=True).first()
+
+
+@receiver(post_save, sender=Bank)
+@receiver(post_save, sender=PayableCategory)
+def refresh_search_text_on_rename(sender, instance, created, raw=False, **kwargs):
+    previous_name = getattr(instance, "_previous_search_name", None)
+    if raw or created or previous_name is None or previous_name == instance.name:
+        return
+    if sender is Bank:
+        refresh_search_text_for(Transaction.objects.select_related("bank").filter(bank=instance), touch_updated_at=True)
+        refresh_search_text_for(
+            Payable.objects.select_related("bank", "category").filter(bank=instance), touch_updated_at=True
+        )
+    else:
+        refresh_search_text_for(
+            Payable.objects.select_related("bank", "category").filter(category=instance), touch_updated_at=True
+        )
+
+
+@receiver(pre_delete, sender=Bank)
+@receiver(pre_delete, sender=PayableCategory)
+def capture_search_payables(sender, instance, origin=None, **kwargs):
+    instance._search_payable_ids = []
+    if _is_owner_cascade(origin):
+        return
+    instance._search_payable_ids = list(instance.payables.values_list("id", flat=True))
+
+
+@receiver(post_delete, sender=Bank)
+@receiver(post_delete, sender=PayableCategory)
+def refresh_search_text_on_delete(sender, instance, **kwargs):
+    payable_ids = getattr(instance, "_search_payable_ids", None)
+    if payable_ids:
+        # O SET_NULL do Django nao passa pelo save: a data de alteracao fica por conta daqui.
+        refresh_search_text_for(
+            Payable.objects.select_related("bank", "category").filter(id__in=payable_ids), touch_updated_at=True
+        )
@@ -1,14 +1,42 @@
+from datetime import date, timedelta
 from decimal import Decimal
+from io import StringIO
+import csv
+import hashlib
+import json
+import os
 import shutil
 import tempfile
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import caches
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.db import models
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, models
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
-
-from .models import Bank, Event, Payable, PayableCategory, Transaction, UserDashboardLayout
+from django.utils import timezone
+
+from .live_updates import live_update_broker
+from .models import (
+    Bank,
+    Event,
+    MonthlyBankBalance,
+    Payable,
+    PayableCategory,
+    PayableDigestLog,
+    PayableStatusHistory,
+    Receipt,
+    ReportJob,
+    SyncTombstone,
+    Transaction,
+    UserDashboardLayout,
+    UserDataVersion,
+)
 
 
 class DashboardCrudTests(TestCase):
@@ -26,6 +54,7 @@ class DashboardCrudTests(TestCase):
         super().tearDownClass()
 
     def setUp(self):
+        caches["reports"].clear()
         user_model = get_user_model()
         self.user = user_model.objects.create_user(username="andre", password="123456Teste!")
         self.client.force_login(self.user)
@@ -812,7 +841,7 @@ class DashboardCrudTests(TestCase):
         self.assertIn("text/csv", response["Content-Type"])
         self.assertIn("attachment;", response["Content-Disposition"])
         self.assertIn(".csv", response["Content-Disposition"])
-        csv_content = response.content.decode("utf-8")
+        csv_content = b"".join(response.streaming_content).decode("utf-8")
         self.assertIn("Relatorio de contas a pagar", csv_content)
         self.assertIn("Condominio", csv_content)
 
@@ -849,7 +878,8 @@ class DashboardCrudTests(TestCase):
         )
         self.assertEqual(excel_response.status_code, 200)
         self.assertIn("application/vnd.ms-excel", excel_response["Content-Type"])
-        excel_content = excel_response.content.decode("utf-8")
+        self.assertTrue(excel_response.streaming)
+        excel_content = b"".join(excel_response.streaming_content).decode("utf-8")
         self.assertIn("Relatorio de entradas e saidas", excel_content)
         self.assertIn("Salario", excel_content)
         self.assertNotIn("Venda", excel_content)
@@ -860,7 +890,8 @@ class DashboardCrudTests(TestCase):
         )
         self.assertEqual(pdf_response.status_code, 200)
         self.assertIn("application/pdf", pdf_response["Content-Type"])
-        self.assertTrue(pdf_response.content.startswith(b"%PDF-1.4"))
+        self.assertTrue(pdf_response.streaming)
+        self.assertTrue(b"".join(pdf_response.streaming_content).startswith(b"%PDF-1.4"))
 
     def test_report_export_supports_custom_period_and_detail_level(self):
         Transaction.objects.create(
@@ -894,7 +925,7 @@ class DashboardCrudTests(TestCase):
             },
         )
         self.assertEqual(detailed_response.status_code, 200)
-        detailed_content = detailed_response.content.decode("utf-8")
+        detailed_content = b"".join(detailed_response.streaming_content).decode("utf-8")
         self.assertIn("Dentro do periodo", detailed_content)
         self.assertNotIn("Fora do periodo", detailed_content)
         self.assertIn("Periodo: 01/01/2026 a 31/01/2026", detailed_content)
@@ -911,7 +942,7 @@ class DashboardCrudTests(TestCase):
             },
         )
         self.assertEqual(consolidated_response.status_code, 200)
-        consolidated_content = consolidated_response.content.decode("utf-8")
+        consolidated_content = b"".join(consolidated_response.streaming_content).decode("utf-8")
         self.assertIn("Visao: Consolidado", consolidated_content)
         self.assertIn("Consolidado por banco", consolidated_content)
         self.assertNotIn("Dentro do periodo", consolidated_content)
@@ -941,7 +972,7 @@ class DashboardCrudTests(TestCase):
         self.assertEqual(amounts[1], Decimal("33.33"))
         self.assertEqual(amounts[2], Decimal("33.33"))
 
-    def test_dashboard_normalizes_legacy_installments(self):
+    def test_bootstrap_user_data_command_normalizes_legacy_installments(self):
         legacy_payable = Payable.objects.create(
             owner=self.user,
             bank=self.bank,
@@ -955,9 +986,17 @@ class DashboardCrudTests(TestCase):
             installment_total=12,
         )
 
+        # O dashboard nao faz mais a normalizacao durante a requisicao.
         response = self.client.get(reverse("dashboard_home"))
-
         self.assertEqual(response.status_code, 200)
+        legacy_payable.refresh_from_db()
+        self.assertIsNone(legacy_payable.installment_group)
+
+        output = StringIO()
+        call_command("bootstrap_user_data", "--batch-size", "1", stdout=output)
+        call_command("bootstrap_user_data", stdout=StringIO())
+
+        self.assertIn("Usuarios com parcelas legadas: 1", output.getvalue())
         self.assertEqual(
             Payable.objects.filter(title="Celular", installment_group__isnull=False).count(),
             12,
@@ -965,6 +1004,22 @@ class DashboardCrudTests(TestCase):
         legacy_payable.refresh_from_db()
         self.assertIsNotNone(legacy_payable.installment_group)
 
+    def test_new_users_get_default_banks_without_dashboard_bootstrap(self):
+        new_user = get_user_model().objects.create_user(username="novo", password="123456Teste!")
+        self.assertEqual(
+            sorted(Bank.objects.filter(owner=new_user).values_list("slug", flat=True)),
+            ["inter", "itau", "nubank"],
+        )
+
+        legacy_user = get_user_model().objects.create_user(username="antigo", password="123456Teste!")
+        Bank.objects.filter(owner=legacy_user).delete()
+        self.client.force_login(legacy_user)
+        self.client.get(reverse("dashboard_home"))
+        self.assertFalse(Bank.objects.filter(owner=legacy_user).exists())
+
+        call_command("bootstrap_user_data", "--skip-installments", stdout=StringIO())
+        self.assertEqual(Bank.objects.filter(owner=legacy_user).count(), 3)
+
     def test_delete_payable_installment_group(self):
         create_response = self.client.post(
             reverse("payable_create"),
@@ -988,3 +1043,1755 @@ class DashboardCrudTests(TestCase):
         self.assertEqual(delete_response.status_code, 200)
         self.assertTrue(delete_response.json()["ok"])
         self.assertEqual(Payable.objects.filter(title="Notebook Pro").count(), 0)
+
+    def test_transaction_list_paginates_with_keyset_cursor(self):
+        for day in range(1, 6):
+            Transaction.objects.create(
+                owner=self.user,
+                bank=self.bank,
+                title=f"Lancamento {day}",
+                transaction_type="income",
+                amount="10.00",
+                transaction_date=f"2026-02-0{day}",
+            )
+
+        first_page = self.client.get(reverse("transaction_list"), {"limit": "2"}).json()
+        self.assertTrue(first_page["ok"])
+        self.assertTrue(first_page["has_more"])
+        self.assertEqual(
+            [item["title"] for item in first_page["transactions"]],
+            ["Lancamento 5", "Lancamento 4"],
+        )
+        self.assertEqual(first_page["summary"]["count"], 5)
+        self.assertEqual(first_page["summary"]["income"], 50.0)
+
+        seen_titles = [item["title"] for item in first_page["transactions"]]
+        cursor = first_page["next_cursor"]
+        while cursor:
+            page = self.client.get(reverse("transaction_list"), {"limit": "2", "cursor": cursor}).json()
+            self.assertNotIn("summary", page)
+            seen_titles.extend(item["title"] for item in page["transactions"])
+            cursor = page["next_cursor"]
+        self.assertEqual(seen_titles, [f"Lancamento {day}" for day in range(5, 0, -1)])
+
+    def test_transaction_list_search_matches_partial_date_tokens(self):
+        for title, transaction_date in [("Luz", "2026-03-15"), ("Agua", "2026-05-02"), ("Gas", "2025-01-20")]:
+            Transaction.objects.create(
+                owner=self.user,
+                bank=self.bank,
+                title=title,
+                transaction_type="expense",
+                amount="90.00",
+                transaction_date=transaction_date,
+            )
+
+        def search_titles(query):
+            response = self.client.get(reverse("transaction_list"), {"q": query})
+            self.assertEqual(response.status_code, 200)
+            return sorted(item["title"] for item in response.json()["transactions"])
+
+        # Mesma semantica de trecho do matchSmartQuery do dashboard.js.
+        self.assertEqual(search_titles("mar"), ["Luz"])
+        self.assertEqual(search_titles("ma"), ["Agua", "Luz"])
+        self.assertEqual(search_titles("03/2"), ["Luz"])
+        self.assertEqual(search_titles("05/20"), ["Agua"])
+        self.assertEqual(search_titles("2026-0"), ["Agua", "Luz"])
+        self.assertEqual(search_titles("202"), ["Agua", "Gas", "Luz"])
+        self.assertEqual(search_titles("2025"), ["Gas"])
+        self.assertEqual(search_titles("jan 20/01"), ["Gas"])
+
+    def test_transaction_list_applies_dashboard_filters(self):
+        other_bank = Bank.objects.create(owner=self.user, name="C6", slug="c6")
+        Transaction.objects.create(
+            owner=self.user,
+            bank=self.bank,
+            title="Salario Empresa",
+            transaction_type="income",
+            amount="5000.00",
+            transaction_date="2026-02-10",
+        )
+        Transaction.objects.create(
+            owner=self.user,
+            bank=self.bank,
+            title="Mercado",
+            transaction_type="expense",
+            amount="320.00",
+            transaction_date="2026-02-11",
+        )
+        Transaction.objects.create(
+            owner=self.user,
+            bank=other_bank,
+            title="Mercado C6",
+            transaction_type="expense",
+            amount="80.00",
+            transaction_date="2026-02-12",
+        )
+
+        response = self.client.get(
+            reverse("transaction_list"),
+            {"bank": str(self.bank.id), "type": "expense", "q": "mercado despesa"},
+        )
+        payload = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item["title"] for item in payload["transactions"]], ["Mercado"])
+        self.assertEqual(payload["summary"]["expense"], 320.0)
+
+        amount_response = self.client.get(reverse("transaction_list"), {"q": "5000,00"})
+        self.assertEqual([item["title"] for item in amount_response.json()["transactions"]], ["Salario Empresa"])
+
+        invalid_response = self.client.get(reverse("transaction_list"), {"period": "decada"})
+        self.assertEqual(invalid_response.status_code, 400)
+        self.assertIn("period", invalid_response.json()["errors"])
+
+    def test_dashboard_embeds_first_transaction_page_for_large_history(self):
+        for day in range(1, 5):
+            Transaction.objects.create(
+                owner=self.user,
+                bank=self.bank,
+                title=f"Historico {day}",
+                transaction_type="expense",
+                amount="25.00",
+                transaction_date=f"2026-01-0{day}",
+            )
+
+        with patch("dashboard.views.DASHBOARD_TRANSACTION_EMBED_LIMIT", 2), patch(
+            "dashboard.views.TRANSACTION_PAGE_SIZE", 2
+        ):
+            response = self.client.get(reverse("dashboard_home"))
+
+        dashboard_data = response.context["dashboard_data"]
+        self.assertTrue(dashboard_data["transactions_paginated"])
+        self.assertEqual(len(dashboard_data["transactions"]), 2)
+        self.assertTrue(dashboard_data["transactions_page"]["has_more"])
+        self.assertEqual(dashboard_data["transactions_page"]["summary"]["count"], 4)
+        self.assertEqual(dashboard_data["transactions_page"]["bank_transaction_counts"], {str(self.bank.id): 4})
+
+    def test_payable_list_collapses_installment_groups(self):
+        today = timezone.localdate()
+        self.client.post(
+            reverse("payable_create"),
+            {
+                "bank": self.bank.id,
+                "title": "Geladeira",
+                "description": "Parcelamento",
+                "payable_type": "installment",
+                "status": "paid",
+                "amount": "300.00",
+                "due_date": (today - timedelta(days=5)).isoformat(),
+                "installment_total": "3",
+            },
+        )
+        Payable.objects.create(
+            owner=self.user,
+            bank=self.bank,
+            title="Internet",
+            payable_type="invoice",
+            status="pending",
+            amount="120.00",
+            due_date=today + timedelta(days=2),
+        )
+
+        response = self.client.get(reverse("payable_list"))
+        payload = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(payload["entities"]), 2)
+        group_entity = next(item for item in payload["entities"] if item["is_grouped_installment"])
+        self.assertEqual(group_entity["title"], "Geladeira")
+        self.assertEqual(group_entity["paid_count"], 1)
+        self.assertEqual(group_entity["total_count"], 3)
+        self.assertEqual(group_entity["amount_total"], 300.0)
+        self.assertEqual(group_entity["status_state"], "pending")
+        self.assertEqual(group_entity["next_due_date"], group_entity["due_date"])
+        single_entity = next(item for item in payload["entities"] if not item["is_grouped_installment"])
+        self.assertEqual(single_entity["payable"]["title"], "Internet")
+
+        paid_response = self.client.get(reverse("payable_list"), {"status": "paid"})
+        self.assertEqual(paid_response.json()["entities"], [])
+        search_response = self.client.get(reverse("payable_list"), {"q": "geladeira parcela"})
+        self.assertEqual([item["title"] for item in search_response.json()["entities"]], ["Geladeira"])
+
+    def test_payable_list_paginates_and_flags_overdue(self):
+        today = timezone.localdate()
+        for offset in range(-2, 3):
+            Payable.objects.create(
+                owner=self.user,
+                bank=self.bank,
+                title=f"Conta {offset}",
+                payable_type="invoice",
+                status="pending",
+                amount="50.00",
+                due_date=today + timedelta(days=offset),
+            )
+
+        first_page = self.client.get(reverse("payable_list"), {"limit": "3"}).json()
+        self.assertTrue(first_page["has_more"])
+        self.assertEqual([item["status_state"] for item in first_page["entities"]], ["overdue", "overdue", "pending"])
+        second_page = self.client.get(
+            reverse("payable_list"),
+            {"limit": "3", "cursor": first_page["next_cursor"]},
+        ).json()
+        self.assertFalse(second_page["has_more"])
+        self.assertEqual([item["title"] for item in second_page["entities"]], ["Conta 1", "Conta 2"])
+
+        overdue_response = self.client.get(reverse("payable_list"), {"period": "overdue"})
+        self.assertEqual(len(overdue_response.json()["entities"]), 2)
+        invalid_response = self.client.get(reverse("payable_list"), {"bank": "999999"})
+        self.assertEqual(invalid_response.status_code, 400)
+
+    def test_dashboard_pages_payables_for_large_history(self):
+        today = timezone.localdate()
+        self.client.post(
+            reverse("payable_create"),
+            {
+                "bank": self.bank.id,
+                "title": "Geladeira",
+                "description": "Parcelamento",
+                "payable_type": "installment",
+                "status": "pending",
+                "amount": "300.00",
+                "due_date": (today - timedelta(days=40)).isoformat(),
+                "installment_total": "3",
+            },
+        )
+        for offset in (2, 20):
+            Payable.objects.create(
+                owner=self.user,
+                bank=self.bank,
+                title=f"Conta {offset}",
+                payable_type="invoice",
+                status="pending",
+                amount="50.00",
+                due_date=today + timedelta(days=offset),
+            )
+
+        with patch("dashboard.views.DASHBOARD_PAYABLE_EMBED_LIMIT", 2), patch("dashboard.views.PAYABLE_PAGE_SIZE", 1):
+            response = self.client.get(reverse("dashboard_home"))
+
+        dashboard_data = response.context["dashboard_data"]
+        self.assertTrue(dashboard_data["payables_paginated"])
+        payables_page = dashboard_data["payables_page"]
+        self.assertEqual([item["title"] for item in payables_page["entities"]], ["Geladeira"])
+        self.assertTrue(payables_page["has_more"])
+        self.assertEqual(payables_page["summary"]["entity_count"], 3)
+        self.assertEqual(payables_page["summary"]["member_count"], 5)
+        self.assertEqual(payables_page["summary"]["overdue_count"], 2)
+        self.assertEqual(payables_page["summary"]["overdue_amount"], 200.0)
+        self.assertEqual(payables_page["summary"]["pending_amount"], 200.0)
+        self.assertEqual(payables_page["usage"]["banks"], {str(self.bank.id): 5})
+        # So as parcelas vencidas e a conta que vence em 2 dias entram no recorte dos lembretes.
+        self.assertEqual(
+            sorted(item["title"] for item in dashboard_data["payables"]),
+            ["Conta 2", "Geladeira", "Geladeira"],
+        )
+
+        filtered = self.client.get(reverse("payable_list"), {"q": "conta"}).json()
+        self.assertEqual(filtered["summary"]["entity_count"], 2)
+        self.assertEqual(filtered["summary"]["total_entity_count"], 3)
+
+        group_id = payables_page["entities"][0]["detail_reference_id"]
+        installments = self.client.get(reverse("payable_installment_list", args=[group_id])).json()
+        self.assertEqual([item["installment_number"] for item in installments["payables"]], [1, 2, 3])
+
+        month = today + timedelta(days=20)
+        calendar = self.client.get(reverse("payable_calendar"), {"month": f"{month:%Y-%m}"}).json()
+        self.assertEqual(calendar["days"][month.isoformat()]["pending"], 1)
+        invalid_response = self.client.get(reverse("payable_calendar"), {"month": "2026-13"})
+        self.assertEqual(invalid_response.status_code, 400)
+
+    def test_benchmark_owner_indexes_command_prints_plans(self):
+        output = StringIO()
+        call_command("benchmark_owner_indexes", rows=20, users=2, stdout=output)
+
+        content = output.getvalue()
+        self.assertIn("Com indices compostos", content)
+        self.assertIn("Transacoes do dashboard", content)
+        self.assertEqual(Transaction.objects.filter(owner__username__startswith="benchmark-indexes-").count(), 20)
+
+    def test_monthly_bank_balance_tracks_transaction_changes(self):
+        other_bank = Bank.objects.create(owner=self.user, name="Santander", slug="santander")
+        create_response = self.client.post(
+            reverse("transaction_create"),
+            {
+                "bank": self.bank.id,
+                "title": "Consultoria",
+                "description": "",
+                "transaction_type": "income",
+                "amount": "700.00",
+                "transaction_date": "2026-02-10",
+            },
+        )
+        transaction_id = create_response.json()["transaction"]["id"]
+        rollup = MonthlyBankBalance.objects.get(owner=self.user, bank=self.bank)
+        self.assertEqual(rollup.income, Decimal("700.00"))
+        self.assertEqual(rollup.income_count, 1)
+
+        self.client.post(
+            reverse("transaction_update", kwargs={"transaction_id": transaction_id}),
+            {
+                "bank": other_bank.id,
+                "title": "Consultoria",
+                "description": "",
+                "transaction_type": "expense",
+                "amount": "650.00",
+                "transaction_date": "2026-03-01",
+            },
+        )
+        old_rollup = MonthlyBankBalance.objects.get(owner=self.user, bank=self.bank)
+        self.assertEqual(old_rollup.income, Decimal("0.00"))
+        self.assertEqual(old_rollup.income_count, 0)
+        new_rollup = MonthlyBankBalance.objects.get(owner=self.user, bank=other_bank)
+        self.assertEqual(str(new_rollup.month), "2026-03-01")
+        self.assertEqual(new_rollup.expense, Decimal("650.00"))
+
+        self.client.post(reverse("transaction_delete", kwargs={"transaction_id": transaction_id}))
+        new_rollup.refresh_from_db()
+        self.assertEqual(new_rollup.expense, Decimal("0.00"))
+        self.assertEqual(new_rollup.expense_count, 0)
+
+    def test_summary_endpoint_serves_cards_from_rollup(self):
+        today = timezone.localdate()
+        Transaction.objects.create(
+            owner=self.user,
+            bank=self.bank,
+            title="Salario",
+            transaction_type="income",
+            amount="3000.00",
+            transaction_date=today,
+        )
+        Transaction.objects.create(
+            owner=self.user,
+            bank=self.bank,
+            title="Aluguel",
+            transaction_type="expense",
+            amount="1200.00",
+            transaction_date=today,
+        )
+        MonthlyBankBalance.objects.all().delete()
+        call_command("rebuild_monthly_balances", stdout=StringIO())
+
+        response = self.client.get(reverse("transaction_summary"))
+        summary = response.json()["summary"]
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(summary["income"], 3000.0)
+        self.assertEqual(summary["expense"], 1200.0)
+        self.assertEqual(summary["balance"], 1800.0)
+        self.assertEqual(summary["count"], 2)
+        self.assertEqual(summary["chart"][-1], {"month": today.strftime("%Y-%m"), "income": 3000.0, "expense": 1200.0})
+
+        expense_summary = self.client.get(reverse("transaction_summary"), {"type": "expense"}).json()["summary"]
+        self.assertEqual(expense_summary["income"], 0.0)
+        self.assertEqual(expense_summary["count"], 1)
+
+        # O painel nao soma transacoes no navegador: o resumo inicial ja vem embutido.
+        dashboard_data = self.client.get(reverse("dashboard_home")).context["dashboard_data"]
+        self.assertFalse(dashboard_data["transactions_paginated"])
+        self.assertEqual(dashboard_data["transaction_summary"], summary)
+
+    def test_report_export_csv_streams_rows_with_summary_trailer(self):
+        for index in range(5):
+            Transaction.objects.create(
+                owner=self.user,
+                bank=self.bank,
+                title=f"Entrada {index}",
+                transaction_type="income",
+                amount="100.00",
+                transaction_date="2026-01-10",
+            )
+        Transaction.objects.create(
+            owner=self.user,
+            bank=self.bank,
+            title="Aluguel",
+            transaction_type="expense",
+            amount="150.00",
+            transaction_date="2026-01-12",
+        )
+
+        with patch("dashboard.views.REPORT_ITERATOR_CHUNK_SIZE", 2):
+            response = self.client.get(
+                reverse("report_export"),
+                {
+                    "report_type": "cashflow",
+                    "bank": "all",
+                    "format": "csv",
+                    "start_date": "2026-01-01",
+                    "end_date": "2026-01-31",
+                },
+            )
+            self.assertTrue(response.streaming)
+            csv_content = b"".join(response.streaming_content).decode("utf-8")
+
+        self.assertTrue(csv_content.startswith("\ufeff"))
+        lines = csv_content.splitlines()
+        self.assertEqual(sum(1 for line in lines if line.startswith("10/01/2026;Entrada")), 5)
+        self.assertIn("Total de transacoes: 6", csv_content)
+        self.assertIn("Saldo: R$ 350,00", csv_content)
+        self.assertLess(
+            csv_content.index("Aluguel"),
+            csv_content.index("Total de transacoes"),
+        )
+
+    def test_excel_writer_matches_spreadsheetml_document(self):
+        from dashboard.views import _build_excel_content, _iter_excel_content
+
+        generated_at = timezone.localdate().strftime("%d/%m/%Y")
+        rows = [["10/01/2026", "Salario & bonus"], ["12/01/2026", "Mercado <extra>"]]
+        expected = f"""<?xml version="1.0"?>
+<Workbook xmlns="urn:schemas-microsoft-com:office:spreadsheet"
+ xmlns:o="urn:schemas-microsoft-com:office:office"
+ xmlns:x="urn:schemas-microsoft-com:office:excel"
+ xmlns:ss="urn:schemas-microsoft-com:office:spreadsheet">
+ <Styles>
+  <Style ss:ID="title"><Font ss:Bold="1" ss:Size="13"/></Style>
+  <Style ss:ID="header"><Font ss:Bold="1"/></Style>
+  <Style ss:ID="meta"><Font ss:Italic="1"/></Style>
+  <Style ss:ID="cell"></Style>
+ </Styles>
+ <Worksheet ss:Name="Relatorio">
+  <Table>
+<Row><Cell ss:StyleID="title"><Data ss:Type="String">Relatorio</Data></Cell></Row>
+<Row><Cell ss:StyleID="meta"><Data ss:Type="String">Gerado em: {generated_at}</Data></Cell></Row>
+<Row></Row>
+<Row><Cell ss:StyleID="header"><Data ss:Type="String">Data</Data></Cell><Cell ss:StyleID="header"><Data ss:Type="String">Descricao</Data></Cell></Row>
+<Row><Cell ss:StyleID="cell"><Data ss:Type="String">10/01/2026</Data></Cell><Cell ss:StyleID="cell"><Data ss:Type="String">Salario &amp; bonus</Data></Cell></Row>
+<Row><Cell ss:StyleID="cell"><Data ss:Type="String">12/01/2026</Data></Cell><Cell ss:StyleID="cell"><Data ss:Type="String">Mercado &lt;extra&gt;</Data></Cell></Row>
+<Row></Row>
+<Row><Cell ss:StyleID="meta"><Data ss:Type="String">Saldo: R$ 10,00</Data></Cell></Row>
+  </Table>
+ </Worksheet>
+</Workbook>
+"""
+
+        content = _build_excel_content("Relatorio", ["Data", "Descricao"], iter(rows), iter(["Saldo: R$ 10,00"]))
+        self.assertEqual(content, expected)
+        chunks = list(_iter_excel_content("Relatorio", ["Data", "Descricao"], iter(rows), iter(["Saldo: R$ 10,00"])))
+        self.assertGreater(len(chunks), len(rows))
+        self.assertEqual("".join(chunks), expected)
+
+    def test_pdf_writer_streams_pages_with_valid_xref(self):
+        import re
+        import zlib
+
+        from dashboard.views import _build_pdf_content
+
+        headers = ["Data", "Descricao", "Valor"]
+        rows = [["10/01/2026", f"Conta {index}", "R$ 10,00"] for index in range(200)]
+        summary = ["Total de contas: 200"]
+
+        compressed = _build_pdf_content("Relatorio", headers, iter(rows), iter(summary), compress=True)
+        plain = _build_pdf_content("Relatorio", headers, iter(rows), iter(summary), compress=False)
+
+        self.assertTrue(compressed.startswith(b"%PDF-1.4"))
+        self.assertLess(len(compressed) * 2, len(plain))
+        # 4 linhas de cabecalho + 200 linhas + 3 de resumo, 46 por pagina.
+        self.assertIn(b"/Type /Pages /Count 5 ", compressed)
+
+        for content in (compressed, plain):
+            startxref = int(content.rsplit(b"startxref\n", 1)[1].split(b"\n", 1)[0])
+            self.assertTrue(content[startxref:].startswith(b"xref\n"))
+            offsets = re.findall(rb"(\d{10}) 00000 n ", content[startxref:])
+            for object_id, offset in enumerate(offsets, start=1):
+                self.assertTrue(content[int(offset):].startswith(f"{object_id} 0 obj\n".encode("ascii")))
+
+        streams = re.findall(rb"/FlateDecode >>\nstream\n(.*?)\nendstream", compressed, re.S)
+        self.assertEqual(len(streams), 5)
+        self.assertIn(b"(10/01/2026 | Conta 199 | R$ 10,00) Tj", zlib.decompress(streams[-1]))
+
+    def test_report_jobs_deduplicate_in_flight_requests_and_serve_artifact(self):
+        Payable.objects.create(
+            owner=self.user,
+            bank=self.bank,
+            title="Condominio",
+            payable_type="invoice",
+            status="pending",
+            amount="500.00",
+            due_date="2026-03-05",
+        )
+        params = {"report_type": "payables", "bank": str(self.bank.id), "format": "csv"}
+
+        first = self.client.post(reverse("report_job_create"), params)
+        second = self.client.post(reverse("report_job_create"), params)
+        other_format = self.client.post(reverse("report_job_create"), {**params, "format": "pdf"})
+        invalid = self.client.post(reverse("report_job_create"), {**params, "format": "docx"})
+
+        self.assertEqual(first.status_code, 202)
+        self.assertFalse(first.json()["deduplicated"])
+        self.assertTrue(second.json()["deduplicated"])
+        self.assertEqual(first.json()["job"]["id"], second.json()["job"]["id"])
+        self.assertNotEqual(first.json()["job"]["id"], other_format.json()["job"]["id"])
+        self.assertEqual(invalid.status_code, 400)
+        self.assertIn("format", invalid.json()["errors"])
+
+        job_id = first.json()["job"]["id"]
+        pending_download = self.client.get(reverse("report_job_download", kwargs={"job_id": job_id}))
+        self.assertEqual(pending_download.status_code, 404)
+
+        output = StringIO()
+        call_command("run_report_jobs", "--once", "--workers", "1", stdout=output)
+        self.assertIn("Relatorios processados: 2", output.getvalue())
+
+        status_response = self.client.get(reverse("report_job_detail", kwargs={"job_id": job_id}))
+        job_payload = status_response.json()["job"]
+        self.assertEqual(job_payload["status"], "done")
+        self.assertEqual(ReportJob.objects.get(pk=job_id).active_key, None)
+
+        download = self.client.get(job_payload["download_url"])
+        self.assertEqual(download.status_code, 200)
+        self.assertIn(job_payload["file_name"], download["Content-Disposition"])
+        csv_content = b"".join(download.streaming_content).decode("utf-8")
+        self.assertIn("Condominio", csv_content)
+
+        # Com o job anterior concluido, o mesmo pedido gera um novo job.
+        third = self.client.post(reverse("report_job_create"), params)
+        self.assertFalse(third.json()["deduplicated"])
+        self.assertNotEqual(third.json()["job"]["id"], job_id)
+
+        # Um job travado por outro worker durante a execucao volta para a fila na rodada seguinte.
+        from dashboard.views import process_report_job
+
+        fourth = self.client.post(reverse("report_job_create"), {**params, "format": "excel"})
+        stuck_id = fourth.json()["job"]["id"]
+
+        def crash_other_worker(job):
+            if job.id != stuck_id:
+                ReportJob.objects.filter(pk=stuck_id).update(
+                    status=ReportJob.ReportJobStatus.RUNNING,
+                    started_at=timezone.now() - timedelta(hours=1),
+                )
+            return process_report_job(job)
+
+        output = StringIO()
+        with patch(
+            "dashboard.management.commands.run_report_jobs.process_report_job",
+            side_effect=crash_other_worker,
+        ):
+            call_command("run_report_jobs", "--once", "--workers", "1", "--batch-size", "1", stdout=output)
+        self.assertIn("Jobs travados devolvidos para a fila: 1", output.getvalue())
+        self.assertIn("Relatorios processados: 2", output.getvalue())
+        self.assertEqual(ReportJob.objects.get(pk=stuck_id).status, ReportJob.ReportJobStatus.DONE)
+
+        other_user = get_user_model().objects.create_user(username="outro-relatorio", password="123456")
+        self.client.force_login(other_user)
+        forbidden = self.client.get(reverse("report_job_detail", kwargs={"job_id": job_id}))
+        self.assertEqual(forbidden.status_code, 404)
+
+    def test_report_export_is_cached_until_user_data_changes(self):
+        Transaction.objects.create(
+            owner=self.user,
+            bank=self.bank,
+            title="Salario",
+            transaction_type="income",
+            amount="5000.00",
+            transaction_date="2026-02-10",
+        )
+        params = {"report_type": "cashflow", "bank": "all", "format": "excel"}
+
+        first = self.client.get(reverse("report_export"), params)
+        first_content = b"".join(first.streaming_content)
+
+        with patch("dashboard.views._build_report_dataset", side_effect=AssertionError("cache miss")):
+            cached = self.client.get(reverse("report_export"), params)
+        self.assertEqual(cached.status_code, 200)
+        self.assertEqual(cached.content, first_content)
+        self.assertIn("application/vnd.ms-excel", cached["Content-Type"])
+        self.assertIn(".xls", cached["Content-Disposition"])
+
+        version_before = UserDataVersion.objects.get_version(self.user.id)
+        Transaction.objects.create(
+            owner=self.user,
+            bank=self.bank,
+            title="Freela",
+            transaction_type="income",
+            amount="300.00",
+            transaction_date="2026-02-11",
+        )
+        self.assertGreater(UserDataVersion.objects.get_version(self.user.id), version_before)
+
+        refreshed = self.client.get(reverse("report_export"), params)
+        self.assertIn(b"Freela", b"".join(refreshed.streaming_content))
+
+        # Escritas em lote (sem signals) tambem invalidam o cache.
+        payable = Payable.objects.create(
+            owner=self.user,
+            bank=self.bank,
+            title="Internet",
+            payable_type="invoice",
+            status="pending",
+            amount="120.00",
+            due_date="2026-02-15",
+        )
+        payables_params = {"report_type": "payables", "bank": "all", "format": "csv"}
+        b"".join(self.client.get(reverse("report_export"), payables_params).streaming_content)
+        self.client.post(
+            reverse("payable_bulk_action"),
+            data='{"action":"mark_paid","payable_ids":[%d]}' % payable.id,
+            content_type="application/json",
+        )
+        after_bulk = self.client.get(reverse("report_export"), payables_params)
+        self.assertIn("Pago", b"".join(after_bulk.streaming_content).decode("utf-8"))
+
+        # Uma escrita durante o streaming nao deixa o relatorio guardado sob a versao antiga.
+        from dashboard.views import REPORT_CACHE_ALIAS, _get_report_cache_key, _parse_report_request
+
+        excel_params = {**payables_params, "format": "excel"}
+        stale_key = _get_report_cache_key(
+            self.user,
+            _parse_report_request(self.user, excel_params),
+            UserDataVersion.objects.get_version(self.user.id),
+        )
+        chunks = iter(self.client.get(reverse("report_export"), excel_params).streaming_content)
+        next(chunks)
+        Payable.objects.filter(pk=payable.pk).update(title="Fibra")
+        UserDataVersion.objects.bump(self.user.id)
+        b"".join(chunks)
+        self.assertIsNone(caches[REPORT_CACHE_ALIAS].get(stale_key))
+
+    def test_consolidated_reports_aggregate_in_sql_without_loading_rows(self):
+        today = timezone.localdate()
+        category = PayableCategory.objects.create(owner=self.user, name="Moradia", slug="moradia")
+        Payable.objects.create(
+            owner=self.user,
+            bank=self.bank,
+            category=category,
+            title="Aluguel atrasado",
+            payable_type="invoice",
+            status="pending",
+            amount="900.00",
+            due_date=today - timedelta(days=3),
+        )
+        Payable.objects.create(
+            owner=self.user,
+            bank=self.bank,
+            title="Internet",
+            payable_type="invoice",
+            status="pending",
+            amount="120.00",
+            due_date=today + timedelta(days=3),
+        )
+        Payable.objects.create(
+            owner=self.user,
+            title="Seguro",
+            payable_type="other",
+            status="paid",
+            amount="80.00",
+            due_date=today - timedelta(days=10),
+            payment_date=today - timedelta(days=10),
+        )
+        Transaction.objects.create(
+            owner=self.user,
+            bank=self.bank,
+            title="Salario",
+            transaction_type="income",
+            amount="1000.00",
+            transaction_date=today,
+        )
+        Transaction.objects.create(
+            owner=self.user,
+            bank=self.bank,
+            title="Mercado",
+            transaction_type="expense",
+            amount="250.00",
+            transaction_date=today,
+        )
+
+        with patch.object(Payable, "from_db", side_effect=AssertionError("linha instanciada")):
+            payables_response = self.client.get(
+                reverse("report_export"),
+                {"report_type": "payables", "bank": "all", "format": "csv", "detail_level": "consolidated"},
+            )
+            payables_content = b"".join(payables_response.streaming_content).decode("utf-8")
+        with patch.object(Transaction, "from_db", side_effect=AssertionError("linha instanciada")):
+            cashflow_response = self.client.get(
+                reverse("report_export"),
+                {"report_type": "cashflow", "bank": "all", "format": "csv", "detail_level": "consolidated"},
+            )
+            cashflow_content = b"".join(cashflow_response.streaming_content).decode("utf-8")
+
+        self.assertIn("Total de contas: 3", payables_content)
+        self.assertIn("Total pendente: R$ 120,00", payables_content)
+        self.assertIn("Total vencido: R$ 900,00", payables_content)
+        self.assertIn("Total pago: R$ 80,00", payables_content)
+        self.assertIn("- Sem banco: R$ 80,00", payables_content)
+        self.assertIn("- Moradia: R$ 900,00", payables_content)
+        self.assertIn("- Fatura: R$ 120,00", payables_content)
+        self.assertIn("- Outro: R$ 80,00", payables_content)
+        self.assertIn("- Vencida: R$ 900,00", payables_content)
+        self.assertIn("Total de transacoes: 2", cashflow_content)
+        self.assertIn("Saldo: R$ 750,00", cashflow_content)
+        self.assertIn("- Nubank: R$ 750,00", cashflow_content)
+        self.assertIn("- Saida: R$ 250,00", cashflow_content)
+
+    def test_send_event_reminders_batches_and_stamps_due_events(self):
+        now = timezone.now()
+        self.user.email = "andre@example.com"
+        self.user.save(update_fields=["email"])
+        other_user = get_user_model().objects.create_user(
+            username="lembrete",
+            password="123456Teste!",
+            email="lembrete@example.com",
+        )
+        due_event = Event.objects.create(
+            owner=self.user,
+            title="Reuniao banco",
+            starts_at=now + timedelta(minutes=30),
+            reminder_minutes_before=60,
+        )
+        Event.objects.create(
+            owner=self.user,
+            title="Dentista",
+            starts_at=now + timedelta(minutes=45),
+            reminder_minutes_before=60,
+        )
+        Event.objects.create(owner=other_user, title="Contador", starts_at=now + timedelta(minutes=10))
+        Event.objects.create(owner=self.user, title="Futuro", starts_at=now + timedelta(hours=5))
+        Event.objects.create(
+            owner=self.user,
+            title="Concluido",
+            starts_at=now + timedelta(minutes=5),
+            status=Event.EventStatus.COMPLETED,
+        )
+        # Evento antigo sem remind_at, como os gravados antes da coluna existir.
+        legacy_event = Event.objects.create(owner=other_user, title="Legado", starts_at=now + timedelta(minutes=20))
+        Event.objects.filter(pk=legacy_event.pk).update(remind_at=None)
+
+        output = StringIO()
+        call_command("send_event_reminders", "--batch-size", "2", stdout=output)
+
+        self.assertIn("Lembretes enviados: 4", output.getvalue())
+        recipients = sorted(message.to[0] for message in mail.outbox)
+        self.assertEqual(recipients, ["andre@example.com", "lembrete@example.com"])
+        self.assertTrue(any("Reuniao banco" in message.body and "Dentista" in message.body for message in mail.outbox))
+        self.assertEqual(Event.objects.filter(last_reminded_at__isnull=False).count(), 4)
+
+        call_command("send_event_reminders", stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 2)
+
+        due_event.starts_at = now + timedelta(minutes=40)
+        due_event.save(update_fields=["starts_at"])
+        due_event.refresh_from_db()
+        self.assertIsNone(due_event.last_reminded_at)
+        call_command("send_event_reminders", stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(mail.outbox[-1].subject, "Lembrete: Reuniao banco")
+
+    def test_send_payable_digests_groups_per_user_and_is_idempotent(self):
+        today = timezone.localdate()
+        self.user.email = "andre@example.com"
+        self.user.save(update_fields=["email"])
+        no_email_user = get_user_model().objects.create_user(username="sem-email", password="123456Teste!")
+        for title, offset, status in [
+            ("Aluguel", -2, "pending"),
+            ("Luz", 0, "pending"),
+            ("Internet", 2, "pending"),
+            ("Viagem", 20, "pending"),
+            ("Agua", -1, "paid"),
+        ]:
+            Payable.objects.create(
+                owner=self.user,
+                bank=self.bank,
+                title=title,
+                payable_type="invoice",
+                status=status,
+                amount="100.00",
+                due_date=today + timedelta(days=offset),
+            )
+        Payable.objects.create(
+            owner=no_email_user,
+            title="Sem destinatario",
+            payable_type="other",
+            amount="50.00",
+            due_date=today,
+        )
+
+        output = StringIO()
+        call_command("send_payable_digests", "--days-ahead", "3", stdout=output)
+
+        self.assertIn("Resumos enviados: 1", output.getvalue())
+        self.assertEqual(len(mail.outbox), 1)
+        message = mail.outbox[0]
+        self.assertEqual(message.to, ["andre@example.com"])
+        self.assertEqual(message.subject, "Contas a pagar: 1 vencida(s), 1 vence(m) hoje, 1 a vencer")
+        self.assertIn("Aluguel", message.body)
+        self.assertIn("Total em aberto: R$ 300,00", message.body)
+        self.assertNotIn("Viagem", message.body)
+        self.assertNotIn("Agua", message.body)
+        log = PayableDigestLog.objects.get(owner=self.user, digest_date=today)
+        self.assertEqual(log.payable_count, 3)
+
+        call_command("send_payable_digests", stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_deleting_user_with_payables_cascades_cleanly(self):
+        doomed_user = get_user_model().objects.create_user(username="removido", password="123456Teste!")
+        doomed_user_id = doomed_user.id
+        Payable.objects.create(owner=doomed_user, title="Conta", payable_type="other", amount="10.00")
+
+        doomed_user.delete()
+
+        self.assertFalse(Payable.objects.filter(title="Conta").exists())
+        self.assertFalse(UserDataVersion.objects.filter(user_id=doomed_user_id).exists())
+
+    def test_sync_endpoint_returns_changes_and_tombstones_since_token(self):
+        stale_transaction = Transaction.objects.create(
+            owner=self.user,
+            bank=self.bank,
+            title="Antiga",
+            transaction_type="income",
+            amount="10.00",
+            transaction_date="2026-01-05",
+        )
+        doomed_event = Event.objects.create(owner=self.user, title="Cancelado", starts_at="2026-02-25T09:00:00Z")
+
+        bootstrap = self.client.get(reverse("sync_changes")).json()
+        self.assertTrue(bootstrap["full_reload"])
+
+        # Simula um token emitido depois das escritas acima.
+        with patch("dashboard.views.SYNC_TOKEN_OVERLAP_SECONDS", 0):
+            token = self.client.get(reverse("sync_changes")).json()["token"]
+        Transaction.objects.filter(pk=stale_transaction.pk).update(updated_at=timezone.now() - timedelta(minutes=5))
+        Event.objects.filter(pk=doomed_event.pk).update(updated_at=timezone.now() - timedelta(minutes=5))
+
+        new_transaction = Transaction.objects.create(
+            owner=self.user,
+            bank=self.bank,
+            title="Nova",
+            transaction_type="expense",
+            amount="20.00",
+            transaction_date="2026-01-06",
+        )
+        self.client.post(reverse("event_delete", kwargs={"event_id": doomed_event.id}))
+        other_user = get_user_model().objects.create_user(username="sync-outro", password="123456Teste!")
+        Payable.objects.create(owner=other_user, title="Alheia", payable_type="other", amount="5.00")
+
+        payload = self.client.get(reverse("sync_changes"), {"since": token}).json()
+
+        self.assertFalse(payload["full_reload"])
+        self.assertEqual([item["id"] for item in payload["changes"]["transactions"]], [new_transaction.id])
+        self.assertEqual(payload["changes"]["payables"], [])
+        self.assertEqual(payload["deleted"]["events"], [doomed_event.id])
+        self.assertNotEqual(payload["token"], token)
+
+        with patch("dashboard.views.SYNC_MAX_CHANGES_PER_MODEL", 0):
+            overflow = self.client.get(reverse("sync_changes"), {"since": token}).json()
+        self.assertTrue(overflow["full_reload"])
+
+        invalid = self.client.get(reverse("sync_changes"), {"since": "ontem"})
+        self.assertEqual(invalid.status_code, 400)
+        self.assertIn("since", invalid.json()["errors"])
+
+        # Renomear o banco ou apagar a categoria muda o JSON das linhas que apontam para eles.
+        category = PayableCategory.objects.create(owner=self.user, name="Casa", slug="casa")
+        payable = Payable.objects.create(
+            owner=self.user,
+            bank=self.bank,
+            category=category,
+            title="Luz",
+            payable_type="other",
+            amount="50.00",
+        )
+        Transaction.objects.update(updated_at=timezone.now() - timedelta(minutes=5))
+        Payable.objects.update(updated_at=timezone.now() - timedelta(minutes=5))
+        with patch("dashboard.views.SYNC_TOKEN_OVERLAP_SECONDS", 0):
+            token = self.client.get(reverse("sync_changes"), {"since": token}).json()["token"]
+        self.bank.name = "Nubank PJ"
+        self.bank.save()
+        category_id = category.id
+        category.delete()
+
+        payload = self.client.get(reverse("sync_changes"), {"since": token}).json()
+        self.assertEqual(
+            sorted(item["id"] for item in payload["changes"]["transactions"]),
+            [stale_transaction.id, new_transaction.id],
+        )
+        self.assertEqual({item["bank"]["name"] for item in payload["changes"]["transactions"]}, {"Nubank PJ"})
+        self.assertEqual(
+            [(item["id"], item["bank"]["name"], item["category"]) for item in payload["changes"]["payables"]],
+            [(payable.id, "Nubank PJ", None)],
+        )
+        self.assertEqual(payload["deleted"]["categories"], [category_id])
+
+    def test_json_read_endpoints_answer_conditional_requests(self):
+        Event.objects.create(owner=self.user, title="Reuniao", starts_at="2026-02-25T09:00:00Z")
+
+        first = self.client.get(reverse("event_list"))
+        self.assertEqual(first.status_code, 200)
+        etag = first["ETag"]
+        self.assertIn("private", first["Cache-Control"])
+        self.assertTrue(first.has_header("Last-Modified"))
+
+        not_modified = self.client.get(reverse("event_list"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b"")
+        since_response = self.client.get(reverse("event_list"), HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        self.assertEqual(since_response.status_code, 304)
+
+        for url_name in ["transaction_list", "transaction_summary", "payable_list"]:
+            response = self.client.get(reverse(url_name))
+            self.assertEqual(
+                self.client.get(reverse(url_name), HTTP_IF_NONE_MATCH=response["ETag"]).status_code,
+                304,
+            )
+
+        self.client.post(
+            reverse("event_create"),
+            {
+                "title": "Nova reuniao",
+                "starts_at": "2026-02-26T10:00",
+                "status": "pending",
+                "importance": "medium",
+                "reminder_minutes_before": "30",
+                "color": "#4F46E5",
+            },
+        )
+        changed = self.client.get(reverse("event_list"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], etag)
+        self.assertEqual(len(changed.json()["events"]), 2)
+
+        other_user = get_user_model().objects.create_user(username="etag-outro", password="123456Teste!")
+        self.client.force_login(other_user)
+        self.assertEqual(self.client.get(reverse("event_list"), HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    async def test_live_updates_stream_pushes_published_changes(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse("live_updates"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(response["Cache-Control"], "no-cache")
+
+        stream = response.streaming_content
+        self.assertEqual(await anext(stream), b"retry: 3000\n\n")
+        self.assertEqual(live_update_broker.subscriber_count(self.user.id), 1)
+
+        live_update_broker.publish(self.user.id + 1, {"type": "event", "action": "created", "id": 99})
+        live_update_broker.publish(self.user.id, {"type": "payable", "action": "deleted", "id": 7})
+        self.assertEqual(
+            await anext(stream),
+            b'event: change\ndata: {"type":"payable","action":"deleted","id":7}\n\n',
+        )
+
+        # Ao atingir o tempo maximo o stream termina e o EventSource reconecta sozinho.
+        with patch("dashboard.views.LIVE_UPDATES_MAX_SECONDS", 0):
+            with self.assertRaises(StopAsyncIteration):
+                await anext(stream)
+        self.assertEqual(live_update_broker.subscriber_count(self.user.id), 0)
+
+    def test_live_updates_publish_after_commit_and_skip_wsgi(self):
+        self.assertEqual(self.client.get(reverse("live_updates")).status_code, 204)
+
+        with patch("dashboard.signals.live_update_broker.publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                transaction = Transaction.objects.create(
+                    owner=self.user,
+                    bank=self.bank,
+                    title="Mercado",
+                    transaction_type="expense",
+                    amount="30.00",
+                    transaction_date="2026-02-10",
+                )
+                publish.assert_not_called()
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(reverse("transaction_delete", kwargs={"transaction_id": transaction.id}))
+
+        self.assertEqual(
+            [call.args for call in publish.call_args_list],
+            [
+                (self.user.id, {"type": "transaction", "action": "created", "id": transaction.id}),
+                (self.user.id, {"type": "transaction", "action": "deleted", "id": transaction.id}),
+            ],
+        )
+
+    def test_transaction_import_bulk_inserts_csv_and_ofx_skipping_duplicates(self):
+        csv_content = (
+            "Data;Descrição;Valor\n"
+            "05/01/2026;Café Central;-12,50\n"
+            "05/01/2026;Café Central;-12,50\n"
+            '06/01/2026;Salário;"5.000,00"\n'
+            "32/01/2026;Data ruim;1,00\n"
+            "07/01/2026;Sem valor;\n"
+        ).encode("cp1252")
+        version_before = UserDataVersion.objects.get_version(self.user.id)
+
+        response = self.client.post(
+            reverse("transaction_import"),
+            {"bank": self.bank.id, "file": SimpleUploadedFile("extrato.csv", csv_content, content_type="text/csv")},
+        )
+        payload = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((payload["imported"], payload["skipped"], payload["error_count"]), (3, 0, 2))
+        self.assertEqual(payload["errors"], ["Linha 5: Data invalida.", "Linha 6: Valor invalido."])
+        self.assertEqual(Transaction.objects.filter(owner=self.user, title="Café Central").count(), 2)
+        salary = Transaction.objects.get(owner=self.user, title="Salário")
+        self.assertEqual((salary.transaction_type, salary.amount), ("income", Decimal("5000.00")))
+        self.assertGreater(UserDataVersion.objects.get_version(self.user.id), version_before)
+
+        repeated = self.client.post(
+            reverse("transaction_import"),
+            {"bank": self.bank.id, "file": SimpleUploadedFile("extrato.csv", csv_content, content_type="text/csv")},
+        ).json()
+        self.assertEqual((repeated["imported"], repeated["skipped"]), (0, 3))
+
+        ofx_content = (
+            "OFXHEADER:100\nDATA:OFXSGML\nCHARSET:1252\n\n"
+            "<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>\n"
+            "<STMTTRN>\n<TRNTYPE>DEBIT\n<DTPOSTED>20260110120000[-3:BRT]\n<TRNAMT>-99.90\n"
+            "<FITID>abc1\n<MEMO>Farmacia &amp; Cia\n</STMTTRN>\n"
+            "<STMTTRN>\n<TRNTYPE>DEBIT\n<DTPOSTED>20260110\n<TRNAMT>-99.90\n"
+            "<FITID>abc1\n<MEMO>Farmacia &amp; Cia\n</STMTTRN>\n"
+            "<STMTTRN>\n<TRNTYPE>CREDIT\n<DTPOSTED>20260111\n<TRNAMT>150.00\n"
+            "<FITID>abc2\n<NAME>PIX RECEBIDO\n<MEMO>Joao\n</STMTTRN>\n"
+            "</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>\n"
+        )
+        with tempfile.NamedTemporaryFile("w", suffix=".ofx", encoding="cp1252", delete=False) as ofx_file:
+            ofx_file.write(ofx_content)
+        output = StringIO()
+        try:
+            call_command("import_bank_statement", ofx_file.name, user="andre", bank="nubank", stdout=output)
+        finally:
+            os.remove(ofx_file.name)
+        self.assertIn("Importadas: 2 | ja existentes: 1", output.getvalue())
+        pix = Transaction.objects.get(owner=self.user, title="PIX RECEBIDO")
+        self.assertEqual((pix.description, pix.transaction_type), ("Joao", "income"))
+        self.assertTrue(Transaction.objects.filter(owner=self.user, title="Farmacia & Cia").exists())
+
+        balance = MonthlyBankBalance.objects.get(owner=self.user, bank=self.bank, month="2026-01-01")
+        self.assertEqual(
+            (balance.income, balance.expense, balance.income_count, balance.expense_count),
+            (Decimal("5150.00"), Decimal("124.90"), 2, 3),
+        )
+
+    def test_transaction_import_rejects_csv_field_over_size_limit(self):
+        csv_content = (
+            "Data;Descricao;Valor\n"
+            "05/01/2026;Cafe Central;-12,50\n"
+            f"06/01/2026;{'x' * (csv.field_size_limit() + 1)};-1,00\n"
+        ).encode("utf-8")
+
+        response = self.client.post(
+            reverse("transaction_import"),
+            {"bank": self.bank.id, "file": SimpleUploadedFile("extrato.csv", csv_content, content_type="text/csv")},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["errors"]["file"], ["CSV invalido perto da linha 3."])
+        self.assertFalse(Transaction.objects.filter(owner=self.user).exists())
+
+        with tempfile.NamedTemporaryFile("wb", suffix=".csv", delete=False) as csv_file:
+            csv_file.write(csv_content)
+        try:
+            with self.assertRaisesMessage(CommandError, "CSV invalido perto da linha 3."):
+                call_command("import_bank_statement", csv_file.name, user="andre", bank="nubank", stdout=StringIO())
+        finally:
+            os.remove(csv_file.name)
+
+    def test_import_events_json_streams_items_in_batches(self):
+        items = [
+            {"model": "agenda.event", "fields": {"title": f"Evento {index}", "event_date": "2026-03-10T14:30:00Z"}}
+            for index in range(5)
+        ]
+        items.insert(2, {"fields": {"title": "   "}})
+        items.append(12345678)
+        content = json.dumps(items, indent=2).encode("utf-8")
+        version_before = UserDataVersion.objects.get_version(self.user.id)
+
+        # Blocos pequenos forcam itens e numeros partidos entre leituras.
+        with patch("dashboard.views.EVENT_IMPORT_READ_CHUNK_SIZE", 7), patch("dashboard.views.EVENT_IMPORT_BATCH_SIZE", 2):
+            response = self.client.post(
+                reverse("import_events_json"),
+                {"json_file": SimpleUploadedFile("eventos.json", content, content_type="application/json")},
+                HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+            )
+        payload = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((payload["imported"], payload["skipped"], payload["error_count"]), (5, 2, 2))
+        self.assertEqual(payload["errors"][0], "Item 3: título vazio.")
+        self.assertTrue(payload["errors"][1].startswith("Item 7:"))
+        imported_event = Event.objects.get(owner=self.user, title="Evento 4")
+        self.assertEqual(imported_event.remind_at, imported_event.starts_at - timedelta(minutes=60))
+        self.assertGreater(UserDataVersion.objects.get_version(self.user.id), version_before)
+
+        broken = b'[{"fields": {"title": "Valido"}}, {"fields": {"title": "Quebrado"'
+        response = self.client.post(
+            reverse("import_events_json"),
+            {"json_file": SimpleUploadedFile("quebrado.json", broken, content_type="application/json")},
+            HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["message"], "Arquivo JSON inválido.")
+        self.assertFalse(Event.objects.filter(owner=self.user, title="Valido").exists())
+
+        not_a_list = self.client.post(
+            reverse("import_events_json"),
+            {"json_file": SimpleUploadedFile("objeto.json", b'{"fields": {}}', content_type="application/json")},
+            HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+        )
+        self.assertEqual(not_a_list.json()["message"], "Formato inválido. Esperado uma lista de objetos.")
+
+    def test_search_endpoint_ranks_accent_folded_matches(self):
+        title_hit = Transaction.objects.create(
+            owner=self.user,
+            bank=self.bank,
+            title="Café da manhã",
+            transaction_type="expense",
+            amount="18.00",
+            transaction_date="2026-02-01",
+        )
+        description_hit = Transaction.objects.create(
+            owner=self.user,
+            bank=self.bank,
+            title="Padaria",
+            description="pão e CAFE",
+            transaction_type="expense",
+            amount="30.00",
+            transaction_date="2026-02-05",
+        )
+        Transaction.objects.create(
+            owner=self.user,
+            bank=self.bank,
+            title="Mercado",
+            transaction_type="expense",
+            amount="90.00",
+            transaction_date="2026-02-06",
+        )
+        category = PayableCategory.objects.create(owner=self.user, name="Moradia", slug="moradia")
+        payable = Payable.objects.create(
+            owner=self.user,
+            category=category,
+            title="Conta de luz",
+            payable_type="invoice",
+            amount="120.00",
+            due_date="2026-02-10",
+        )
+        payable.status = Payable.PayableStatus.PAID
+        payable.payment_note = "Pago junto com o café"
+        payable.save(update_fields=["status", "payment_note", "updated_at"])
+
+        payload = self.client.get(reverse("search"), {"q": "CAFÉ"}).json()
+        self.assertEqual(
+            [(item["kind"], item["rank"]) for item in payload["results"]],
+            [("transaction", 3), ("payable", 1), ("transaction", 1)],
+        )
+        self.assertEqual(payload["results"][0]["transaction"]["id"], title_hit.id)
+        self.assertEqual(payload["results"][2]["transaction"]["id"], description_hit.id)
+        self.assertEqual(payload["totals"], {"transaction": 2, "payable": 1})
+
+        paged = self.client.get(reverse("search"), {"q": "cafe", "scope": "transactions", "limit": 1, "page": 2}).json()
+        self.assertEqual([item["transaction"]["id"] for item in paged["results"]], [description_hit.id])
+        self.assertFalse(paged["has_more"])
+        # Tokens de valor e de categoria seguem a mesma semantica do filtro do dashboard.
+        self.assertEqual(
+            [item["payable"]["id"] for item in self.client.get(reverse("search"), {"q": "moradia 120,00"}).json()["results"]],
+            [payable.id],
+        )
+        self.assertEqual(self.client.get(reverse("search"), {"q": "  "}).status_code, 400)
+
+        self.bank.name = "Banco Ótimo"
+        self.bank.save()
+        renamed = self.client.get(reverse("search"), {"q": "otimo", "scope": "transactions"}).json()
+        self.assertEqual(renamed["totals"], {"transaction": 3})
+        category.delete()
+        self.assertEqual(self.client.get(reverse("search"), {"q": "moradia"}).json()["totals"]["payable"], 0)
+
+        Transaction.objects.update(search_text="")
+        call_command("rebuild_search_index", "--only-empty", stdout=StringIO())
+        self.assertEqual(Transaction.objects.get(pk=title_hit.pk).search_text, "cafe da manha\nbanco otimo")
+
+    def test_materialize_recurring_payables_generates_series_without_drift(self):
+        from dashboard.views import materialize_recurring_payables
+
+        response = self.client.post(
+            reverse("payable_create"),
+            {
+                "title": "Academia",
+                "payable_type": "subscription",
+                "status": "pending",
+                "amount": "99.90",
+                "due_date": "2026-01-31",
+                "bank": self.bank.id,
+                "is_recurring": "on",
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        monthly = Payable.objects.get(title="Academia")
+        self.assertEqual(monthly.recurrence_period, Payable.RecurrencePeriod.MONTHLY)
+        self.assertIsNotNone(monthly.recurrence_group)
+        weekly = Payable.objects.create(
+            owner=self.user,
+            title="Feira",
+            payable_type="subscription",
+            amount="50.00",
+            due_date="2026-02-02",
+            is_recurring=True,
+            recurrence_period=Payable.RecurrencePeriod.WEEKLY,
+        )
+        stopped = Payable.objects.create(
+            owner=self.user,
+            title="Streaming",
+            payable_type="subscription",
+            amount="39.90",
+            due_date="2026-01-10",
+            is_recurring=True,
+        )
+        Payable.objects.filter(pk=stopped.pk).update(is_recurring=False)
+        version_before = UserDataVersion.objects.get_version(self.user.id)
+
+        today = timezone.datetime(2026, 2, 1).date()
+        created = materialize_recurring_payables(today=today, horizon_days=60)
+        self.assertEqual(created, 10)
+        self.assertEqual(
+            [str(payable.due_date) for payable in Payable.objects.filter(recurrence_group=monthly.recurrence_group).order_by("due_date")],
+            ["2026-01-31", "2026-02-28", "2026-03-31"],
+        )
+        self.assertEqual(
+            Payable.objects.filter(recurrence_group=weekly.recurrence_group).count(),
+            9,
+        )
+        generated = Payable.objects.get(recurrence_group=monthly.recurrence_group, due_date="2026-03-31")
+        self.assertEqual(generated.status, Payable.PayableStatus.PENDING)
+        self.assertEqual(generated.bank_id, self.bank.id)
+        self.assertEqual(generated.search_text, "academia\nnubank")
+        self.assertFalse(Payable.objects.filter(recurrence_group=stopped.recurrence_group).exclude(pk=stopped.pk).exists())
+        self.assertGreater(UserDataVersion.objects.get_version(self.user.id), version_before)
+
+        # Rodar de novo no mesmo dia nao duplica; encerrar a ultima ocorrencia interrompe a serie.
+        self.assertEqual(materialize_recurring_payables(today=today, horizon_days=60), 0)
+        generated.is_recurring = False
+        generated.save(update_fields=["is_recurring"])
+        self.assertEqual(materialize_recurring_payables(today=today, horizon_days=120), 9)
+        self.assertFalse(Payable.objects.filter(recurrence_group=monthly.recurrence_group, due_date__gt="2026-03-31").exists())
+
+        # Chaves que ja existem nao contam como geradas nem avisam o dono.
+        insurance = Payable.objects.create(
+            owner=self.user,
+            title="Seguro",
+            payable_type="subscription",
+            amount="80.00",
+            due_date="2026-01-15",
+            is_recurring=True,
+        )
+        for sequence, due_date in ((1, "2026-02-15"), (2, "2026-03-15")):
+            Payable.objects.create(
+                owner=self.user,
+                title="Seguro avulso",
+                payable_type="invoice",
+                amount="80.00",
+                due_date=due_date,
+                recurrence_key=f"{insurance.recurrence_group}:{sequence}",
+            )
+        version_before = UserDataVersion.objects.get_version(self.user.id)
+        self.assertEqual(materialize_recurring_payables(today=today, horizon_days=60), 0)
+        self.assertEqual(UserDataVersion.objects.get_version(self.user.id), version_before)
+
+        # Editar o vencimento da primeira ocorrencia nao muda as chaves: a serie continua da ultima.
+        club = Payable.objects.create(
+            owner=self.user,
+            title="Clube",
+            payable_type="subscription",
+            amount="60.00",
+            due_date="2026-01-31",
+            is_recurring=True,
+        )
+        self.assertEqual(club.recurrence_sequence, 0)
+        materialize_recurring_payables(today=today, horizon_days=60)
+        club.due_date = timezone.datetime(2026, 1, 30).date()
+        club.save()
+        self.assertEqual(materialize_recurring_payables(today=today, horizon_days=60), 0)
+        materialize_recurring_payables(today=today, horizon_days=120)
+        self.assertEqual(
+            list(
+                Payable.objects.filter(recurrence_group=club.recurrence_group)
+                .order_by("recurrence_sequence")
+                .values_list("recurrence_sequence", "due_date")
+            ),
+            [
+                (0, timezone.datetime(2026, 1, 30).date()),
+                (1, timezone.datetime(2026, 2, 28).date()),
+                (2, timezone.datetime(2026, 3, 31).date()),
+                (3, timezone.datetime(2026, 4, 30).date()),
+                (4, timezone.datetime(2026, 5, 30).date()),
+            ],
+        )
+
+        # Recorrentes antigas sem grupo nao sao agrupadas por titulo nem materializadas.
+        legacy = Payable.objects.create(
+            owner=self.user,
+            title="Jornal",
+            payable_type="subscription",
+            amount="20.00",
+            due_date="2026-01-20",
+        )
+        Payable.objects.filter(pk=legacy.pk).update(is_recurring=True)
+        materialize_recurring_payables(today=today, horizon_days=60)
+        self.assertFalse(Payable.objects.filter(title="Jornal").exclude(pk=legacy.pk).exists())
+        legacy.refresh_from_db()
+        self.assertIsNone(legacy.recurrence_group)
+
+    def test_payable_bulk_action_updates_in_sets_and_selects_by_filter(self):
+        paid = Payable.objects.create(
+            owner=self.user,
+            bank=self.bank,
+            title="Aluguel",
+            payable_type="invoice",
+            status="paid",
+            amount="900.00",
+            due_date="2026-02-05",
+            payment_date="2026-02-04",
+            payment_note="Pix",
+        )
+        paid.payment_receipt.save(
+            "aluguel.pdf",
+            SimpleUploadedFile("aluguel.pdf", b"%PDF-1.4\nbulk\n", content_type="application/pdf"),
+            save=True,
+        )
+        receipt_path = paid.payment_receipt.path
+        pending = Payable.objects.create(
+            owner=self.user,
+            title="Internet",
+            payable_type="invoice",
+            amount="100.00",
+            due_date="2026-02-10",
+        )
+        version_before = UserDataVersion.objects.get_version(self.user.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("payable_bulk_action"),
+                data=json.dumps({"action": "mark_pending", "payable_ids": [paid.id, paid.id, pending.id]}),
+                content_type="application/json",
+            )
+        self.assertEqual(
+            response.json(),
+            {"ok": True, "action": "mark_pending", "count": 1, "matched_count": 2, "updated_ids": [paid.id]},
+        )
+        paid.refresh_from_db()
+        self.assertEqual((paid.status, paid.payment_date, paid.payment_note), ("pending", None, ""))
+        self.assertFalse(paid.payment_receipt)
+        self.assertFalse(os.path.exists(receipt_path))
+        self.assertEqual(paid.search_text, "aluguel\nnubank")
+        history = PayableStatusHistory.objects.get(payable=paid)
+        self.assertEqual(
+            (
+                history.previous_status,
+                history.new_status,
+                history.previous_payment_date,
+                history.new_payment_date,
+                history.previous_payment_note,
+                history.new_payment_note,
+                history.source,
+                history.changed_by,
+            ),
+            ("paid", "pending", date(2026, 2, 4), None, "Pix", "", "bulk_mark_pending", self.user),
+        )
+        self.assertFalse(PayableStatusHistory.objects.filter(payable=pending).exists())
+        self.assertGreater(UserDataVersion.objects.get_version(self.user.id), version_before)
+
+        # Selecao por filtro, sem lista de ids: todas as contas da busca.
+        response = self.client.post(
+            reverse("payable_bulk_action"),
+            data=json.dumps(
+                {"action": "mark_paid", "filters": {"q": "aluguel", "status": "all"}, "payment_note": "Lote"}
+            ),
+            content_type="application/json",
+        )
+        self.assertEqual(response.json()["updated_ids"], [paid.id])
+        paid.refresh_from_db()
+        self.assertEqual((paid.status, paid.payment_date, paid.payment_note), ("paid", timezone.localdate(), "Lote"))
+        self.assertEqual(paid.search_text, "aluguel\nnubank lote")
+        paid_history = PayableStatusHistory.objects.filter(payable=paid, source="bulk_mark_paid").get()
+        self.assertEqual(
+            (
+                paid_history.previous_status,
+                paid_history.new_status,
+                paid_history.previous_payment_date,
+                paid_history.new_payment_date,
+                paid_history.previous_payment_note,
+                paid_history.new_payment_note,
+                paid_history.changed_by,
+            ),
+            ("pending", "paid", None, timezone.localdate(), "", "Lote", self.user),
+        )
+        self.assertIsNotNone(paid_history.changed_at)
+        pending.refresh_from_db()
+        self.assertEqual(pending.status, "pending")
+
+        # Sem data informada o lote usa hoje, inclusive em contas ja pagas em outra data.
+        Payable.objects.filter(id=paid.id).update(payment_date="2026-02-04")
+        response = self.client.post(
+            reverse("payable_bulk_action"),
+            data=json.dumps({"action": "mark_paid", "payable_ids": [paid.id], "payment_note": "Lote"}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.json()["updated_ids"], [paid.id])
+        paid.refresh_from_db()
+        self.assertEqual(paid.payment_date, timezone.localdate())
+        self.assertEqual(
+            self.client.post(
+                reverse("payable_bulk_action"),
+                data=json.dumps({"action": "delete", "filters": {"bank": "abc"}}),
+                content_type="application/json",
+            ).status_code,
+            400,
+        )
+
+        response = self.client.post(
+            reverse("payable_bulk_action"),
+            data=json.dumps({"action": "delete", "filters": {}}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.json()["deleted_ids"], sorted([paid.id, pending.id]))
+        self.assertFalse(Payable.objects.filter(owner=self.user).exists())
+        self.assertFalse(PayableStatusHistory.objects.exists())
+        self.assertEqual(
+            sorted(SyncTombstone.objects.filter(owner=self.user, model_name="payable").values_list("object_id", flat=True)),
+            sorted([paid.id, pending.id]),
+        )
+
+    def test_transaction_bulk_action_keeps_rollup_and_search_consistent(self):
+        other_bank = Bank.objects.create(owner=self.user, name="Itaú", slug="itau-bulk", color="#EC7000", icon="ph-bank")
+        coffee = Transaction.objects.create(
+            owner=self.user,
+            bank=self.bank,
+            title="Cafe",
+            description="Padaria",
+            transaction_type="expense",
+            amount="12.50",
+            transaction_date="2026-01-15",
+        )
+        salary = Transaction.objects.create(
+            owner=self.user,
+            bank=self.bank,
+            title="Salario",
+            transaction_type="income",
+            amount="3000.00",
+            transaction_date="2026-01-05",
+        )
+        rent = Transaction.objects.create(
+            owner=self.user,
+            bank=other_bank,
+            title="Aluguel",
+            transaction_type="expense",
+            amount="900.00",
+            transaction_date="2026-02-01",
+        )
+
+        def assert_rollup_matches():
+            expected = {
+                (row.bank_id, row.month): (row.income, row.expense, row.income_count, row.expense_count)
+                for row in MonthlyBankBalance.objects.filter(owner=self.user)
+                if row.income_count or row.expense_count
+            }
+            MonthlyBankBalance.objects.rebuild_for_owner(self.user)
+            rebuilt = {
+                (row.bank_id, row.month): (row.income, row.expense, row.income_count, row.expense_count)
+                for row in MonthlyBankBalance.objects.filter(owner=self.user)
+            }
+            self.assertEqual(expected, rebuilt)
+
+        # search_text vazio/desatualizado nao termina no nome do banco antigo: recalcula a linha inteira.
+        Transaction.objects.filter(id=salary.id).update(search_text="")
+
+        response = self.client.post(
+            reverse("transaction_bulk_action"),
+            data=json.dumps(
+                {
+                    "action": "change_bank",
+                    "bank": other_bank.id,
+                    "transaction_ids": [coffee.id, salary.id, rent.id, coffee.id],
+                }
+            ),
+            content_type="application/json",
+        )
+        self.assertEqual(
+            response.json(),
+            {
+                "ok": True,
+                "action": "change_bank",
+                "matched_count": 3,
+                "count": 2,
+                "transaction_ids": sorted([coffee.id, salary.id]),
+            },
+        )
+        coffee.refresh_from_db()
+        self.assertEqual(coffee.bank_id, other_bank.id)
+        self.assertEqual(coffee.search_text, "cafe\npadaria itau")
+        salary.refresh_from_db()
+        self.assertEqual((salary.bank_id, salary.search_text), (other_bank.id, "salario\nitau"))
+        assert_rollup_matches()
+
+        response = self.client.post(
+            reverse("transaction_bulk_action"),
+            data=json.dumps(
+                {
+                    "action": "change_date",
+                    "transaction_date": "2026-03-10",
+                    "filters": {"type": "expense", "q": "cafe"},
+                    "expected_count": 1,
+                }
+            ),
+            content_type="application/json",
+        )
+        self.assertEqual(response.json()["transaction_ids"], [coffee.id])
+        coffee.refresh_from_db()
+        self.assertEqual(str(coffee.transaction_date), "2026-03-10")
+        assert_rollup_matches()
+
+        # Lote por filtro exige a quantidade que a tela confirmou; sem ela, ou divergente, nada e apagado.
+        delete_filters = {"bank": str(other_bank.id), "type": "expense"}
+        missing_count = self.client.post(
+            reverse("transaction_bulk_action"),
+            data=json.dumps({"action": "delete", "filters": {}}),
+            content_type="application/json",
+        )
+        self.assertEqual(missing_count.status_code, 400)
+        self.assertIn("expected_count", missing_count.json()["errors"])
+        stale_count = self.client.post(
+            reverse("transaction_bulk_action"),
+            data=json.dumps({"action": "delete", "filters": delete_filters, "expected_count": 1}),
+            content_type="application/json",
+        )
+        self.assertEqual(stale_count.status_code, 409)
+        self.assertEqual(stale_count.json()["matched_count"], 2)
+        self.assertEqual(Transaction.objects.filter(owner=self.user).count(), 3)
+
+        version_before = UserDataVersion.objects.get_version(self.user.id)
+        with patch("dashboard.views.TRANSACTION_BULK_CHUNK_SIZE", 1):
+            response = self.client.post(
+                reverse("transaction_bulk_action"),
+                data=json.dumps({"action": "delete", "filters": delete_filters, "expected_count": 2}),
+                content_type="application/json",
+            )
+        self.assertEqual(response.json()["count"], 2)
+        self.assertEqual(list(Transaction.objects.filter(owner=self.user).values_list("id", flat=True)), [salary.id])
+        self.assertEqual(
+            sorted(SyncTombstone.objects.filter(owner=self.user, model_name="transaction").values_list("object_id", flat=True)),
+            sorted([coffee.id, rent.id]),
+        )
+        self.assertGreater(UserDataVersion.objects.get_version(self.user.id), version_before)
+        assert_rollup_matches()
+
+        invalid = self.client.post(
+            reverse("transaction_bulk_action"),
+            data=json.dumps({"action": "change_date", "transaction_date": "31/02", "transaction_ids": [salary.id]}),
+            content_type="application/json",
+        )
+        self.assertEqual(invalid.status_code, 400)
+        self.assertIn("transaction_date", invalid.json()["errors"])
+
+    def test_installment_reschedule_rewrites_remaining_plan_in_bulk(self):
+        def create_plan(title, total):
+            response = self.client.post(
+                reverse("payable_create"),
+                {
+                    "bank": self.bank.id,
+                    "title": title,
+                    "payable_type": "installment",
+                    "status": "pending",
+                    "amount": "600.00",
+                    "due_date": "2026-01-31",
+                    "installment_total": str(total),
+                },
+            )
+            return response.json()["payables"]
+
+        reference_id = create_plan("Notebook", 6)[0]["id"]
+        self.client.post(
+            reverse("payable_installment_bulk_update", kwargs={"payable_id": reference_id}),
+            {"action": "pay_until", "until_installment": "2", "payment_date": "2026-02-27"},
+        )
+
+        response = self.client.post(
+            reverse("payable_installment_reschedule", kwargs={"payable_id": reference_id}),
+            {"start_date": "2026-05-31", "installment_count": "6", "amount": "400.00"},
+        )
+        self.assertEqual(response.status_code, 200)
+        installments = list(Payable.objects.filter(title="Notebook").order_by("installment_number"))
+        self.assertEqual([item.installment_number for item in installments], list(range(1, 9)))
+        self.assertEqual({item.installment_total for item in installments}, {8})
+        self.assertEqual([item.status for item in installments[:2]], ["paid", "paid"])
+        self.assertEqual([str(item.amount) for item in installments[:2]], ["100.00", "100.00"])
+        # Mesma distribuicao de centavos do cadastro: 400,00 / 6 = 66,67 x4 + 66,66 x2.
+        self.assertEqual(
+            [str(item.amount) for item in installments[2:]],
+            ["66.67", "66.67", "66.67", "66.67", "66.66", "66.66"],
+        )
+        self.assertEqual(
+            [str(item.due_date) for item in installments[2:5]],
+            ["2026-05-31", "2026-06-30", "2026-07-31"],
+        )
+        self.assertEqual(installments[-1].search_text, "notebook\nnubank")
+        self.assertEqual(len(response.json()["payables"]), 8)
+        # Sem transicoes falsas "pendente -> pendente" no historico das parcelas reparceladas.
+        self.assertFalse(
+            PayableStatusHistory.objects.filter(payable__title="Notebook", source="installment_reschedule").exists()
+        )
+        history_response = self.client.get(reverse("payable_history_list", args=[installments[2].id]))
+        self.assertEqual(history_response.json()["history"], [])
+
+        response = self.client.post(
+            reverse("payable_installment_reschedule", kwargs={"payable_id": reference_id}),
+            {"installment_count": "1"},
+        )
+        removed_ids = response.json()["deleted_ids"]
+        self.assertEqual(len(removed_ids), 5)
+        remaining = Payable.objects.get(title="Notebook", status="pending")
+        self.assertEqual((remaining.installment_number, remaining.installment_total), (3, 3))
+        self.assertEqual(str(remaining.amount), "400.00")
+        self.assertEqual(
+            SyncTombstone.objects.filter(owner=self.user, model_name="payable", object_id__in=removed_ids).count(),
+            5,
+        )
+
+        # O numero de consultas nao cresce com o tamanho do plano.
+        query_counts = []
+        for title, total in (("Plano curto", 3), ("Plano longo", 30)):
+            plan_reference_id = create_plan(title, total)[0]["id"]
+            with CaptureQueriesContext(connection) as queries:
+                self.client.post(
+                    reverse("payable_installment_reschedule", kwargs={"payable_id": plan_reference_id}),
+                    {"installment_count": str(total + 5)},
+                )
+            query_counts.append(len(queries))
+        self.assertEqual(query_counts[0], query_counts[1])
+
+        self.assertEqual(
+            self.client.post(
+                reverse("payable_installment_reschedule", kwargs={"payable_id": reference_id}),
+                {"amount": "abc"},
+            ).status_code,
+            400,
+        )
+        for invalid_amount in ("NaN", "Infinity", "1e20"):
+            response = self.client.post(
+                reverse("payable_installment_reschedule", kwargs={"payable_id": reference_id}),
+                {"amount": invalid_amount},
+            )
+            self.assertEqual(response.status_code, 400, invalid_amount)
+            self.assertIn("amount", response.json()["errors"])
+
+    def test_receipt_upload_deduplicates_blobs_and_gc_removes_unreferenced(self):
+        content = b"%PDF-1.4\ncarne do carro\n"
+        payables = [
+            Payable.objects.create(
+                owner=self.user,
+                title="Carro",
+                payable_type="installment",
+                status="paid",
+                amount="500.00",
+                due_date=f"2026-0{month}-10",
+                payment_date=f"2026-0{month}-09",
+                installment_number=month,
+                installment_total=3,
+            )
+            for month in (1, 2, 3)
+        ]
+        for payable in payables:
+            response = self.client.post(
+                reverse("payable_receipt_upload", kwargs={"payable_id": payable.id}),
+                {"receipt": SimpleUploadedFile("carro.pdf", content, content_type="application/pdf")},
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()["payable"]["payment_receipt_name"], "carro.pdf")
+
+        receipt = Receipt.objects.get(owner=self.user)
+        self.assertEqual(receipt.sha256, hashlib.sha256(content).hexdigest())
+        self.assertEqual((receipt.ref_count, receipt.size), (3, len(content)))
+        self.assertEqual(
+            set(Payable.objects.filter(id__in=[payable.id for payable in payables]).values_list("payment_receipt", flat=True)),
+            {receipt.file.name},
+        )
+        blob_dir = os.path.dirname(receipt.file.path)
+        self.assertEqual(os.listdir(blob_dir), ["carro.pdf"])
+
+        view_response = self.client.get(reverse("payable_receipt_view", kwargs={"payable_id": payables[2].id}))
+        self.assertEqual(b"".join(view_response.streaming_content), content)
+
+        self.client.post(reverse("payable_receipt_delete", kwargs={"payable_id": payables[0].id}))
+        self.client.post(
+            reverse("payable_bulk_action"),
+            data=json.dumps({"action": "mark_pending", "payable_ids": [payables[1].id]}),
+            content_type="application/json",
+        )
+        receipt.refresh_from_db()
+        self.assertEqual(receipt.ref_count, 1)
+        self.assertTrue(os.path.exists(receipt.file.path))
+
+        call_command("gc_receipts", "--grace-minutes", "0", stdout=StringIO())
+        self.assertTrue(Receipt.objects.filter(id=receipt.id).exists())
+
+        self.client.post(
+            reverse("payable_bulk_action"),
+            data=json.dumps({"action": "delete", "payable_ids": [payables[2].id]}),
+            content_type="application/json",
+        )
+        receipt.refresh_from_db()
+        self.assertEqual(receipt.ref_count, 0)
+        self.assertTrue(os.path.exists(receipt.file.path))
+
+        orphan_path = os.path.join(self.test_media_root, "receipts", str(self.user.id), "ff", "f" * 64, "perdido.pdf")
+        os.makedirs(os.path.dirname(orphan_path))
+        with open(orphan_path, "wb") as orphan_file:
+            orphan_file.write(b"abandonado")
+        old_timestamp = (timezone.now() - timedelta(hours=2)).timestamp()
+        os.utime(orphan_path, (old_timestamp, old_timestamp))
+
+        output = StringIO()
+        call_command("gc_receipts", "--grace-minutes", "0", stdout=output)
+        self.assertIn("Blobs removidos: 1 | arquivos orfaos: 1", output.getvalue())
+        self.assertFalse(Receipt.objects.filter(id=receipt.id).exists())
+        self.assertFalse(os.path.exists(os.path.join(blob_dir, "carro.pdf")))
+        self.assertFalse(os.path.exists(orphan_path))
+
+    def test_receipt_view_supports_conditional_range_and_sendfile(self):
+        payable = Payable.objects.create(
+            owner=self.user,
+            title="Condominio",
+            payable_type="invoice",
+            status="paid",
+            amount="700.00",
+            due_date="2026-03-10",
+            payment_date="2026-03-09",
+        )
+        content = b"%PDF-1.4\n" + b"0123456789" * 10
+        upload_response = self.client.post(
+            reverse("payable_receipt_upload", kwargs={"payable_id": payable.id}),
+            {"receipt": SimpleUploadedFile("condominio.pdf", content, content_type="application/pdf")},
+        )
+        receipt_url = upload_response.json()["payable"]["payment_receipt_url"]
+        self.assertIn("?v=", receipt_url)
+
+        response = self.client.get(receipt_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), content)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertIn("private", response["Cache-Control"])
+        etag = response["ETag"]
+
+        revalidate = self.client.get(reverse("payable_receipt_view", kwargs={"payable_id": payable.id}))
+        self.assertIn("no-cache", revalidate["Cache-Control"])
+        not_modified = self.client.get(receipt_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified["ETag"], etag)
+
+        partial = self.client.get(receipt_url, HTTP_RANGE="bytes=9-18")
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(b"".join(partial.streaming_content), b"0123456789")
+        self.assertEqual(partial["Content-Range"], f"bytes 9-18/{len(content)}")
+        suffix = self.client.get(receipt_url, HTTP_RANGE="bytes=-4")
+        self.assertEqual(b"".join(suffix.streaming_content), b"6789")
+        stale_if_range = self.client.get(receipt_url, HTTP_RANGE="bytes=9-18", HTTP_IF_RANGE='"outro"')
+        self.assertEqual(stale_if_range.status_code, 200)
+        unsatisfiable = self.client.get(receipt_url, HTTP_RANGE="bytes=500-")
+        self.assertEqual(unsatisfiable.status_code, 416)
+        self.assertEqual(unsatisfiable["Content-Range"], f"bytes */{len(content)}")
+
+        payable.refresh_from_db()
+        with override_settings(RECEIPT_SENDFILE_MODE="x-accel-redirect", RECEIPT_SENDFILE_PREFIX="/protected/"):
+            offloaded = self.client.get(receipt_url)
+        self.assertEqual(offloaded.status_code, 200)
+        self.assertEqual(offloaded.content, b"")
+        self.assertEqual(offloaded["X-Accel-Redirect"], f"/protected/{payable.payment_receipt.name}")
+        self.assertEqual(offloaded["ETag"], etag)
+
+        other_user = get_user_model().objects.create_user(username="outra", password="123456Teste!")
+        self.client.force_login(other_user)
+        with override_settings(RECEIPT_SENDFILE_MODE="x-sendfile"):
+            self.assertEqual(self.client.get(receipt_url).status_code, 404)
@@ -8,10 +8,14 @@ from .views import (
     dashboard_home,
     payable_create,
     payable_bulk_action,
+    payable_calendar,
     payable_category_create,
     payable_category_delete,
     payable_delete,
     payable_installment_bulk_update,
+    payable_installment_list,
+    payable_installment_reschedule,
+    payable_list,
     payable_receipt_delete,
     payable_receipt_upload,
     payable_receipt_view,
@@ -19,14 +23,24 @@ from .views import (
     payable_status_update,
     payable_update,
     report_export,
+    report_job_create,
+    report_job_detail,
+    report_job_download,
+    search,
+    sync_changes,
     event_create,
     event_delete,
     event_list,
     event_update,
+    live_updates,
+    transaction_bulk_action,
     transaction_create,
     transaction_delete,
+    transaction_import,
+    transaction_list,
+    transaction_summary,
     transaction_update,
-    # import_events_json
+    import_events_json,
 )
 
 urlpatterns = [
@@ -44,7 +58,11 @@ urlpatterns = [
     path("api/events/<int:event_id>/delete/", event_delete, name="event_delete"),
     path("api/banks/create/", bank_create, name="bank_create"),
     path("api/banks/<int:bank_id>/delete/", bank_delete, name="bank_delete"),
+    path("api/summary/", transaction_summary, name="transaction_summary"),
+    path("api/transactions/", transaction_list, name="transaction_list"),
     path("api/transactions/create/", transaction_create, name="transaction_create"),
+    path("api/transactions/import/", transaction_import, name="transaction_import"),
+    path("api/transactions/bulk/", transaction_bulk_action, name="transaction_bulk_action"),
     path(
         "api/transactions/<int:transaction_id>/update/",
         transaction_update,
@@ -55,7 +73,9 @@ urlpatterns = [
         transaction_delete,
         name="transaction_delete",
     ),
+    path("api/payables/", payable_list, name="payable_list"),
     path("api/payables/create/", payable_create, name="payable_create"),
+    path("api/payables/calendar/", payable_calendar, name="payable_calendar"),
     path("api/payables/bulk-action/", payable_bulk_action, name="payable_bulk_action"),
     path(
         "api/payable-categories/create/",
@@ -82,11 +102,21 @@ urlpatterns = [
         payable_status_update,
         name="payable_status_update",
     ),
+    path(
+        "api/payables/<int:payable_id>/installments/",
+        payable_installment_list,
+        name="payable_installment_list",
+    ),
     path(
         "api/payables/<int:payable_id>/installments/bulk/",
         payable_installment_bulk_update,
         name="payable_installment_bulk_update",
     ),
+    path(
+        "api/payables/<int:payable_id>/installments/reschedule/",
+        payable_installment_reschedule,
+        name="payable_installment_reschedule",
+    ),
     path(
         "api/payables/<int:payable_id>/receipt/upload/",
         payable_receipt_upload,
@@ -112,5 +142,31 @@ urlpatterns = [
         report_export,
         name="report_export",
     ),
-    #  path("events/importar-json/", import_events_json, name="import_events_json"),
+    path("api/search/", search, name="search"),
+    path(
+        "api/sync/",
+        sync_changes,
+        name="sync_changes",
+    ),
+    path(
+        "api/live/",
+        live_updates,
+        name="live_updates",
+    ),
+    path(
+        "api/reports/jobs/",
+        report_job_create,
+        name="report_job_create",
+    ),
+    path(
+        "api/reports/jobs/<int:job_id>/",
+        report_job_detail,
+        name="report_job_detail",
+    ),
+    path(
+        "api/reports/jobs/<int:job_id>/download/",
+        report_job_download,
+        name="report_job_download",
+    ),
+    path("events/importar-json/", import_events_json, name="import_events_json"),
 ]
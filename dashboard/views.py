@@ -1,28 +1,67 @@
+import asyncio
 from calendar import monthrange
-from collections import defaultdict
+import codecs
+from collections import Counter, defaultdict
 import csv
+import hashlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+import html
+import io
 import json
 import mimetypes
 import os
-from decimal import Decimal, ROUND_DOWN
-from io import StringIO, BytesIO
+import re
+import tempfile
+from decimal import Decimal, InvalidOperation, ROUND_DOWN
 import unicodedata
+import zlib
+from urllib.parse import quote
 from uuid import uuid4
 from xml.sax.saxutils import escape
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.db import transaction as db_transaction
+from django.core.cache import caches
+from django.core.files import File
+from django.core.handlers.asgi import ASGIRequest
+from django.db import IntegrityError, transaction as db_transaction
+from django.db.models import Case, CharField, Count, DecimalField, F, IntegerField, Max, Min, Q, Sum, UUIDField, Value, When
 from django.db.models.deletion import ProtectedError
-from django.http import FileResponse, Http404, HttpResponse, JsonResponse
+from django.db.models.lookups import Contains
+from django.db.models.functions import Cast, Coalesce, Concat, Left, Length, StrIndex, Substr, TruncMonth
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, render, redirect
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.utils.dateparse import parse_date
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
 from django.utils import timezone
-from django.views.decorators.http import require_POST
+from django.views.decorators.cache import cache_control
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from django.views.decorators.http import condition, require_POST
 from django.utils.text import slugify
 from django.urls import reverse
 
+from .live_updates import live_update_broker
+from .uploads import HashingUploadHandler
 from .forms import BankForm, EventForm, PayableCategoryForm, PayableForm, TransactionForm
-from .models import Bank, Event, Payable, PayableCategory, PayableStatusHistory, Transaction, UserDashboardLayout
+from .models import (
+    Bank,
+    Event,
+    MonthlyBankBalance,
+    Payable,
+    PayableCategory,
+    PayableStatusHistory,
+    Receipt,
+    ReportJob,
+    SyncTombstone,
+    Transaction,
+    UserDashboardLayout,
+    UserDataVersion,
+    bulk_write,
+    fold_search_text,
+    refresh_search_text_for,
+)
 
 
 
@@ -35,12 +74,6 @@ from django.db import transaction
 
 
 
-DEFAULT_BANKS = [
-    {"name": "Nubank", "slug": "nubank", "color": "#8A05BE", "icon": "ph-credit-card"},
-    {"name": "Itau", "slug": "itau", "color": "#EC7000", "icon": "ph-bank"},
-    {"name": "Inter", "slug": "inter", "color": "#FF7A00", "icon": "ph-wallet"},
-]
-
 DASHBOARD_WIDGET_IDS = [
     "summary_cards",
     "reminders",
@@ -51,11 +84,105 @@ DASHBOARD_WIDGET_IDS = [
     "transactions_table",
 ]
 
-
-def _bootstrap_banks(user):
-    if Bank.objects.filter(owner=user).exists():
-        return
-    Bank.objects.bulk_create([Bank(owner=user, **bank_data) for bank_data in DEFAULT_BANKS])
+TRANSACTION_PAGE_SIZE = 100
+TRANSACTION_PAGE_MAX_SIZE = 500
+DASHBOARD_TRANSACTION_EMBED_LIMIT = 1000
+TRANSACTION_CHART_MONTHS = 6
+TRANSACTION_PERIOD_FILTERS = {"all", "today", "last7", "last30", "this_month"}
+REPORT_ITERATOR_CHUNK_SIZE = 2000
+REPORT_CACHE_ALIAS = "reports"
+REPORT_CACHE_TIMEOUT = 60 * 60
+REPORT_CACHE_MAX_BYTES = 5 * 1024 * 1024
+REPORT_CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "excel": "application/vnd.ms-excel",
+    "pdf": "application/pdf",
+}
+REPORT_PDF_LINES_PER_PAGE = 46
+REPORT_PDF_COMPRESS_STREAMS = True
+DEFAULT_TRANSACTION_FILTERS = {"bank": "all", "type": "all", "period": "all", "q": ""}
+TRANSACTION_TYPE_SEARCH_ALIASES = {
+    Transaction.TransactionType.INCOME: "entrada entradas receita receitas ganho ganhos credito creditos income",
+    Transaction.TransactionType.EXPENSE: "saida saidas despesa despesas gasto gastos debito debitos expense",
+}
+DEFAULT_PAYABLE_FILTERS = {
+    "status": "all",
+    "type": "all",
+    "bank": "all",
+    "category": "all",
+    "period": "all",
+    "date": None,
+    "q": "",
+}
+PAYABLE_PAGE_SIZE = 50
+PAYABLE_PAGE_MAX_SIZE = 200
+DASHBOARD_PAYABLE_EMBED_LIMIT = 1000
+DASHBOARD_PAYABLE_WORKING_SET_LIMIT = 500
+PAYABLE_REMINDER_DAYS = 3
+PAYABLE_BULK_CHUNK_SIZE = 1000
+INSTALLMENT_RESCHEDULE_MAX_COUNT = 600
+# Payable.amount: max_digits=12, decimal_places=2.
+PAYABLE_MAX_AMOUNT = Decimal("9999999999.99")
+RECEIPT_ACQUIRE_ATTEMPTS = 3
+RECEIPT_CACHE_MAX_AGE = 365 * 24 * 60 * 60
+RECEIPT_STREAM_CHUNK_SIZE = 64 * 1024
+TRANSACTION_BULK_CHUNK_SIZE = 1000
+PAYABLE_PERIOD_FILTERS = {"all", "today", "next7", "this_month", "overdue"}
+PAYABLE_STATUS_FILTERS = {"all", "pending", "overdue", "paid"}
+PAYABLE_TYPE_SEARCH_ALIASES = {
+    Payable.PayableType.INVOICE: "fatura cartao boleto invoice",
+    Payable.PayableType.SUBSCRIPTION: "assinatura recorrente subscription mensalidade",
+    Payable.PayableType.DEBT: "divida emprestimo debt debito",
+    Payable.PayableType.INSTALLMENT: "parcela parcelado installment",
+    Payable.PayableType.OTHER: "outro avulso other",
+}
+PAYABLE_STATUS_SEARCH_ALIASES = {
+    "paid": "pago paga quitado quitada paid",
+    "overdue": "vencida vencido atrasada atrasado overdue",
+    "pending": "pendente aberto em aberto pending",
+}
+SYNC_MAX_CHANGES_PER_MODEL = 500
+SYNC_TOKEN_OVERLAP_SECONDS = 2
+SYNC_TOMBSTONE_RETENTION_DAYS = 30
+SYNC_TOKEN_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+SYNC_TOMBSTONE_KEYS = {
+    SyncTombstone.SyncModel.TRANSACTION: "transactions",
+    SyncTombstone.SyncModel.PAYABLE: "payables",
+    SyncTombstone.SyncModel.EVENT: "events",
+    SyncTombstone.SyncModel.BANK: "banks",
+    SyncTombstone.SyncModel.CATEGORY: "categories",
+}
+STATEMENT_IMPORT_BATCH_SIZE = 1000
+STATEMENT_IMPORT_MAX_ERRORS = 100
+STATEMENT_SNIFF_BYTES = 64 * 1024
+STATEMENT_MAX_AMOUNT = Decimal("9999999999.99")
+STATEMENT_CSV_COLUMNS = {
+    "date": {"data", "date", "data lancamento", "data do lancamento", "data da transacao", "data movimento"},
+    "title": {"descricao", "historico", "titulo", "lancamento", "estabelecimento", "description", "title", "memo"},
+    "description": {"detalhes", "complemento", "observacao", "details"},
+    "amount": {"valor", "valor (r$)", "quantia", "amount", "value"},
+    "credit": {"credito", "credito (r$)", "entrada", "credit"},
+    "debit": {"debito", "debito (r$)", "saida", "debit"},
+    "type": {"tipo", "natureza", "type"},
+}
+OFX_TAG_PATTERN = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+EVENT_IMPORT_BATCH_SIZE = 1000
+EVENT_IMPORT_READ_CHUNK_SIZE = 64 * 1024
+EVENT_IMPORT_MAX_ERRORS = 100
+JSON_WHITESPACE_PATTERN = re.compile(r"[ \t\n\r]*")
+LIVE_UPDATES_RETRY_MS = 3000
+LIVE_UPDATES_HEARTBEAT_SECONDS = 15
+LIVE_UPDATES_MAX_SECONDS = 5 * 60
+RECURRENCE_HORIZON_DAYS = 40
+RECURRENCE_SERIES_CHUNK_SIZE = 500
+RECURRENCE_INSERT_BATCH_SIZE = 1000
+SEARCH_PAGE_SIZE = 20
+SEARCH_PAGE_MAX_SIZE = 100
+SEARCH_MAX_PAGE = 50
+SEARCH_SCOPES = {"all", "transactions", "payables"}
+SEARCH_TITLE_WEIGHT = 3
+SEARCH_TEXT_WEIGHT = 1
+MONTH_SEARCH_LABELS = ["jan", "fev", "mar", "abr", "mai", "jun", "jul", "ago", "set", "out", "nov", "dez"]
 
 
 def _serialize_transaction(transaction):
@@ -118,6 +245,7 @@ def _serialize_payable(payable, request=None):
     if payable.payment_receipt:
         receipt_name = os.path.basename(payable.payment_receipt.name)
         receipt_path = reverse("payable_receipt_view", kwargs={"payable_id": payable.id})
+        receipt_path = f"{receipt_path}?v={_receipt_version(payable.payment_receipt.name)}"
         receipt_url = request.build_absolute_uri(receipt_path) if request else receipt_path
 
     return {
@@ -136,6 +264,7 @@ def _serialize_payable(payable, request=None):
         "installment_total": payable.installment_total,
         "installment_group": str(payable.installment_group) if payable.installment_group else None,
         "is_recurring": payable.is_recurring,
+        "recurrence_period": payable.recurrence_period,
         "category": _serialize_payable_category(payable.category) if payable.category else None,
         "bank": (
             {
@@ -207,12 +336,54 @@ def _parse_optional_date(raw_date):
 
 
 def _delete_payable_receipt_file(payable):
+    if payable.receipt_id:
+        # Blob compartilhado: so solta a referencia, o gc_receipts apaga quando ninguem mais usa.
+        Receipt.objects.release([payable.receipt_id])
+        payable.receipt = None
+        payable.payment_receipt = None
+        return
     if not payable.payment_receipt:
         return
     payable.payment_receipt.delete(save=False)
     payable.payment_receipt = None
 
 
+def _hash_uploaded_file(uploaded_file):
+    hasher = hashlib.sha256()
+    for chunk in uploaded_file.chunks():
+        hasher.update(chunk)
+    uploaded_file.seek(0)
+    return hasher.hexdigest()
+
+
+def _acquire_receipt_blob(owner, uploaded_file, digest):
+    # Conteudo repetido reaproveita o blob existente: nenhum byte novo vai para o storage.
+    for _attempt in range(RECEIPT_ACQUIRE_ATTEMPTS):
+        receipt = Receipt.objects.filter(owner=owner, sha256=digest).first()
+        if receipt is None:
+            receipt = Receipt(owner=owner, sha256=digest, size=uploaded_file.size, ref_count=1)
+            receipt.file.save(os.path.basename(uploaded_file.name), uploaded_file, save=False)
+            try:
+                with db_transaction.atomic():
+                    receipt.save()
+                return receipt
+            except IntegrityError:
+                # Upload concorrente do mesmo arquivo gravou antes; o storage deu outro nome a este.
+                receipt.file.delete(save=False)
+                continue
+        if Receipt.objects.acquire(receipt.id):
+            return receipt
+    raise IntegrityError(f"Nao foi possivel registrar o comprovante {digest}.")
+
+
+def _release_payable_receipts(receipt_rows):
+    # receipt_rows: pares (payment_receipt, receipt_id) das contas que perderam o comprovante.
+    Receipt.objects.release(receipt_id for _receipt_name, receipt_id in receipt_rows if receipt_id)
+    _delete_receipt_files_on_commit(
+        [receipt_name for receipt_name, receipt_id in receipt_rows if receipt_name and not receipt_id]
+    )
+
+
 def _apply_payable_status(payable, status, payment_date=None, payment_note=None, clear_receipt=False):
     payable.status = status
     if status == Payable.PayableStatus.PAID:
@@ -324,6 +495,168 @@ def _get_report_file_name(report_type, report_format, selected_bank, start_date=
     )
 
 
+def _parse_report_request(user, params):
+    report_type = params.get("report_type", "cashflow")
+    report_format = params.get("format", "csv")
+    detail_level = params.get("detail_level", "both")
+
+    if report_type not in {"cashflow", "payables"}:
+        raise ValueError("report_type", "Tipo de relatorio invalido.")
+    if report_format not in REPORT_CONTENT_TYPES:
+        raise ValueError("format", "Formato de exportacao invalido.")
+    if detail_level not in {"consolidated", "detailed", "both"}:
+        raise ValueError("detail_level", "Nivel de detalhamento invalido.")
+
+    try:
+        selected_bank = _get_report_bank(user, params.get("bank", "all"))
+        start_date, end_date = _parse_report_period(params.get("start_date", ""), params.get("end_date", ""))
+    except ValueError as exc:
+        field = "bank"
+        message = str(exc)
+        if "Data inicial" in message:
+            field = "start_date"
+        elif "Data final" in message or "Data inicial nao pode" in message:
+            field = "end_date"
+        raise ValueError(field, message) from exc
+
+    return {
+        "report_type": report_type,
+        "report_format": report_format,
+        "detail_level": detail_level,
+        "bank": selected_bank,
+        "start_date": start_date,
+        "end_date": end_date,
+    }
+
+
+def _get_report_params_key(user, report_params):
+    raw_key = "|".join(
+        [
+            str(user.id),
+            report_params["report_type"],
+            report_params["report_format"],
+            str(report_params["bank"].id if report_params["bank"] else "all"),
+            report_params["start_date"].isoformat() if report_params["start_date"] else "",
+            report_params["end_date"].isoformat() if report_params["end_date"] else "",
+            report_params["detail_level"],
+        ]
+    )
+    return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+
+def _get_report_cache_key(user, report_params, data_version):
+    # A versao muda a cada escrita do usuario e a data entra por causa de "Vencida"/"Gerado em".
+    params_key = _get_report_params_key(user, report_params)
+    return f"report:{params_key}:{timezone.localdate().isoformat()}:{data_version}"
+
+
+def _iter_and_cache_report_content(chunks, cache_key, user_id, data_version):
+    buffered_chunks = []
+    buffered_size = 0
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        if buffered_chunks is not None:
+            buffered_size += len(chunk)
+            if buffered_size > REPORT_CACHE_MAX_BYTES:
+                buffered_chunks = None
+            else:
+                buffered_chunks.append(chunk)
+        yield chunk
+    # Relatorios grandes demais continuam so em streaming, sem ocupar o cache. Uma escrita durante o
+    # streaming muda a versao: o conteudo pode misturar os dois estados e nao fica guardado sob a chave antiga.
+    if buffered_chunks is not None and UserDataVersion.objects.get_version(user_id) == data_version:
+        caches[REPORT_CACHE_ALIAS].set(cache_key, b"".join(buffered_chunks), REPORT_CACHE_TIMEOUT)
+
+
+def _get_or_create_report_job(user, report_params):
+    active_key = _get_report_params_key(user, report_params)
+    existing = ReportJob.objects.filter(active_key=active_key).first()
+    if existing:
+        return existing, False
+
+    file_name = _get_report_file_name(
+        report_params["report_type"],
+        report_params["report_format"],
+        report_params["bank"],
+        report_params["start_date"],
+        report_params["end_date"],
+        report_params["detail_level"],
+    )
+    try:
+        with db_transaction.atomic():
+            job = ReportJob.objects.create(
+                owner=user,
+                bank=report_params["bank"],
+                report_type=report_params["report_type"],
+                report_format=report_params["report_format"],
+                detail_level=report_params["detail_level"],
+                start_date=report_params["start_date"],
+                end_date=report_params["end_date"],
+                active_key=active_key,
+                file_name=file_name,
+            )
+    except IntegrityError:
+        # Outra requisicao criou o mesmo job entre o filtro e o insert.
+        existing = ReportJob.objects.filter(active_key=active_key).first()
+        if not existing:
+            raise
+        return existing, False
+    return job, True
+
+
+def _serialize_report_job(job):
+    download_url = ""
+    if job.status == ReportJob.ReportJobStatus.DONE:
+        download_url = reverse("report_job_download", kwargs={"job_id": job.id})
+    return {
+        "id": job.id,
+        "report_type": job.report_type,
+        "format": job.report_format,
+        "bank_id": job.bank_id,
+        "detail_level": job.detail_level,
+        "start_date": job.start_date.isoformat() if job.start_date else "",
+        "end_date": job.end_date.isoformat() if job.end_date else "",
+        "status": job.status,
+        "status_label": job.get_status_display(),
+        "file_name": job.file_name,
+        "error_message": job.error_message,
+        "created_at": timezone.localtime(job.created_at).isoformat(),
+        "finished_at": timezone.localtime(job.finished_at).isoformat() if job.finished_at else "",
+        "status_url": reverse("report_job_detail", kwargs={"job_id": job.id}),
+        "download_url": download_url,
+    }
+
+
+def process_report_job(job):
+    try:
+        title, headers, rows, summary = _build_report_dataset(
+            job.report_type,
+            job.owner,
+            job.bank,
+            job.start_date,
+            job.end_date,
+            job.detail_level,
+        )
+        # Grava em arquivo temporario para nao montar o relatorio inteiro em memoria.
+        with tempfile.TemporaryFile() as buffer:
+            for chunk in _iter_report_content(job.report_format, title, headers, rows, summary):
+                buffer.write(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+            buffer.seek(0)
+            job.file.save(job.file_name, File(buffer), save=False)
+    except Exception as exc:
+        job.status = ReportJob.ReportJobStatus.FAILED
+        job.error_message = str(exc)[:255] or exc.__class__.__name__
+    else:
+        job.status = ReportJob.ReportJobStatus.DONE
+        job.error_message = ""
+
+    job.active_key = None
+    job.finished_at = timezone.now()
+    job.save(update_fields=["file", "status", "error_message", "active_key", "finished_at"])
+    return job
+
+
 def _payable_status_label_for_report(payable, today):
     if payable.status == Payable.PayableStatus.PAID:
         return "Pago"
@@ -332,6 +665,15 @@ def _payable_status_label_for_report(payable, today):
     return "Pendente"
 
 
+def _payable_report_status_expression(today):
+    return Case(
+        When(status=Payable.PayableStatus.PAID, then=Value("Pago")),
+        When(due_date__lt=today, then=Value("Vencida")),
+        default=Value("Pendente"),
+        output_field=CharField(),
+    )
+
+
 def _format_report_period_label(start_date, end_date):
     if not start_date and not end_date:
         return "Todo periodo"
@@ -368,78 +710,81 @@ def _build_payables_report_dataset(user, selected_bank, start_date, end_date, de
         "Obs pagamento",
         "Descricao",
     ]
-    detailed_rows = []
-    total_pending = Decimal("0.00")
-    total_overdue = Decimal("0.00")
-    total_paid = Decimal("0.00")
-    by_bank = defaultdict(lambda: Decimal("0.00"))
-    by_category = defaultdict(lambda: Decimal("0.00"))
-    by_status = defaultdict(lambda: Decimal("0.00"))
-
-    for payable in queryset:
-        status_label = _payable_status_label_for_report(payable, today)
-        installment_label = "-"
-        if payable.installment_number and payable.installment_total:
-            installment_label = f"{payable.installment_number}/{payable.installment_total}"
-        bank_name = payable.bank.name if payable.bank else "Sem banco"
-        category_name = payable.category.name if payable.category else payable.get_payable_type_display()
-        detailed_rows.append(
-            [
+    def _iter_detailed_rows():
+        for payable in queryset.iterator(chunk_size=REPORT_ITERATOR_CHUNK_SIZE):
+            installment_label = "-"
+            if payable.installment_number and payable.installment_total:
+                installment_label = f"{payable.installment_number}/{payable.installment_total}"
+            yield [
                 _format_date_br(payable.due_date),
                 payable.title,
-                category_name,
-                bank_name,
-                status_label,
+                payable.category.name if payable.category else payable.get_payable_type_display(),
+                payable.bank.name if payable.bank else "Sem banco",
+                _payable_status_label_for_report(payable, today),
                 installment_label,
                 _format_currency_br(payable.amount),
                 _format_date_br(payable.payment_date),
                 payable.payment_note or "-",
                 payable.description or "-",
             ]
-        )
-        by_bank[bank_name] += payable.amount
-        by_category[category_name] += payable.amount
-        by_status[status_label] += payable.amount
-        if status_label == "Pago":
-            total_paid += payable.amount
-        elif status_label == "Vencida":
-            total_overdue += payable.amount
-        else:
-            total_pending += payable.amount
 
-    total_amount = total_pending + total_overdue + total_paid
+    rows = _iter_detailed_rows() if detail_level in {"detailed", "both"} else iter(())
     detail_label_map = {
         "consolidated": "Consolidado",
         "detailed": "Detalhado",
         "both": "Consolidado + detalhado",
     }
-    rows = detailed_rows if detail_level in {"detailed", "both"} else []
-    summary = [
-        f"Visao: {detail_label_map.get(detail_level, 'Consolidado + detalhado')}",
-        f"Periodo: {_format_report_period_label(start_date, end_date)}",
-        f"Total de contas: {len(detailed_rows)}",
-        f"Total pendente: {_format_currency_br(total_pending)}",
-        f"Total vencido: {_format_currency_br(total_overdue)}",
-        f"Total pago: {_format_currency_br(total_paid)}",
-        f"Total geral: {_format_currency_br(total_amount)}",
-    ]
-    if detail_level in {"consolidated", "both"}:
-        summary.append("Consolidado por banco:")
-        for bank_name in sorted(by_bank.keys()):
-            summary.append(f"- {bank_name}: {_format_currency_br(by_bank[bank_name])}")
-        summary.append("Consolidado por categoria:")
-        for category_name in sorted(by_category.keys()):
-            summary.append(f"- {category_name}: {_format_currency_br(by_category[category_name])}")
-        summary.append("Consolidado por status:")
-        for status_name in sorted(by_status.keys()):
-            summary.append(f"- {status_name}: {_format_currency_br(by_status[status_name])}")
+
+    # Os totais saem de agregacoes no banco; nenhuma linha e instanciada para o resumo.
+    def _iter_summary():
+        aggregate_qs = queryset.order_by()
+        by_status = {}
+        total_count = 0
+        status_rows = (
+            aggregate_qs.annotate(status_label=_payable_report_status_expression(today))
+            .values("status_label")
+            .annotate(total=Sum("amount"), count=Count("id"))
+        )
+        for row in status_rows:
+            by_status[row["status_label"]] = row["total"]
+            total_count += row["count"]
+        total_pending = by_status.get("Pendente", Decimal("0.00"))
+        total_overdue = by_status.get("Vencida", Decimal("0.00"))
+        total_paid = by_status.get("Pago", Decimal("0.00"))
+
+        yield f"Visao: {detail_label_map.get(detail_level, 'Consolidado + detalhado')}"
+        yield f"Periodo: {_format_report_period_label(start_date, end_date)}"
+        yield f"Total de contas: {total_count}"
+        yield f"Total pendente: {_format_currency_br(total_pending)}"
+        yield f"Total vencido: {_format_currency_br(total_overdue)}"
+        yield f"Total pago: {_format_currency_br(total_paid)}"
+        yield f"Total geral: {_format_currency_br(total_pending + total_overdue + total_paid)}"
+        if detail_level in {"consolidated", "both"}:
+            by_bank = defaultdict(lambda: Decimal("0.00"))
+            for row in aggregate_qs.values("bank__name").annotate(total=Sum("amount")):
+                by_bank[row["bank__name"] or "Sem banco"] += row["total"]
+            by_category = defaultdict(lambda: Decimal("0.00"))
+            payable_type_labels = dict(Payable.PayableType.choices)
+            for row in aggregate_qs.values("category__name", "payable_type").annotate(total=Sum("amount")):
+                category_name = row["category__name"] or payable_type_labels.get(row["payable_type"], row["payable_type"])
+                by_category[category_name] += row["total"]
+
+            yield "Consolidado por banco:"
+            for bank_name in sorted(by_bank.keys()):
+                yield f"- {bank_name}: {_format_currency_br(by_bank[bank_name])}"
+            yield "Consolidado por categoria:"
+            for category_name in sorted(by_category.keys()):
+                yield f"- {category_name}: {_format_currency_br(by_category[category_name])}"
+            yield "Consolidado por status:"
+            for status_name in sorted(by_status.keys()):
+                yield f"- {status_name}: {_format_currency_br(by_status[status_name])}"
 
     scope = selected_bank.name if selected_bank else "Todos os bancos"
     title = (
         f"Relatorio de contas a pagar - {scope} - "
         f"{_format_report_period_label(start_date, end_date)}"
     )
-    return title, headers, rows, summary
+    return title, headers, rows, _iter_summary()
 
 
 def _build_cashflow_report_dataset(user, selected_bank, start_date, end_date, detail_level):
@@ -463,60 +808,70 @@ def _build_cashflow_report_dataset(user, selected_bank, start_date, end_date, de
         "Valor",
         "Descricao",
     ]
-    detailed_rows = []
-    total_income = Decimal("0.00")
-    total_expense = Decimal("0.00")
-    by_bank = defaultdict(lambda: Decimal("0.00"))
-    by_type = defaultdict(lambda: Decimal("0.00"))
-
-    for tx in queryset:
-        bank_name = tx.bank.name if tx.bank else "Sem banco"
-        type_name = tx.get_transaction_type_display()
-        detailed_rows.append(
-            [
+    def _iter_detailed_rows():
+        for tx in queryset.iterator(chunk_size=REPORT_ITERATOR_CHUNK_SIZE):
+            yield [
                 _format_date_br(tx.transaction_date),
                 tx.title,
-                type_name,
-                bank_name,
+                tx.get_transaction_type_display(),
+                tx.bank.name if tx.bank else "Sem banco",
                 _format_currency_br(tx.amount),
                 tx.description or "-",
             ]
-        )
-        by_bank[bank_name] += tx.amount if tx.transaction_type == Transaction.TransactionType.INCOME else -tx.amount
-        by_type[type_name] += tx.amount
-        if tx.transaction_type == Transaction.TransactionType.INCOME:
-            total_income += tx.amount
-        else:
-            total_expense += tx.amount
 
-    rows = detailed_rows if detail_level in {"detailed", "both"} else []
+    rows = _iter_detailed_rows() if detail_level in {"detailed", "both"} else iter(())
     detail_label_map = {
         "consolidated": "Consolidado",
         "detailed": "Detalhado",
         "both": "Consolidado + detalhado",
     }
-    summary = [
-        f"Visao: {detail_label_map.get(detail_level, 'Consolidado + detalhado')}",
-        f"Periodo: {_format_report_period_label(start_date, end_date)}",
-        f"Total de transacoes: {len(detailed_rows)}",
-        f"Entradas: {_format_currency_br(total_income)}",
-        f"Saidas: {_format_currency_br(total_expense)}",
-        f"Saldo: {_format_currency_br(total_income - total_expense)}",
-    ]
-    if detail_level in {"consolidated", "both"}:
-        summary.append("Consolidado por banco (saldo):")
-        for bank_name in sorted(by_bank.keys()):
-            summary.append(f"- {bank_name}: {_format_currency_br(by_bank[bank_name])}")
-        summary.append("Consolidado por tipo:")
-        for type_name in sorted(by_type.keys()):
-            summary.append(f"- {type_name}: {_format_currency_br(by_type[type_name])}")
+
+    def _iter_summary():
+        aggregate_qs = queryset.order_by()
+        by_type_value = {
+            row["transaction_type"]: row
+            for row in aggregate_qs.values("transaction_type").annotate(total=Sum("amount"), count=Count("id"))
+        }
+        income_row = by_type_value.get(Transaction.TransactionType.INCOME, {})
+        expense_row = by_type_value.get(Transaction.TransactionType.EXPENSE, {})
+        total_income = income_row.get("total") or Decimal("0.00")
+        total_expense = expense_row.get("total") or Decimal("0.00")
+        total_count = sum(row["count"] for row in by_type_value.values())
+
+        yield f"Visao: {detail_label_map.get(detail_level, 'Consolidado + detalhado')}"
+        yield f"Periodo: {_format_report_period_label(start_date, end_date)}"
+        yield f"Total de transacoes: {total_count}"
+        yield f"Entradas: {_format_currency_br(total_income)}"
+        yield f"Saidas: {_format_currency_br(total_expense)}"
+        yield f"Saldo: {_format_currency_br(total_income - total_expense)}"
+        if detail_level in {"consolidated", "both"}:
+            signed_amount = Case(
+                When(transaction_type=Transaction.TransactionType.INCOME, then=F("amount")),
+                default=F("amount") * -1,
+                output_field=DecimalField(max_digits=14, decimal_places=2),
+            )
+            by_bank = defaultdict(lambda: Decimal("0.00"))
+            for row in aggregate_qs.values("bank__name").annotate(balance=Sum(signed_amount)):
+                by_bank[row["bank__name"] or "Sem banco"] += row["balance"]
+            type_labels = dict(Transaction.TransactionType.choices)
+            by_type = {
+                type_labels.get(type_value, type_value): row["total"]
+                for type_value, row in by_type_value.items()
+            }
+
+            yield "Consolidado por banco (saldo):"
+            for bank_name in sorted(by_bank.keys()):
+                yield f"- {bank_name}: {_format_currency_br(by_bank[bank_name])}"
+            yield "Consolidado por tipo:"
+            for type_name in sorted(by_type.keys()):
+                yield f"- {type_name}: {_format_currency_br(by_type[type_name])}"
 
     scope = selected_bank.name if selected_bank else "Todos os bancos"
     title = (
         f"Relatorio de entradas e saidas - {scope} - "
         f"{_format_report_period_label(start_date, end_date)}"
     )
-    return title, headers, rows, summary
+    return title, headers, rows, _iter_summary()
 
 
 def _build_report_dataset(report_type, user, selected_bank, start_date, end_date, detail_level):
@@ -525,45 +880,37 @@ def _build_report_dataset(report_type, user, selected_bank, start_date, end_date
     return _build_cashflow_report_dataset(user, selected_bank, start_date, end_date, detail_level)
 
 
-def _build_csv_content(title, headers, rows, summary):
-    output = StringIO()
-    writer = csv.writer(output, delimiter=";")
-    writer.writerow([title])
-    writer.writerow([f"Gerado em: {_format_date_br(timezone.localdate())}"])
-    writer.writerow([])
-    writer.writerow(headers)
-    writer.writerows(rows)
-    if summary:
-        writer.writerow([])
-        for line in summary:
-            writer.writerow([line])
-    return "\ufeff" + output.getvalue()
+def _iter_report_content(report_format, title, headers, rows, summary):
+    if report_format == "csv":
+        return _iter_csv_content(title, headers, rows, summary)
+    if report_format == "excel":
+        return _iter_excel_content(title, headers, rows, summary)
+    return _iter_pdf_content(title, headers, rows, summary)
 
 
-def _build_excel_content(title, headers, rows, summary):
-    def _cell(value, style_id="cell"):
-        return (
-            f'<Cell ss:StyleID="{style_id}"><Data ss:Type="String">'
-            f"{escape(str(value))}"
-            "</Data></Cell>"
-        )
+class _CsvEchoBuffer:
+    def write(self, value):
+        return value
 
-    xml_rows = []
-    xml_rows.append(f"<Row>{_cell(title, 'title')}</Row>")
-    xml_rows.append(f"<Row>{_cell(f'Gerado em: {_format_date_br(timezone.localdate())}', 'meta')}</Row>")
-    xml_rows.append("<Row></Row>")
-    xml_rows.append("<Row>" + "".join(_cell(header, "header") for header in headers) + "</Row>")
 
+def _iter_csv_content(title, headers, rows, summary):
+    writer = csv.writer(_CsvEchoBuffer(), delimiter=";")
+    yield "\ufeff"
+    yield writer.writerow([title])
+    yield writer.writerow([f"Gerado em: {_format_date_br(timezone.localdate())}"])
+    yield writer.writerow([])
+    yield writer.writerow(headers)
     for row in rows:
-        xml_rows.append("<Row>" + "".join(_cell(value) for value in row) + "</Row>")
+        yield writer.writerow(row)
+    summary_started = False
+    for line in summary:
+        if not summary_started:
+            yield writer.writerow([])
+            summary_started = True
+        yield writer.writerow([line])
 
-    if summary:
-        xml_rows.append("<Row></Row>")
-        for line in summary:
-            xml_rows.append(f"<Row>{_cell(line, 'meta')}</Row>")
 
-    worksheet_xml = "\n".join(xml_rows)
-    return f"""<?xml version="1.0"?>
+EXCEL_DOCUMENT_HEADER = """<?xml version="1.0"?>
 <Workbook xmlns="urn:schemas-microsoft-com:office:spreadsheet"
  xmlns:o="urn:schemas-microsoft-com:office:office"
  xmlns:x="urn:schemas-microsoft-com:office:excel"
@@ -576,13 +923,46 @@ def _build_excel_content(title, headers, rows, summary):
  </Styles>
  <Worksheet ss:Name="Relatorio">
   <Table>
-{worksheet_xml}
+"""
+EXCEL_DOCUMENT_FOOTER = """
   </Table>
  </Worksheet>
 </Workbook>
 """
 
 
+def _excel_cell(value, style_id="cell"):
+    return (
+        f'<Cell ss:StyleID="{style_id}"><Data ss:Type="String">'
+        f"{escape(str(value))}"
+        "</Data></Cell>"
+    )
+
+
+def _iter_excel_content(title, headers, rows, summary):
+    # Cada linha sai como um pedaco separado; so o cabecalho/rodape sao fixos.
+    yield EXCEL_DOCUMENT_HEADER
+    yield f"<Row>{_excel_cell(title, 'title')}</Row>\n"
+    yield f"<Row>{_excel_cell(f'Gerado em: {_format_date_br(timezone.localdate())}', 'meta')}</Row>\n"
+    yield "<Row></Row>\n"
+    yield "<Row>" + "".join(_excel_cell(header, "header") for header in headers) + "</Row>"
+
+    for row in rows:
+        yield "\n<Row>" + "".join(_excel_cell(value) for value in row) + "</Row>"
+
+    summary_started = False
+    for line in summary:
+        if not summary_started:
+            yield "\n<Row></Row>"
+            summary_started = True
+        yield f"\n<Row>{_excel_cell(line, 'meta')}</Row>"
+    yield EXCEL_DOCUMENT_FOOTER
+
+
+def _build_excel_content(title, headers, rows, summary):
+    return "".join(_iter_excel_content(title, headers, rows, summary))
+
+
 def _normalize_ascii(value):
     return unicodedata.normalize("NFKD", str(value or "")).encode("ascii", "ignore").decode("ascii")
 
@@ -591,95 +971,113 @@ def _escape_pdf_text(value):
     return value.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
 
 
-def _build_pdf_content(title, headers, rows, summary):
-    lines = [
-        f"Gerado em: {_format_date_br(timezone.localdate())}",
-        "",
-        " | ".join(_normalize_ascii(header) for header in headers),
-        "-" * 120,
-    ]
+def _iter_pdf_lines(headers, rows, summary):
+    yield f"Gerado em: {_format_date_br(timezone.localdate())}"
+    yield ""
+    yield " | ".join(_normalize_ascii(header) for header in headers)
+    yield "-" * 120
     for row in rows:
         line = " | ".join(_normalize_ascii(col) for col in row)
         if len(line) > 120:
             line = f"{line[:117]}..."
-        lines.append(line)
-
-    if summary:
-        lines.extend(["", "Resumo:"])
-        lines.extend(_normalize_ascii(item) for item in summary)
-
-    lines_per_page = 46
-    paged_lines = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
-
-    objects = {}
-    next_id = 1
-
-    def new_object(content):
-        nonlocal next_id
-        object_id = next_id
-        objects[object_id] = content
-        next_id += 1
-        return object_id
-
-    font_id = new_object("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
-    content_ids = []
+        yield line
+
+    summary_started = False
+    for item in summary:
+        if not summary_started:
+            yield ""
+            yield "Resumo:"
+            summary_started = True
+        yield _normalize_ascii(item)
+
+
+def _iter_pdf_pages(lines):
+    page_lines = []
+    has_pages = False
+    for line in lines:
+        page_lines.append(line)
+        if len(page_lines) == REPORT_PDF_LINES_PER_PAGE:
+            yield page_lines
+            page_lines = []
+            has_pages = True
+    if page_lines or not has_pages:
+        yield page_lines
+
+
+def _iter_pdf_content(title, headers, rows, summary, compress=None):
+    if compress is None:
+        compress = REPORT_PDF_COMPRESS_STREAMS
+
+    # Objetos 1-3 ficam reservados: fonte, arvore de paginas e catalogo.
+    # As paginas sao escritas conforme as linhas chegam e so os offsets ficam em memoria.
+    font_id, pages_id, catalog_id = 1, 2, 3
+    object_offsets = {}
     page_ids = []
-    normalized_title = _normalize_ascii(title)
-
-    for page_lines in paged_lines:
+    position = 0
+    normalized_title = _escape_pdf_text(_normalize_ascii(title))
+
+    def write_object(object_id, body):
+        nonlocal position
+        object_offsets[object_id] = position
+        chunk = f"{object_id} 0 obj\n".encode("ascii") + body + b"\nendobj\n"
+        position += len(chunk)
+        return chunk
+
+    header = b"%PDF-1.4\n"
+    position += len(header)
+    yield header
+    yield write_object(font_id, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    next_id = catalog_id + 1
+    for page_lines in _iter_pdf_pages(_iter_pdf_lines(headers, rows, summary)):
         stream_lines = [
             "BT",
             "/F1 10 Tf",
             "40 805 Td",
-            f"({_escape_pdf_text(normalized_title)}) Tj",
+            f"({normalized_title}) Tj",
             "0 -18 Td",
         ]
         for line in page_lines:
             stream_lines.append(f"({_escape_pdf_text(line)}) Tj")
             stream_lines.append("0 -14 Td")
         stream_lines.append("ET")
-        stream = "\n".join(stream_lines)
-        stream_bytes = stream.encode("latin-1", "ignore")
-        content_id = new_object(f"<< /Length {len(stream_bytes)} >>\nstream\n{stream}\nendstream")
-        page_id = new_object("")
-        content_ids.append(content_id)
+        stream_bytes = "\n".join(stream_lines).encode("latin-1", "ignore")
+        if compress:
+            stream_bytes = zlib.compress(stream_bytes)
+            stream_dict = f"<< /Length {len(stream_bytes)} /Filter /FlateDecode >>"
+        else:
+            stream_dict = f"<< /Length {len(stream_bytes)} >>"
+
+        content_id, page_id = next_id, next_id + 1
+        next_id += 2
         page_ids.append(page_id)
+        yield write_object(content_id, stream_dict.encode("ascii") + b"\nstream\n" + stream_bytes + b"\nendstream")
+        yield write_object(
+            page_id,
+            (
+                f"<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 595 842] "
+                f"/Resources << /Font << /F1 {font_id} 0 R >> >> "
+                f"/Contents {content_id} 0 R >>"
+            ).encode("ascii"),
+        )
 
-    pages_id = new_object("")
-    catalog_id = new_object(f"<< /Type /Catalog /Pages {pages_id} 0 R >>")
     kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
-    objects[pages_id] = f"<< /Type /Pages /Count {len(page_ids)} /Kids [{kids}] >>"
-
-    for index, page_id in enumerate(page_ids):
-        objects[page_id] = (
-            f"<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 595 842] "
-            f"/Resources << /Font << /F1 {font_id} 0 R >> >> "
-            f"/Contents {content_ids[index]} 0 R >>"
-        )
+    yield write_object(pages_id, f"<< /Type /Pages /Count {len(page_ids)} /Kids [{kids}] >>".encode("ascii"))
+    yield write_object(catalog_id, f"<< /Type /Catalog /Pages {pages_id} 0 R >>".encode("ascii"))
 
-    pdf_output = BytesIO()
-    pdf_output.write(b"%PDF-1.4\n")
-    object_offsets = {}
     max_object_id = next_id - 1
-
-    for object_id in range(1, max_object_id + 1):
-        object_offsets[object_id] = pdf_output.tell()
-        pdf_output.write(f"{object_id} 0 obj\n".encode("ascii"))
-        pdf_output.write(objects[object_id].encode("latin-1", "ignore"))
-        pdf_output.write(b"\nendobj\n")
-
-    xref_position = pdf_output.tell()
-    pdf_output.write(f"xref\n0 {max_object_id + 1}\n".encode("ascii"))
-    pdf_output.write(b"0000000000 65535 f \n")
+    xref_lines = [f"xref\n0 {max_object_id + 1}\n", "0000000000 65535 f \n"]
     for object_id in range(1, max_object_id + 1):
-        pdf_output.write(f"{object_offsets[object_id]:010d} 00000 n \n".encode("ascii"))
-    pdf_output.write(
-        (
-            f"trailer\n<< /Size {max_object_id + 1} /Root {catalog_id} 0 R >>\n"
-            f"startxref\n{xref_position}\n%%EOF"
-        ).encode("ascii")
+        xref_lines.append(f"{object_offsets[object_id]:010d} 00000 n \n")
+    xref_lines.append(
+        f"trailer\n<< /Size {max_object_id + 1} /Root {catalog_id} 0 R >>\n"
+        f"startxref\n{position}\n%%EOF"
     )
-    return pdf_output.getvalue()
+    yield "".join(xref_lines).encode("ascii")
+
+
+def _build_pdf_content(title, headers, rows, summary, compress=None):
+    return b"".join(_iter_pdf_content(title, headers, rows, summary, compress=compress))
 
 
 def _add_months(base_date, month_offset):
@@ -690,6 +1088,134 @@ def _add_months(base_date, month_offset):
     return base_date.replace(year=target_year, month=target_month, day=target_day)
 
 
+def _get_recurrence_date(base_date, period, step, day):
+    if period == Payable.RecurrencePeriod.WEEKLY:
+        return base_date + timedelta(weeks=step)
+    month_offset = 12 * step if period == Payable.RecurrencePeriod.YEARLY else step
+    # Parte do primeiro dia do mes para aplicar o dia da serie: 31 nao escorrega para 28 depois de fevereiro.
+    target_date = _add_months(base_date.replace(day=1), month_offset)
+    return target_date.replace(day=min(day, monthrange(target_date.year, target_date.month)[1]))
+
+
+def materialize_recurring_payables(today=None, horizon_days=RECURRENCE_HORIZON_DAYS):
+    today = today or timezone.localdate()
+    horizon = today + timedelta(days=horizon_days)
+
+    # Uma consulta agregada cobre todos os usuarios; o HAVING descarta as series ja geradas ate o horizonte.
+    # So entram series com grupo explicito: recorrentes antigas sem grupo ganham um ao serem salvas.
+    due_series = list(
+        Payable.objects.filter(
+            payable_type=Payable.PayableType.SUBSCRIPTION,
+            recurrence_group__isnull=False,
+            recurrence_sequence__isnull=False,
+        )
+        .order_by()
+        .values("recurrence_group")
+        .annotate(anchor_date=Min("due_date"), latest_due_date=Max("due_date"), latest_sequence=Max("recurrence_sequence"))
+        .filter(latest_due_date__lt=horizon)
+    )
+
+    occurrences = []
+    for offset in range(0, len(due_series), RECURRENCE_SERIES_CHUNK_SIZE):
+        chunk = due_series[offset:offset + RECURRENCE_SERIES_CHUNK_SIZE]
+        latest_filter = Q()
+        for series in chunk:
+            latest_filter |= Q(recurrence_group=series["recurrence_group"], recurrence_sequence=series["latest_sequence"])
+        latest_by_group = {}
+        latest_rows = (
+            Payable.objects.select_related("bank", "category")
+            .filter(latest_filter, payable_type=Payable.PayableType.SUBSCRIPTION)
+            .order_by("recurrence_group", "-id")
+        )
+        for payable in latest_rows:
+            latest_by_group.setdefault(payable.recurrence_group, payable)
+
+        for series in chunk:
+            template = latest_by_group.get(series["recurrence_group"])
+            # A ultima ocorrencia sem recorrencia encerra a serie.
+            if template is None or not template.is_recurring or not template.owner_id:
+                continue
+            # Continua da ultima ocorrencia gerada; a sequencia conta periodos, inclusive os que ja passaram.
+            step = 0
+            while True:
+                step += 1
+                due_date = _get_recurrence_date(
+                    template.due_date, template.recurrence_period, step, series["anchor_date"].day
+                )
+                if due_date > horizon:
+                    break
+                if due_date < today:
+                    continue
+                sequence = template.recurrence_sequence + step
+                occurrence = Payable(
+                    owner_id=template.owner_id,
+                    bank=template.bank,
+                    category=template.category,
+                    title=template.title,
+                    description=template.description,
+                    payable_type=Payable.PayableType.SUBSCRIPTION,
+                    status=Payable.PayableStatus.PENDING,
+                    amount=template.amount,
+                    due_date=due_date,
+                    is_recurring=True,
+                    recurrence_period=template.recurrence_period,
+                    recurrence_group=template.recurrence_group,
+                    recurrence_sequence=sequence,
+                    recurrence_key=f"{template.recurrence_group}:{sequence}",
+                )
+                occurrence.refresh_search_text()
+                occurrences.append(occurrence)
+
+    if not occurrences:
+        return 0
+    with db_transaction.atomic():
+        existing_keys = _get_existing_recurrence_keys(occurrences)
+        occurrences = [
+            occurrence
+            for occurrence in occurrences
+            if (occurrence.owner_id, occurrence.recurrence_key) not in existing_keys
+        ]
+        if not occurrences:
+            return 0
+        # ignore_conflicts + recurrence_key: duas execucoes simultaneas nao duplicam ocorrencias.
+        Payable.objects.bulk_create(
+            occurrences,
+            batch_size=RECURRENCE_INSERT_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        # O bulk_create com ignore_conflicts nao diz quais linhas entraram: relendo as chaves,
+        # conta so o que foi inserido e avisa so os donos que ganharam ocorrencias.
+        inserted_keys = _get_existing_recurrence_keys(occurrences)
+        inserted = [
+            occurrence for occurrence in occurrences if (occurrence.owner_id, occurrence.recurrence_key) in inserted_keys
+        ]
+        UserDataVersion.objects.bump_many(occurrence.owner_id for occurrence in inserted)
+    return len(inserted)
+
+
+def _get_existing_recurrence_keys(occurrences):
+    keys = [occurrence.recurrence_key for occurrence in occurrences]
+    existing_keys = set()
+    for offset in range(0, len(keys), RECURRENCE_INSERT_BATCH_SIZE):
+        existing_keys.update(
+            Payable.objects.filter(recurrence_key__in=keys[offset:offset + RECURRENCE_INSERT_BATCH_SIZE])
+            .order_by()
+            .values_list("owner_id", "recurrence_key")
+        )
+    return existing_keys
+
+
+def _split_installment_amounts(total_amount, installment_total):
+    # Divide valor total pelo numero de parcelas e distribui centavos restantes.
+    unit_amount = (total_amount / installment_total).quantize(Decimal("0.01"), rounding=ROUND_DOWN)
+    distributed_total = unit_amount * installment_total
+    remainder_cents = int(((total_amount - distributed_total) * 100).quantize(Decimal("1")))
+    return [
+        unit_amount + (Decimal("0.01") if installment_number <= remainder_cents else Decimal("0.00"))
+        for installment_number in range(1, installment_total + 1)
+    ]
+
+
 def _create_installment_plan(cleaned_data, owner):
     installment_total = cleaned_data["installment_total"]
     current_installment = cleaned_data["installment_number"]
@@ -700,15 +1226,12 @@ def _create_installment_plan(cleaned_data, owner):
     total_amount = cleaned_data["amount"]
     group_id = uuid4()
 
-    # Divide valor total pelo numero de parcelas e distribui centavos restantes.
-    unit_amount = (total_amount / installment_total).quantize(Decimal("0.01"), rounding=ROUND_DOWN)
-    distributed_total = unit_amount * installment_total
-    remainder_cents = int(((total_amount - distributed_total) * 100).quantize(Decimal("1")))
-
     installment_records = []
-    for installment_number in range(1, installment_total + 1):
+    for installment_number, installment_amount in enumerate(
+        _split_installment_amounts(total_amount, installment_total),
+        start=1,
+    ):
         month_offset = installment_number - current_installment
-        installment_amount = unit_amount + (Decimal("0.01") if installment_number <= remainder_cents else Decimal("0.00"))
         installment_records.append(
             Payable(
                 owner=owner,
@@ -738,8 +1261,12 @@ def _create_installment_plan(cleaned_data, owner):
             )
         )
 
+    # bulk_create nao passa pelo save(), que e quem monta o search_text.
+    for record in installment_records:
+        record.refresh_search_text()
     with db_transaction.atomic():
         Payable.objects.bulk_create(installment_records)
+    UserDataVersion.objects.bump(owner.id)
 
     return (
         Payable.objects.select_related("bank", "category")
@@ -753,9 +1280,10 @@ def _build_installment_plan_start_date(payable):
     return _add_months(payable.due_date, -(installment_number - 1))
 
 
-def _normalize_legacy_installments(owner):
+def normalize_legacy_installments(owner):
     legacy_installments = list(
-        Payable.objects.filter(
+        Payable.objects.select_related("bank", "category")
+        .filter(
             owner=owner,
             payable_type=Payable.PayableType.INSTALLMENT,
             installment_total__gt=1,
@@ -778,6 +1306,7 @@ def _normalize_legacy_installments(owner):
             )
         ].append(payable)
 
+    current_timestamp = timezone.now()
     with db_transaction.atomic():
         for grouped_payables in grouped_legacy_installments.values():
             installment_total = grouped_payables[0].installment_total
@@ -790,10 +1319,14 @@ def _normalize_legacy_installments(owner):
                 payable.installment_group = group_id
                 if not payable.installment_number:
                     payable.installment_number = 1
+                payable.updated_at = current_timestamp
                 existing_installment_numbers.add(payable.installment_number)
                 updated_payables.append(payable)
 
-            Payable.objects.bulk_update(updated_payables, ["installment_group", "installment_number"])
+            Payable.objects.bulk_update(
+                updated_payables,
+                ["installment_group", "installment_number", "updated_at"],
+            )
 
             missing_installments = []
             for installment_number in range(1, installment_total + 1):
@@ -820,128 +1353,1535 @@ def _normalize_legacy_installments(owner):
                 )
 
             if missing_installments:
+                for missing_installment in missing_installments:
+                    missing_installment.refresh_search_text()
                 Payable.objects.bulk_create(missing_installments)
+    UserDataVersion.objects.bump(owner.id)
 
 
-@login_required
-def dashboard_home(request):
-    _bootstrap_banks(request.user)
-    _normalize_legacy_installments(request.user)
-    banks = list(Bank.objects.filter(owner=request.user).values("id", "name", "slug", "color", "icon"))
-    categories = list(
-        PayableCategory.objects.filter(owner=request.user).values("id", "name", "slug", "color")
-    )
-    transactions = Transaction.objects.select_related("bank").filter(owner=request.user)
-    payables = Payable.objects.select_related("bank", "category").filter(owner=request.user)
-    events = Event.objects.filter(owner=request.user)
-    dashboard_data = {
-        "banks": banks,
-        "categories": categories,
-        "transactions": [_serialize_transaction(tx) for tx in transactions],
-        "payables": [_serialize_payable(payable, request=request) for payable in payables],
-        "events": [_serialize_event(event) for event in events],
-        "today": timezone.localdate().isoformat(),
-        "dashboard_widget_order": _get_user_dashboard_widget_order(request.user),
-    }
-    return render(
-        request,
-        "dashboard/index.html",
-        {"dashboard_data": dashboard_data, "banks": banks, "categories": categories},
-    )
+def _normalize_search_text(value):
+    return _normalize_ascii(value).lower()
 
 
-@login_required
-@require_POST
-def dashboard_layout_save(request):
-    try:
-        payload = json.loads(request.body.decode("utf-8"))
-    except (json.JSONDecodeError, UnicodeDecodeError):
-        return JsonResponse(
-            {"ok": False, "errors": {"layout": ["Payload invalido."]}},
-            status=400,
-        )
+def _search_query_tokens(query):
+    return [token for token in _normalize_search_text(query).split() if token]
 
-    normalized_order = _normalize_dashboard_widget_order(payload.get("order", []))
-    layout, _created = UserDashboardLayout.objects.get_or_create(user=request.user)
-    layout.widget_order = normalized_order
-    layout.save(update_fields=["widget_order", "updated_at"])
-    return JsonResponse({"ok": True, "order": normalized_order})
 
+def _get_period_date_range(period, today):
+    if period == "today":
+        return today, today
+    if period == "last7":
+        return today - timedelta(days=6), today
+    if period == "last30":
+        return today - timedelta(days=29), today
+    if period == "this_month":
+        return today.replace(day=1), today.replace(day=monthrange(today.year, today.month)[1])
+    if period == "next7":
+        return today, today + timedelta(days=7)
+    if period == "overdue":
+        return None, today - timedelta(days=1)
+    return None, None
 
-@login_required
-def event_list(request):
-    events = Event.objects.filter(owner=request.user).order_by("starts_at", "id")
-    return JsonResponse({"ok": True, "events": [_serialize_event(event) for event in events]})
 
+def _parse_search_token_date(token):
+    parsed_date = parse_date(token) if "-" in token else None
+    if parsed_date:
+        return parsed_date
+    parts = token.split("/")
+    if len(parts) == 3 and all(part.isdigit() for part in parts):
+        try:
+            return datetime(int(parts[2]), int(parts[1]), int(parts[0])).date()
+        except ValueError:
+            return None
+    return None
 
-@login_required
-@require_POST
-def event_create(request):
-    form = EventForm(request.POST, user=request.user)
-    if not form.is_valid():
-        return JsonResponse({"ok": False, "errors": _serialize_form_errors(form)}, status=400)
 
-    event = form.save(commit=False)
-    event.owner = request.user
-    if not event.creator_name:
-        event.creator_name = request.user.username
-    event.save()
-    return JsonResponse({"ok": True, "event": _serialize_event(event)})
+def _parse_search_token_amount(token):
+    normalized = token.replace("r$", "")
+    if "," in normalized:
+        normalized = normalized.replace(".", "").replace(",", ".")
+    if not normalized or not normalized.replace(".", "", 1).isdigit():
+        return None
+    try:
+        return Decimal(normalized).quantize(Decimal("0.01"))
+    except InvalidOperation:
+        return None
 
 
-@login_required
-@require_POST
-def event_update(request, event_id):
-    event = get_object_or_404(Event, pk=event_id, owner=request.user)
-    form = EventForm(request.POST, instance=event, user=request.user)
-    if not form.is_valid():
-        return JsonResponse({"ok": False, "errors": _serialize_form_errors(form)}, status=400)
+def _search_token_month_numbers(token):
+    # "ma" casa mar e mai, como o includes() do matchSmartQuery.
+    return [index + 1 for index, label in enumerate(MONTH_SEARCH_LABELS) if token in label]
 
-    updated_event = form.save(commit=False)
-    updated_event.owner = request.user
-    if not updated_event.creator_name:
-        updated_event.creator_name = request.user.username
-    updated_event.save()
-    return JsonResponse({"ok": True, "event": _serialize_event(updated_event)})
 
+def _search_token_date_filter(field, token):
+    # O blob do matchSmartQuery traz a data como dd/mm/aaaa e aaaa-mm-dd, entao "03/2", "2026-0"
+    # ou "202" casam por trecho de qualquer uma das duas formas.
+    if not set(token) <= set("0123456789-/") or ("-" in token and "/" in token):
+        return None
+    iso_text = Cast(field, CharField())
+    if "/" not in token:
+        return Q(Contains(iso_text, token))
+    br_text = Concat(
+        Substr(iso_text, 9, 2),
+        Value("/"),
+        Substr(iso_text, 6, 2),
+        Value("/"),
+        Substr(iso_text, 1, 4),
+        output_field=CharField(),
+    )
+    return Q(Contains(br_text, token))
+
+
+def _build_transaction_search_filter(query):
+    # Equivalente server-side do matchSmartQuery do dashboard.js: todo token precisa casar em algum campo.
+    search_filter = Q()
+    for token in _search_query_tokens(query):
+        # search_text ja vem sem acento e em minusculas, como os tokens.
+        token_filter = Q(search_text__contains=token)
+        for transaction_type, aliases in TRANSACTION_TYPE_SEARCH_ALIASES.items():
+            if token in aliases:
+                token_filter |= Q(transaction_type=transaction_type)
+        month_numbers = _search_token_month_numbers(token)
+        if month_numbers:
+            token_filter |= Q(transaction_date__month__in=month_numbers)
+        date_filter = _search_token_date_filter("transaction_date", token)
+        if date_filter is not None:
+            token_filter |= date_filter
+        token_date = _parse_search_token_date(token)
+        if token_date:
+            token_filter |= Q(transaction_date=token_date)
+        token_amount = _parse_search_token_amount(token)
+        if token_amount is not None:
+            token_filter |= Q(amount=token_amount)
+        search_filter &= token_filter
+    return search_filter
+
+
+def _parse_transaction_filters(user, params):
+    bank_param = params.get("bank", "all") or "all"
+    transaction_type = params.get("type", "all") or "all"
+    period = params.get("period", "all") or "all"
+
+    if bank_param != "all":
+        try:
+            bank_id = int(bank_param)
+        except (TypeError, ValueError) as exc:
+            raise ValueError("bank", "Banco invalido.") from exc
+        if not Bank.objects.filter(id=bank_id, owner=user).exists():
+            raise ValueError("bank", "Banco nao encontrado.")
+    if transaction_type != "all" and transaction_type not in Transaction.TransactionType.values:
+        raise ValueError("type", "Tipo de transacao invalido.")
+    if period not in TRANSACTION_PERIOD_FILTERS:
+        raise ValueError("period", "Periodo invalido.")
 
-@login_required
-@require_POST
-def event_delete(request, event_id):
-    event = get_object_or_404(Event, pk=event_id, owner=request.user)
-    deleted_id = event.id
-    event.delete()
-    return JsonResponse({"ok": True, "deleted_id": deleted_id})
+    return {
+        "bank": bank_param,
+        "type": transaction_type,
+        "period": period,
+        "q": (params.get("q") or "").strip(),
+    }
 
 
-@login_required
-@require_POST
-def transaction_create(request):
-    form = TransactionForm(request.POST, user=request.user)
-    if not form.is_valid():
-        return JsonResponse({"ok": False, "errors": _serialize_form_errors(form)}, status=400)
+def _filter_transactions(queryset, filters, today):
+    if filters["bank"] != "all":
+        queryset = queryset.filter(bank_id=int(filters["bank"]))
+    if filters["type"] != "all":
+        queryset = queryset.filter(transaction_type=filters["type"])
+    start_date, end_date = _get_period_date_range(filters["period"], today)
+    if start_date:
+        queryset = queryset.filter(transaction_date__gte=start_date)
+    if end_date:
+        queryset = queryset.filter(transaction_date__lte=end_date)
+    if filters["q"]:
+        queryset = queryset.filter(_build_transaction_search_filter(filters["q"]))
+    return queryset
 
-    transaction = form.save(commit=False)
-    transaction.owner = request.user
-    transaction.save()
-    return JsonResponse({"ok": True, "transaction": _serialize_transaction(transaction)})
 
+def _encode_date_id_cursor(date_value, object_id):
+    return f"{date_value.isoformat()}_{object_id}"
 
-@login_required
-@require_POST
-def transaction_update(request, transaction_id):
-    transaction = get_object_or_404(Transaction, pk=transaction_id, owner=request.user)
-    form = TransactionForm(request.POST, instance=transaction, user=request.user)
-    if not form.is_valid():
-        return JsonResponse({"ok": False, "errors": _serialize_form_errors(form)}, status=400)
 
-    updated_transaction = form.save(commit=False)
-    updated_transaction.owner = request.user
-    updated_transaction.save()
-    return JsonResponse({"ok": True, "transaction": _serialize_transaction(updated_transaction)})
+def _parse_page_limit(raw_limit, default_limit, max_limit):
+    if not raw_limit:
+        return default_limit
+    try:
+        limit = int(raw_limit)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("limit", "Limite invalido.") from exc
+    return max(1, min(limit, max_limit))
 
 
-@login_required
+def _decode_date_id_cursor(raw_cursor):
+    if not raw_cursor:
+        return None
+    raw_date, _separator, raw_id = raw_cursor.partition("_")
+    cursor_date = parse_date(raw_date) if raw_date else None
+    if not cursor_date or not raw_id.isdigit():
+        raise ValueError("cursor", "Cursor invalido.")
+    return cursor_date, int(raw_id)
+
+
+def _paginate_transactions(queryset, cursor=None, limit=TRANSACTION_PAGE_SIZE):
+    queryset = queryset.order_by("-transaction_date", "-id")
+    if cursor:
+        cursor_date, cursor_id = cursor
+        queryset = queryset.filter(
+            Q(transaction_date__lt=cursor_date) | Q(transaction_date=cursor_date, id__lt=cursor_id)
+        )
+    rows = list(queryset[: limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = _encode_date_id_cursor(rows[-1].transaction_date, rows[-1].id) if has_more and rows else None
+    return rows, next_cursor
+
+
+def _build_transaction_chart_months(today):
+    months = []
+    for offset in range(TRANSACTION_CHART_MONTHS - 1, -1, -1):
+        months.append(_add_months(today.replace(day=1), -offset))
+    return months
+
+
+def _build_transaction_aggregates(queryset, today):
+    queryset = queryset.order_by()
+    totals = queryset.aggregate(
+        income=Sum("amount", filter=Q(transaction_type=Transaction.TransactionType.INCOME)),
+        expense=Sum("amount", filter=Q(transaction_type=Transaction.TransactionType.EXPENSE)),
+        count=Count("id"),
+    )
+    income = totals["income"] or Decimal("0.00")
+    expense = totals["expense"] or Decimal("0.00")
+
+    chart_months = _build_transaction_chart_months(today)
+    monthly_totals = {
+        item["month"]: item
+        for item in (
+            queryset.filter(transaction_date__gte=chart_months[0])
+            .annotate(month=TruncMonth("transaction_date"))
+            .values("month")
+            .annotate(
+                income=Sum("amount", filter=Q(transaction_type=Transaction.TransactionType.INCOME)),
+                expense=Sum("amount", filter=Q(transaction_type=Transaction.TransactionType.EXPENSE)),
+            )
+        )
+    }
+    chart = []
+    for month in chart_months:
+        month_totals = monthly_totals.get(month, {})
+        chart.append(
+            {
+                "month": month.strftime("%Y-%m"),
+                "income": float(month_totals.get("income") or 0),
+                "expense": float(month_totals.get("expense") or 0),
+            }
+        )
+
+    return {
+        "income": float(income),
+        "expense": float(expense),
+        "balance": float(income - expense),
+        "count": totals["count"],
+        "chart": chart,
+    }
+
+
+def _can_use_transaction_rollup(filters):
+    return not filters["q"] and filters["period"] in {"all", "this_month"}
+
+
+def _build_transaction_rollup_summary(user, filters, today):
+    # Cards e grafico saem da tabela MonthlyBankBalance: custo O(meses), nao O(transacoes).
+    rollups = MonthlyBankBalance.objects.filter(owner=user)
+    if filters["bank"] != "all":
+        rollups = rollups.filter(bank_id=int(filters["bank"]))
+    if filters["period"] == "this_month":
+        rollups = rollups.filter(month=today.replace(day=1))
+
+    include_income = filters["type"] in {"all", Transaction.TransactionType.INCOME}
+    include_expense = filters["type"] in {"all", Transaction.TransactionType.EXPENSE}
+    monthly_rollups = {
+        item["month"]: item
+        for item in rollups.order_by()
+        .values("month")
+        .annotate(
+            income=Sum("income"),
+            expense=Sum("expense"),
+            income_count=Sum("income_count"),
+            expense_count=Sum("expense_count"),
+        )
+    }
+    income = Decimal("0.00")
+    expense = Decimal("0.00")
+    count = 0
+    for item in monthly_rollups.values():
+        if include_income:
+            income += item["income"]
+            count += item["income_count"]
+        if include_expense:
+            expense += item["expense"]
+            count += item["expense_count"]
+
+    chart = []
+    for month in _build_transaction_chart_months(today):
+        month_rollup = monthly_rollups.get(month)
+        chart.append(
+            {
+                "month": month.strftime("%Y-%m"),
+                "income": float(month_rollup["income"]) if month_rollup and include_income else 0.0,
+                "expense": float(month_rollup["expense"]) if month_rollup and include_expense else 0.0,
+            }
+        )
+
+    return {
+        "income": float(income),
+        "expense": float(expense),
+        "balance": float(income - expense),
+        "count": count,
+        "chart": chart,
+    }
+
+
+def _build_transaction_summary(user, queryset, filters, today):
+    if _can_use_transaction_rollup(filters):
+        return _build_transaction_rollup_summary(user, filters, today)
+    return _build_transaction_aggregates(queryset, today)
+
+
+def _get_bank_transaction_counts(user):
+    return {
+        str(item["bank_id"]): item["total"]
+        for item in MonthlyBankBalance.objects.filter(owner=user)
+        .order_by()
+        .values("bank_id")
+        .annotate(total=Sum(F("income_count") + F("expense_count")))
+        if item["total"]
+    }
+
+
+def _payable_grouped_installment_filter():
+    return Q(
+        payable_type=Payable.PayableType.INSTALLMENT,
+        installment_group__isnull=False,
+        installment_total__gt=1,
+    )
+
+
+def _build_payable_search_filter(query, today):
+    search_filter = Q()
+    for token in _search_query_tokens(query):
+        token_filter = Q(search_text__contains=token)
+        for payable_type, aliases in PAYABLE_TYPE_SEARCH_ALIASES.items():
+            if token in aliases:
+                token_filter |= Q(payable_type=payable_type)
+        if token in PAYABLE_STATUS_SEARCH_ALIASES["paid"]:
+            token_filter |= Q(status=Payable.PayableStatus.PAID)
+        if token in PAYABLE_STATUS_SEARCH_ALIASES["overdue"]:
+            token_filter |= Q(status=Payable.PayableStatus.PENDING, due_date__lt=today)
+        if token in PAYABLE_STATUS_SEARCH_ALIASES["pending"]:
+            token_filter |= Q(status=Payable.PayableStatus.PENDING, due_date__gte=today)
+        token_date = _parse_search_token_date(token)
+        if token_date:
+            token_filter |= Q(due_date=token_date) | Q(payment_date=token_date)
+        token_amount = _parse_search_token_amount(token)
+        if token_amount is not None:
+            token_filter |= Q(amount=token_amount)
+        search_filter &= token_filter
+    return search_filter
+
+
+def _annotate_search_rank(queryset, tokens):
+    # Cada token soma mais quando cai no titulo (primeira linha do search_text) do que no resto;
+    # tokens que so casaram por data, valor ou status nao pontuam, mas continuam no resultado.
+    annotations = {"search_title_end": StrIndex("search_text", Value("\n"))}
+    rank = Value(0)
+    for index, token in enumerate(tokens):
+        position_field = f"search_position_{index}"
+        annotations[position_field] = StrIndex("search_text", Value(token))
+        rank += Case(
+            When(
+                Q(**{f"{position_field}__gt": 0, f"{position_field}__lt": F("search_title_end")}),
+                then=Value(SEARCH_TITLE_WEIGHT),
+            ),
+            When(Q(**{f"{position_field}__gt": 0}), then=Value(SEARCH_TEXT_WEIGHT)),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    return queryset.annotate(**annotations).annotate(search_rank=rank)
+
+
+def _parse_search_request(params):
+    query = (params.get("q") or "").strip()
+    tokens = _search_query_tokens(query)
+    if not tokens:
+        raise ValueError("q", "Informe um termo de busca.")
+    scope = params.get("scope", "all") or "all"
+    if scope not in SEARCH_SCOPES:
+        raise ValueError("scope", "Escopo de busca invalido.")
+    try:
+        page = int(params.get("page") or 1)
+    except ValueError as exc:
+        raise ValueError("page", "Pagina invalida.") from exc
+    if page < 1 or page > SEARCH_MAX_PAGE:
+        raise ValueError("page", "Pagina invalida.")
+    limit = _parse_page_limit(params.get("limit"), SEARCH_PAGE_SIZE, SEARCH_PAGE_MAX_SIZE)
+    return query, tokens, scope, page, limit
+
+
+def _parse_owned_filter_id(model, user, raw_value, field, message):
+    if raw_value in {"all", "none"}:
+        return raw_value
+    try:
+        object_id = int(raw_value)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(field, message) from exc
+    if not model.objects.filter(id=object_id, owner=user).exists():
+        raise ValueError(field, message)
+    return object_id
+
+
+def _parse_payable_filters(user, params):
+    status = params.get("status", "all") or "all"
+    payable_type = params.get("type", "all") or "all"
+    period = params.get("period", "all") or "all"
+    raw_date = params.get("date") or ""
+
+    if status not in PAYABLE_STATUS_FILTERS:
+        raise ValueError("status", "Status invalido.")
+    if payable_type != "all" and payable_type not in Payable.PayableType.values:
+        raise ValueError("type", "Tipo de conta invalido.")
+    if period not in PAYABLE_PERIOD_FILTERS:
+        raise ValueError("period", "Periodo invalido.")
+    exact_date = parse_date(raw_date) if raw_date else None
+    if raw_date and not exact_date:
+        raise ValueError("date", "Data invalida.")
+
+    return {
+        "status": status,
+        "type": payable_type,
+        "bank": _parse_owned_filter_id(Bank, user, params.get("bank", "all") or "all", "bank", "Banco invalido."),
+        "category": _parse_owned_filter_id(
+            PayableCategory,
+            user,
+            params.get("category", "all") or "all",
+            "category",
+            "Categoria invalida.",
+        ),
+        "period": period,
+        "date": exact_date,
+        "q": (params.get("q") or "").strip(),
+    }
+
+
+def _build_payable_entities_queryset(user, filters, today):
+    grouped_filter = _payable_grouped_installment_filter()
+    members = Payable.objects.filter(owner=user)
+    if filters["type"] != "all":
+        members = members.filter(payable_type=filters["type"])
+    if filters["bank"] == "none":
+        members = members.filter(bank__isnull=True)
+    elif filters["bank"] != "all":
+        members = members.filter(bank_id=filters["bank"])
+    if filters["category"] == "none":
+        members = members.filter(category__isnull=True)
+    elif filters["category"] != "all":
+        members = members.filter(category_id=filters["category"])
+
+    # Data exata e busca casam em qualquer parcela, mas devolvem o grupo inteiro.
+    if filters["date"] or filters["q"]:
+        matching_members = Payable.objects.filter(owner=user)
+        if filters["date"]:
+            matching_members = matching_members.filter(due_date=filters["date"])
+        if filters["q"]:
+            matching_members = matching_members.filter(_build_payable_search_filter(filters["q"], today))
+        members = members.filter(
+            (grouped_filter & Q(installment_group__in=matching_members.filter(grouped_filter).values("installment_group")))
+            | (~grouped_filter & Q(id__in=matching_members.values("id")))
+        )
+
+    pending_filter = Q(status=Payable.PayableStatus.PENDING)
+    entities = (
+        members.order_by()
+        .annotate(
+            group_key=Case(
+                When(grouped_filter, then=F("installment_group")),
+                default=Value(None),
+                output_field=UUIDField(),
+            ),
+            single_key=Case(
+                When(grouped_filter, then=Value(None)),
+                default=F("id"),
+                output_field=IntegerField(),
+            ),
+        )
+        .values("group_key", "single_key")
+        .annotate(
+            first_id=Min("id"),
+            total_count=Count("id"),
+            paid_count=Count("id", filter=Q(status=Payable.PayableStatus.PAID)),
+            overdue_count=Count("id", filter=pending_filter & Q(due_date__lt=today)),
+            amount_total=Sum("amount"),
+            paid_amount=Sum("amount", filter=Q(status=Payable.PayableStatus.PAID)),
+            overdue_amount=Sum("amount", filter=pending_filter & Q(due_date__lt=today)),
+            next_due_date=Min("due_date", filter=pending_filter),
+            entity_due_date=Coalesce(Min("due_date", filter=pending_filter), Max("due_date")),
+        )
+    )
+
+    if filters["status"] == "paid":
+        entities = entities.filter(paid_count=F("total_count"))
+    elif filters["status"] == "overdue":
+        entities = entities.filter(overdue_count__gt=0)
+    elif filters["status"] == "pending":
+        entities = entities.filter(paid_count__lt=F("total_count"), overdue_count=0)
+
+    if not filters["date"]:
+        if filters["period"] == "overdue":
+            entities = entities.filter(overdue_count__gt=0)
+        else:
+            start_date, end_date = _get_period_date_range(filters["period"], today)
+            if start_date:
+                entities = entities.filter(entity_due_date__gte=start_date)
+            if end_date:
+                entities = entities.filter(entity_due_date__lte=end_date)
+
+    return entities.order_by("entity_due_date", "first_id")
+
+
+def _paginate_payable_entities(entities, cursor=None, limit=PAYABLE_PAGE_SIZE):
+    if cursor:
+        cursor_date, cursor_id = cursor
+        entities = entities.filter(
+            Q(entity_due_date__gt=cursor_date) | Q(entity_due_date=cursor_date, first_id__gt=cursor_id)
+        )
+    rows = list(entities[: limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = (
+        _encode_date_id_cursor(rows[-1]["entity_due_date"], rows[-1]["first_id"]) if has_more and rows else None
+    )
+    return rows, next_cursor
+
+
+def _serialize_payable_entity(entity, representative, request=None):
+    is_grouped = entity["group_key"] is not None
+    paid_count = entity["paid_count"]
+    total_count = entity["total_count"]
+    if paid_count == total_count:
+        status_state = "paid"
+    elif entity["overdue_count"]:
+        status_state = "overdue"
+    else:
+        status_state = "pending"
+
+    if is_grouped:
+        installment_text = f"{paid_count}/{total_count} pagas"
+    elif representative.installment_number and representative.installment_total:
+        installment_text = f"{representative.installment_number}/{representative.installment_total}"
+        total_count = representative.installment_total
+    else:
+        installment_text = "-"
+
+    is_installment = representative.payable_type == Payable.PayableType.INSTALLMENT
+    return {
+        "key": f"group-{entity['group_key']}" if is_grouped else f"single-{representative.id}",
+        "id": representative.id,
+        "detail_reference_id": representative.id,
+        "payable_type": representative.payable_type,
+        "title": representative.title,
+        "description": representative.description,
+        "category": _serialize_payable_category(representative.category) if representative.category else None,
+        "bank": _serialize_bank(representative.bank) if representative.bank else None,
+        "installment_group": str(entity["group_key"]) if is_grouped else None,
+        "due_date": entity["entity_due_date"].isoformat(),
+        "next_due_date": entity["next_due_date"].isoformat() if entity["next_due_date"] else None,
+        "status_state": status_state,
+        "installment_text": installment_text,
+        "amount_total": float(entity["amount_total"]),
+        "paid_count": paid_count,
+        "total_count": total_count,
+        "overdue_count": entity["overdue_count"],
+        "progress_percent": round((paid_count / total_count) * 100) if total_count else 0,
+        "is_grouped_installment": is_grouped,
+        "can_open_details": is_grouped or (is_installment and (representative.installment_total or 0) > 1),
+        "can_edit": not is_installment,
+        "payable": None if is_grouped else _serialize_payable(representative, request=request),
+    }
+
+
+def _serialize_payable_entities(rows, request=None):
+    representatives = Payable.objects.select_related("bank", "category").in_bulk(
+        [entity["first_id"] for entity in rows]
+    )
+    return [_serialize_payable_entity(entity, representatives[entity["first_id"]], request=request) for entity in rows]
+
+
+def _build_payable_entity_summary(user, entities, filters, today):
+    # Os nomes dos agregados nao podem repetir os das anotacoes de cada entidade.
+    totals = entities.order_by().aggregate(
+        entity_total=Count("first_id"),
+        overdue_entity_total=Count("first_id", filter=Q(overdue_count__gt=0)),
+        member_total=Sum("total_count"),
+        paid_member_total=Sum("paid_count"),
+        overdue_member_total=Sum("overdue_count"),
+        amount_sum=Sum("amount_total"),
+        paid_amount_sum=Sum("paid_amount"),
+        overdue_amount_sum=Sum("overdue_amount"),
+    )
+    if filters == DEFAULT_PAYABLE_FILTERS:
+        total_entity_count = totals["entity_total"]
+    else:
+        total_entity_count = _build_payable_entities_queryset(user, DEFAULT_PAYABLE_FILTERS, today).count()
+    member_count = totals["member_total"] or 0
+    paid_count = totals["paid_member_total"] or 0
+    amount_total = totals["amount_sum"] or Decimal("0")
+    paid_amount = totals["paid_amount_sum"] or Decimal("0")
+    overdue_amount = totals["overdue_amount_sum"] or Decimal("0")
+    return {
+        "entity_count": totals["entity_total"],
+        "total_entity_count": total_entity_count,
+        "overdue_entity_count": totals["overdue_entity_total"],
+        "member_count": member_count,
+        "paid_count": paid_count,
+        "pending_count": member_count - paid_count,
+        "overdue_count": totals["overdue_member_total"] or 0,
+        "amount_total": float(amount_total),
+        "paid_amount": float(paid_amount),
+        "overdue_amount": float(overdue_amount),
+        # Pendente ainda no prazo, como no card "Pendente" da aba.
+        "pending_amount": float(amount_total - paid_amount - overdue_amount),
+    }
+
+
+def _get_payable_usage_counts(user):
+    payables = Payable.objects.filter(owner=user).order_by()
+    return {
+        "banks": {
+            str(row["bank_id"]): row["total"]
+            for row in payables.filter(bank__isnull=False).values("bank_id").annotate(total=Count("id"))
+        },
+        "categories": {
+            str(row["category_id"]): row["total"]
+            for row in payables.filter(category__isnull=False).values("category_id").annotate(total=Count("id"))
+        },
+    }
+
+
+def _build_payable_page(request, filters, today, cursor=None, limit=PAYABLE_PAGE_SIZE):
+    entities = _build_payable_entities_queryset(request.user, filters, today)
+    rows, next_cursor = _paginate_payable_entities(entities, cursor=cursor, limit=limit)
+    page = {
+        "entities": _serialize_payable_entities(rows, request=request),
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None,
+    }
+    if cursor is None:
+        page["summary"] = _build_payable_entity_summary(request.user, entities, filters, today)
+        page["usage"] = _get_payable_usage_counts(request.user)
+    return page
+
+
+def _get_payable_working_set(payables, today):
+    # No modo paginado o array embutido alimenta so lembretes e conciliacao do painel.
+    # Os lembretes vem do vencimento mais proximo para tras, entao os de hoje/amanha nunca ficam de fora.
+    limit = DASHBOARD_PAYABLE_WORKING_SET_LIMIT
+    reminder_ids = list(
+        payables.filter(
+            status=Payable.PayableStatus.PENDING,
+            due_date__lte=today + timedelta(days=PAYABLE_REMINDER_DAYS),
+        )
+        .order_by("-due_date", "-id")
+        .values_list("id", flat=True)[:limit]
+    )
+    reconciliation_ids = list(
+        payables.filter(payable_type=Payable.PayableType.INSTALLMENT, status=Payable.PayableStatus.PAID)
+        .filter(Q(payment_receipt="") | Q(payment_receipt__isnull=True))
+        .order_by("-payment_date", "-id")
+        .values_list("id", flat=True)[:limit]
+    )
+    return payables.filter(id__in=reminder_ids + reconciliation_ids)
+
+
+def _get_request_data_version(request):
+    if not hasattr(request, "_data_version"):
+        request._data_version = UserDataVersion.objects.filter(user=request.user).values(
+            "version",
+            "updated_at",
+        ).first() or {"version": 0, "updated_at": None}
+    return request._data_version
+
+
+def _user_data_etag(request, *args, **kwargs):
+    if not request.user.is_authenticated:
+        return None
+    # A data entra porque contas "vencidas" mudam na virada do dia sem nenhuma escrita.
+    data_version = _get_request_data_version(request)
+    return f"{request.user.id}-{data_version['version']}-{timezone.localdate():%Y%m%d}"
+
+
+def _user_data_last_modified(request, *args, **kwargs):
+    if not request.user.is_authenticated:
+        return None
+    data_version = _get_request_data_version(request)
+    start_of_day = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+    if not data_version["updated_at"]:
+        return start_of_day
+    return max(data_version["updated_at"], start_of_day)
+
+
+def _encode_sync_token(moment):
+    delta = moment - SYNC_TOKEN_EPOCH
+    return str((delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds)
+
+
+def _decode_sync_token(raw_token):
+    try:
+        microseconds = int(raw_token)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("since", "Token de sincronizacao invalido.") from exc
+    if microseconds < 0:
+        raise ValueError("since", "Token de sincronizacao invalido.")
+    return SYNC_TOKEN_EPOCH + timedelta(microseconds=microseconds)
+
+
+def _sync_full_reload_response(next_token):
+    return JsonResponse(
+        {
+            "ok": True,
+            "token": next_token,
+            "full_reload": True,
+            "changes": {},
+            "deleted": {},
+        }
+    )
+
+
+def _open_statement_text(binary_file):
+    sample = binary_file.read(STATEMENT_SNIFF_BYTES)
+    binary_file.seek(0)
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample)
+        encoding = "utf-8-sig"
+    except UnicodeDecodeError:
+        # Extratos de bancos brasileiros costumam sair em Windows-1252.
+        encoding = "cp1252"
+    text_sample = sample.decode(encoding, errors="ignore")
+    return io.TextIOWrapper(binary_file, encoding=encoding, errors="replace", newline=""), text_sample
+
+
+def _is_ofx_statement(file_name, text_sample):
+    if os.path.splitext(file_name or "")[1].lower() in {".ofx", ".qfx"}:
+        return True
+    head = text_sample.lstrip().upper()
+    return head.startswith("OFXHEADER") or "<OFX>" in head[:2048]
+
+
+def _iter_csv_reader(reader):
+    # Campo acima do csv.field_size_limit() ou aspas quebradas: o arquivo inteiro e recusado
+    # como erro de validacao, em vez de escapar como csv.Error.
+    try:
+        yield from reader
+    except csv.Error as exc:
+        raise ValueError("file", f"CSV invalido perto da linha {reader.line_num}.") from exc
+
+
+def _iter_csv_statement_rows(text_file, text_sample):
+    try:
+        dialect = csv.Sniffer().sniff(text_sample.split("\n", 1)[0], delimiters=";,\t|")
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.reader(text_file, dialect)
+    csv_rows = _iter_csv_reader(reader)
+    header = next(csv_rows, None)
+    if not header:
+        raise ValueError("file", "Arquivo vazio.")
+
+    columns = {}
+    for index, column_name in enumerate(header):
+        normalized = " ".join(_normalize_search_text(column_name).split())
+        for key, aliases in STATEMENT_CSV_COLUMNS.items():
+            if normalized in aliases and key not in columns:
+                columns[key] = index
+    has_amount = "amount" in columns or ("credit" in columns and "debit" in columns)
+    if "date" not in columns or "title" not in columns or not has_amount:
+        raise ValueError("file", "Colunas obrigatorias ausentes: data, descricao e valor.")
+
+    def cell(row, key):
+        index = columns.get(key)
+        return row[index].strip() if index is not None and index < len(row) else ""
+
+    for row in csv_rows:
+        if not any(value.strip() for value in row):
+            continue
+        amount = cell(row, "amount")
+        if not amount:
+            credit, debit = cell(row, "credit"), cell(row, "debit")
+            amount = credit or (f"-{debit.lstrip('-')}" if debit else "")
+        yield reader.line_num, {
+            "date": cell(row, "date"),
+            "title": cell(row, "title"),
+            "description": cell(row, "description"),
+            "amount": amount,
+            "type": cell(row, "type"),
+            "fitid": "",
+        }
+
+
+def _iter_ofx_statement_rows(text_file):
+    # OFX 1.x e SGML: elementos sem fechamento, mas o agregado STMTTRN sempre fecha.
+    current = None
+    start_line = 0
+    for line_number, line in enumerate(text_file, start=1):
+        for closing, tag, value in OFX_TAG_PATTERN.findall(line):
+            tag = tag.upper()
+            if tag == "STMTTRN":
+                if current is not None:
+                    yield start_line, current
+                current = None if closing else {}
+                start_line = line_number
+            elif current is not None and not closing:
+                current[tag] = html.unescape(value.strip())
+    if current is not None:
+        yield start_line, current
+
+
+def _map_ofx_statement_row(raw_row):
+    name = raw_row.get("NAME", "")
+    memo = raw_row.get("MEMO", "")
+    return {
+        "date": raw_row.get("DTPOSTED", "")[:8],
+        "title": name or memo,
+        "description": memo if name and memo != name else "",
+        "amount": raw_row.get("TRNAMT", ""),
+        "type": "",
+        "fitid": raw_row.get("FITID", ""),
+    }
+
+
+def _parse_statement_date(raw_date):
+    raw_date = (raw_date or "").strip()
+    if len(raw_date) == 8 and raw_date.isdigit():
+        raw_date = f"{raw_date[:4]}-{raw_date[4:6]}-{raw_date[6:]}"
+    try:
+        parsed_date = _parse_search_token_date(raw_date)
+    except ValueError:
+        parsed_date = None
+    if not parsed_date:
+        raise ValueError("transaction_date", "Data invalida.")
+    return parsed_date
+
+
+def _parse_statement_amount(raw_amount):
+    normalized = (raw_amount or "").replace("R$", "").replace(" ", "").strip()
+    negative = normalized.startswith("(") and normalized.endswith(")")
+    normalized = normalized.strip("()")
+    if normalized.endswith("-"):
+        negative = True
+        normalized = normalized[:-1]
+    # O separador que aparece por ultimo e o decimal: 1.234,56 e 1,234.56.
+    if "," in normalized and normalized.rfind(",") > normalized.rfind("."):
+        normalized = normalized.replace(".", "").replace(",", ".")
+    elif "," in normalized:
+        normalized = normalized.replace(",", "")
+    elif normalized.count(".") > 1:
+        normalized = normalized.replace(".", "")
+    try:
+        amount = Decimal(normalized).quantize(Decimal("0.01"))
+    except InvalidOperation as exc:
+        raise ValueError("amount", "Valor invalido.") from exc
+    if not amount.is_finite():
+        raise ValueError("amount", "Valor invalido.")
+    return -amount if negative else amount
+
+
+def _parse_statement_transaction_type(raw_type, amount):
+    normalized = _normalize_search_text(raw_type).strip()
+    if normalized in {"c", "cr"}:
+        return Transaction.TransactionType.INCOME
+    if normalized in {"d", "db"}:
+        return Transaction.TransactionType.EXPENSE
+    for transaction_type, aliases in TRANSACTION_TYPE_SEARCH_ALIASES.items():
+        if normalized and normalized in aliases.split():
+            return transaction_type
+    return Transaction.TransactionType.EXPENSE if amount < 0 else Transaction.TransactionType.INCOME
+
+
+def _build_statement_transaction(owner, bank, raw_row):
+    title = " ".join((raw_row["title"] or "").split())
+    if not title:
+        raise ValueError("title", "Descricao vazia.")
+    transaction_date = _parse_statement_date(raw_row["date"])
+    signed_amount = _parse_statement_amount(raw_row["amount"])
+    amount = abs(signed_amount)
+    if amount < Decimal("0.01") or amount > STATEMENT_MAX_AMOUNT:
+        raise ValueError("amount", "Valor fora do intervalo permitido.")
+    transaction = Transaction(
+        owner=owner,
+        bank=bank,
+        title=title[:120],
+        description=" ".join((raw_row["description"] or "").split())[:255],
+        transaction_type=_parse_statement_transaction_type(raw_row["type"], signed_amount),
+        amount=amount,
+        transaction_date=transaction_date,
+    )
+    transaction.refresh_search_text()
+    return transaction
+
+
+def _get_statement_row_basis(transaction, fitid):
+    if fitid:
+        return f"fitid|{transaction.bank_id}|{fitid}"
+    return "|".join(
+        [
+            str(transaction.bank_id),
+            transaction.transaction_date.isoformat(),
+            transaction.transaction_type,
+            str(transaction.amount),
+            _normalize_search_text(transaction.title),
+        ]
+    )
+
+
+def _flush_statement_batch(owner, batch, summary, rollup):
+    existing_hashes = set(
+        Transaction.objects.filter(owner=owner, import_hash__in=[tx.import_hash for tx in batch])
+        .order_by()
+        .values_list("import_hash", flat=True)
+    )
+    new_transactions = [tx for tx in batch if tx.import_hash not in existing_hashes]
+    Transaction.objects.bulk_create(new_transactions, batch_size=STATEMENT_IMPORT_BATCH_SIZE)
+    summary["imported"] += len(new_transactions)
+    summary["skipped"] += len(batch) - len(new_transactions)
+    for tx in new_transactions:
+        totals = rollup[(tx.bank_id, tx.transaction_date.replace(day=1))]
+        if tx.transaction_type == Transaction.TransactionType.INCOME:
+            totals["income"] += tx.amount
+            totals["income_count"] += 1
+        else:
+            totals["expense"] += tx.amount
+            totals["expense_count"] += 1
+
+
+def import_bank_statement(owner, bank, binary_file, file_name=""):
+    text_file, text_sample = _open_statement_text(binary_file)
+    if _is_ofx_statement(file_name, text_sample):
+        rows = ((line, _map_ofx_statement_row(row)) for line, row in _iter_ofx_statement_rows(text_file))
+    else:
+        rows = _iter_csv_statement_rows(text_file, text_sample)
+
+    summary = {"imported": 0, "skipped": 0, "errors": [], "error_count": 0}
+    # Linhas identicas no mesmo arquivo (dois cafes iguais no mesmo dia) recebem hashes
+    # distintos pela ordem de ocorrencia; reimportar o arquivo gera os mesmos hashes.
+    occurrences = Counter()
+    rollup = defaultdict(
+        lambda: {"income": Decimal("0.00"), "expense": Decimal("0.00"), "income_count": 0, "expense_count": 0}
+    )
+    batch = []
+    try:
+        with db_transaction.atomic():
+            for line_number, raw_row in rows:
+                try:
+                    transaction = _build_statement_transaction(owner, bank, raw_row)
+                except ValueError as exc:
+                    _field, message = exc.args
+                    summary["error_count"] += 1
+                    if len(summary["errors"]) < STATEMENT_IMPORT_MAX_ERRORS:
+                        summary["errors"].append(f"Linha {line_number}: {message}")
+                    continue
+                basis = _get_statement_row_basis(transaction, raw_row["fitid"])
+                occurrence = occurrences[basis]
+                occurrences[basis] += 1
+                if raw_row["fitid"] and occurrence:
+                    # FITID repetido no arquivo e a mesma transacao exportada duas vezes.
+                    summary["skipped"] += 1
+                    continue
+                transaction.import_hash = hashlib.sha256(f"{basis}|{occurrence}".encode("utf-8")).hexdigest()
+                batch.append(transaction)
+                if len(batch) >= STATEMENT_IMPORT_BATCH_SIZE:
+                    _flush_statement_batch(owner, batch, summary, rollup)
+                    batch = []
+            if batch:
+                _flush_statement_batch(owner, batch, summary, rollup)
+
+            # bulk_create nao dispara os signals: consolida o rollup mensal e a versao aqui.
+            for (bank_id, month), totals in rollup.items():
+                MonthlyBankBalance.objects.apply_delta(owner.id, bank_id, month, **totals)
+            if summary["imported"]:
+                UserDataVersion.objects.bump(owner.id)
+                db_transaction.on_commit(
+                    lambda: live_update_broker.publish(
+                        owner.id,
+                        {"type": "transaction", "action": "imported", "id": None},
+                    )
+                )
+    except IntegrityError as exc:
+        raise ValueError("file", "Outra importacao do mesmo extrato esta em andamento. Tente novamente.") from exc
+    finally:
+        text_file.detach()
+    return summary
+
+
+def _format_sse_message(event_name, payload):
+    return f"event: {event_name}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n"
+
+
+async def _iter_live_updates(user_id):
+    loop = asyncio.get_running_loop()
+    subscriber = live_update_broker.subscribe(user_id)
+    _subscriber_loop, queue = subscriber
+    # Com mais de um worker o pub/sub em memoria nao enxerga escritas dos outros processos;
+    # nesse caso LIVE_UPDATES_DB_POLL_SECONDS liga a checagem periodica da UserDataVersion.
+    poll_seconds = getattr(settings, "LIVE_UPDATES_DB_POLL_SECONDS", 0)
+    get_version = sync_to_async(UserDataVersion.objects.get_version)
+    known_version = await get_version(user_id) if poll_seconds else None
+    started_at = last_sent_at = loop.time()
+    try:
+        yield f"retry: {LIVE_UPDATES_RETRY_MS}\n\n"
+        while loop.time() - started_at < LIVE_UPDATES_MAX_SECONDS:
+            wait_seconds = min(poll_seconds or LIVE_UPDATES_HEARTBEAT_SECONDS, LIVE_UPDATES_HEARTBEAT_SECONDS)
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=wait_seconds)
+            except asyncio.TimeoutError:
+                message = None
+
+            if message is None and poll_seconds:
+                current_version = await get_version(user_id)
+                if current_version != known_version:
+                    known_version = current_version
+                    message = {"type": "sync", "action": "changed", "id": None}
+
+            if message is not None:
+                yield _format_sse_message("change", message)
+                last_sent_at = loop.time()
+            elif loop.time() - last_sent_at >= LIVE_UPDATES_HEARTBEAT_SECONDS:
+                yield ": ping\n\n"
+                last_sent_at = loop.time()
+    finally:
+        live_update_broker.unsubscribe(user_id, subscriber)
+
+
+@login_required
+async def live_updates(request):
+    if not isinstance(request, ASGIRequest):
+        # Sob WSGI a conexao prenderia um worker; 204 faz o EventSource desistir de reconectar.
+        return HttpResponse(status=204)
+    user = await request.auser()
+    response = StreamingHttpResponse(_iter_live_updates(user.id), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@login_required
+def dashboard_home(request):
+    banks = list(Bank.objects.filter(owner=request.user).values("id", "name", "slug", "color", "icon"))
+    categories = list(
+        PayableCategory.objects.filter(owner=request.user).values("id", "name", "slug", "color")
+    )
+    transactions = Transaction.objects.select_related("bank").filter(owner=request.user)
+    payables = Payable.objects.select_related("bank", "category").filter(owner=request.user)
+    events = Event.objects.filter(owner=request.user)
+    today = timezone.localdate()
+
+    # Historicos grandes embutem so a primeira pagina + agregados; o restante vem de /api/transactions/.
+    transactions_paginated = transactions.order_by("-transaction_date", "-id").values_list("id", flat=True)[
+        DASHBOARD_TRANSACTION_EMBED_LIMIT : DASHBOARD_TRANSACTION_EMBED_LIMIT + 1
+    ].exists()
+    dashboard_summary = _build_transaction_summary(request.user, transactions, DEFAULT_TRANSACTION_FILTERS, today)
+    transactions_page = None
+    if transactions_paginated:
+        transaction_rows, next_cursor = _paginate_transactions(transactions, limit=TRANSACTION_PAGE_SIZE)
+        transactions_page = {
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None,
+            "summary": dashboard_summary,
+            "bank_transaction_counts": _get_bank_transaction_counts(request.user),
+        }
+    else:
+        transaction_rows = transactions
+
+    # Mesmo esquema para contas a pagar: a aba pagina por /api/payables/ e o painel usa um recorte.
+    payables_paginated = payables.order_by("id").values_list("id", flat=True)[
+        DASHBOARD_PAYABLE_EMBED_LIMIT : DASHBOARD_PAYABLE_EMBED_LIMIT + 1
+    ].exists()
+    payables_page = None
+    if payables_paginated:
+        payables_page = _build_payable_page(request, DEFAULT_PAYABLE_FILTERS, today, limit=PAYABLE_PAGE_SIZE)
+        payable_rows = _get_payable_working_set(payables, today)
+    else:
+        payable_rows = payables
+
+    dashboard_data = {
+        "banks": banks,
+        "categories": categories,
+        "transactions": [_serialize_transaction(tx) for tx in transaction_rows],
+        "transactions_paginated": transactions_paginated,
+        "transactions_page": transactions_page,
+        "transaction_summary": dashboard_summary,
+        "payables": [_serialize_payable(payable, request=request) for payable in payable_rows],
+        "payables_paginated": payables_paginated,
+        "payables_page": payables_page,
+        "events": [_serialize_event(event) for event in events],
+        "today": today.isoformat(),
+        "sync_token": _encode_sync_token(timezone.now() - timedelta(seconds=SYNC_TOKEN_OVERLAP_SECONDS)),
+        "dashboard_widget_order": _get_user_dashboard_widget_order(request.user),
+    }
+    return render(
+        request,
+        "dashboard/index.html",
+        {"dashboard_data": dashboard_data, "banks": banks, "categories": categories},
+    )
+
+
+@login_required
+@require_POST
+def dashboard_layout_save(request):
+    try:
+        payload = json.loads(request.body.decode("utf-8"))
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return JsonResponse(
+            {"ok": False, "errors": {"layout": ["Payload invalido."]}},
+            status=400,
+        )
+
+    normalized_order = _normalize_dashboard_widget_order(payload.get("order", []))
+    layout, _created = UserDashboardLayout.objects.get_or_create(user=request.user)
+    layout.widget_order = normalized_order
+    layout.save(update_fields=["widget_order", "updated_at"])
+    return JsonResponse({"ok": True, "order": normalized_order})
+
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_user_data_etag, last_modified_func=_user_data_last_modified)
+def transaction_list(request):
+    try:
+        filters = _parse_transaction_filters(request.user, request.GET)
+        cursor = _decode_date_id_cursor(request.GET.get("cursor"))
+        limit = _parse_page_limit(request.GET.get("limit"), TRANSACTION_PAGE_SIZE, TRANSACTION_PAGE_MAX_SIZE)
+    except ValueError as exc:
+        field, message = exc.args
+        return JsonResponse({"ok": False, "errors": {field: [message]}}, status=400)
+
+    today = timezone.localdate()
+    queryset = _filter_transactions(
+        Transaction.objects.select_related("bank").filter(owner=request.user),
+        filters,
+        today,
+    )
+    rows, next_cursor = _paginate_transactions(queryset, cursor=cursor, limit=limit)
+    payload = {
+        "ok": True,
+        "transactions": [_serialize_transaction(tx) for tx in rows],
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None,
+    }
+    if cursor is None:
+        payload["summary"] = _build_transaction_summary(request.user, queryset, filters, today)
+    return JsonResponse(payload)
+
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_user_data_etag, last_modified_func=_user_data_last_modified)
+def transaction_summary(request):
+    try:
+        filters = _parse_transaction_filters(request.user, request.GET)
+    except ValueError as exc:
+        field, message = exc.args
+        return JsonResponse({"ok": False, "errors": {field: [message]}}, status=400)
+
+    today = timezone.localdate()
+    queryset = _filter_transactions(Transaction.objects.filter(owner=request.user), filters, today)
+    return JsonResponse({"ok": True, "summary": _build_transaction_summary(request.user, queryset, filters, today)})
+
+
+@login_required
+def sync_changes(request):
+    now = timezone.now()
+    # O token volta alguns segundos para nao perder escritas que ainda estavam em transacao.
+    next_token = _encode_sync_token(now - timedelta(seconds=SYNC_TOKEN_OVERLAP_SECONDS))
+    raw_since = (request.GET.get("since") or "").strip()
+    if not raw_since:
+        return _sync_full_reload_response(next_token)
+    try:
+        since = _decode_sync_token(raw_since)
+    except ValueError as exc:
+        field, message = exc.args
+        return JsonResponse({"ok": False, "errors": {field: [message]}}, status=400)
+    if since < now - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS):
+        return _sync_full_reload_response(next_token)
+
+    sources = [
+        ("transactions", Transaction.objects.select_related("bank"), _serialize_transaction),
+        (
+            "payables",
+            Payable.objects.select_related("bank", "category"),
+            lambda payable: _serialize_payable(payable, request=request),
+        ),
+        ("events", Event.objects.all(), _serialize_event),
+        ("banks", Bank.objects.all(), _serialize_bank),
+        ("categories", PayableCategory.objects.all(), _serialize_payable_category),
+    ]
+    changes = {}
+    for key, queryset, serializer in sources:
+        records = list(
+            queryset.filter(owner=request.user, updated_at__gte=since)
+            .order_by("updated_at", "id")[:SYNC_MAX_CHANGES_PER_MODEL + 1]
+        )
+        if len(records) > SYNC_MAX_CHANGES_PER_MODEL:
+            return _sync_full_reload_response(next_token)
+        changes[key] = [serializer(record) for record in records]
+
+    deleted = {key: [] for key, _queryset, _serializer in sources}
+    tombstones = SyncTombstone.objects.filter(owner=request.user, deleted_at__gte=since).values_list(
+        "model_name",
+        "object_id",
+    )
+    for model_name, object_id in tombstones:
+        deleted[SYNC_TOMBSTONE_KEYS[model_name]].append(object_id)
+
+    return JsonResponse(
+        {
+            "ok": True,
+            "token": next_token,
+            "full_reload": False,
+            "changes": changes,
+            "deleted": deleted,
+        }
+    )
+
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_user_data_etag, last_modified_func=_user_data_last_modified)
+def search(request):
+    try:
+        query, tokens, scope, page, limit = _parse_search_request(request.GET)
+    except ValueError as exc:
+        field, message = exc.args
+        return JsonResponse({"ok": False, "errors": {field: [message]}}, status=400)
+
+    today = timezone.localdate()
+    sources = []
+    if scope in {"all", "transactions"}:
+        transactions = _annotate_search_rank(
+            Transaction.objects.select_related("bank").filter(owner=request.user)
+            .filter(_build_transaction_search_filter(query)),
+            tokens,
+        )
+        sources.append(
+            (
+                "transaction",
+                transactions.order_by("-search_rank", "-transaction_date", "-id"),
+                lambda transaction: transaction.transaction_date,
+                _serialize_transaction,
+            )
+        )
+    if scope in {"all", "payables"}:
+        payables = _annotate_search_rank(
+            Payable.objects.select_related("bank", "category").filter(owner=request.user)
+            .filter(_build_payable_search_filter(query, today)),
+            tokens,
+        )
+        sources.append(
+            (
+                "payable",
+                payables.order_by("-search_rank", "-due_date", "-id"),
+                lambda payable: payable.due_date,
+                lambda payable: _serialize_payable(payable, request=request),
+            )
+        )
+
+    # Cada fonte ja vem ordenada pelo banco; basta trazer ate o fim da pagina de cada uma e intercalar.
+    offset = (page - 1) * limit
+    totals = {}
+    candidates = []
+    for kind, queryset, date_getter, serializer in sources:
+        totals[kind] = queryset.count()
+        for record in queryset[: offset + limit]:
+            candidates.append((record.search_rank, date_getter(record), kind, record, serializer))
+    candidates.sort(key=lambda candidate: (candidate[0], candidate[1]), reverse=True)
+
+    results = [
+        {"kind": kind, "rank": rank, kind: serializer(record)}
+        for rank, _date, kind, record, serializer in candidates[offset : offset + limit]
+    ]
+    return JsonResponse(
+        {
+            "ok": True,
+            "query": query,
+            "results": results,
+            "page": page,
+            "has_more": offset + limit < sum(totals.values()) and page < SEARCH_MAX_PAGE,
+            "totals": totals,
+        }
+    )
+
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_user_data_etag, last_modified_func=_user_data_last_modified)
+def payable_list(request):
+    try:
+        filters = _parse_payable_filters(request.user, request.GET)
+        cursor = _decode_date_id_cursor(request.GET.get("cursor"))
+        limit = _parse_page_limit(request.GET.get("limit"), PAYABLE_PAGE_SIZE, PAYABLE_PAGE_MAX_SIZE)
+    except ValueError as exc:
+        field, message = exc.args
+        return JsonResponse({"ok": False, "errors": {field: [message]}}, status=400)
+
+    page = _build_payable_page(request, filters, timezone.localdate(), cursor=cursor, limit=limit)
+    return JsonResponse({"ok": True, **page})
+
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_user_data_etag, last_modified_func=_user_data_last_modified)
+def payable_calendar(request):
+    try:
+        month_start = datetime.strptime(request.GET.get("month") or "", "%Y-%m").date()
+    except ValueError:
+        return JsonResponse({"ok": False, "errors": {"month": ["Mes invalido."]}}, status=400)
+
+    month_end = month_start.replace(day=monthrange(month_start.year, month_start.month)[1])
+    today = timezone.localdate()
+    rows = (
+        Payable.objects.filter(owner=request.user, due_date__gte=month_start, due_date__lte=month_end)
+        .order_by()
+        .values("due_date")
+        .annotate(
+            total=Count("id"),
+            paid=Count("id", filter=Q(status=Payable.PayableStatus.PAID)),
+            overdue=Count("id", filter=Q(status=Payable.PayableStatus.PENDING, due_date__lt=today)),
+        )
+    )
+    return JsonResponse(
+        {
+            "ok": True,
+            "month": f"{month_start:%Y-%m}",
+            "days": {
+                row["due_date"].isoformat(): {
+                    "total": row["total"],
+                    "paid": row["paid"],
+                    "pending": row["total"] - row["paid"],
+                    "overdue": row["overdue"],
+                }
+                for row in rows
+            },
+        }
+    )
+
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_user_data_etag, last_modified_func=_user_data_last_modified)
+def event_list(request):
+    events = Event.objects.filter(owner=request.user).order_by("starts_at", "id")
+    return JsonResponse({"ok": True, "events": [_serialize_event(event) for event in events]})
+
+
+@login_required
+@require_POST
+def event_create(request):
+    form = EventForm(request.POST, user=request.user)
+    if not form.is_valid():
+        return JsonResponse({"ok": False, "errors": _serialize_form_errors(form)}, status=400)
+
+    event = form.save(commit=False)
+    event.owner = request.user
+    if not event.creator_name:
+        event.creator_name = request.user.username
+    event.save()
+    return JsonResponse({"ok": True, "event": _serialize_event(event)})
+
+
+@login_required
+@require_POST
+def event_update(request, event_id):
+    event = get_object_or_404(Event, pk=event_id, owner=request.user)
+    form = EventForm(request.POST, instance=event, user=request.user)
+    if not form.is_valid():
+        return JsonResponse({"ok": False, "errors": _serialize_form_errors(form)}, status=400)
+
+    updated_event = form.save(commit=False)
+    updated_event.owner = request.user
+    if not updated_event.creator_name:
+        updated_event.creator_name = request.user.username
+    updated_event.save()
+    return JsonResponse({"ok": True, "event": _serialize_event(updated_event)})
+
+
+@login_required
+@require_POST
+def event_delete(request, event_id):
+    event = get_object_or_404(Event, pk=event_id, owner=request.user)
+    deleted_id = event.id
+    event.delete()
+    return JsonResponse({"ok": True, "deleted_id": deleted_id})
+
+
+@login_required
+@require_POST
+def transaction_create(request):
+    form = TransactionForm(request.POST, user=request.user)
+    if not form.is_valid():
+        return JsonResponse({"ok": False, "errors": _serialize_form_errors(form)}, status=400)
+
+    transaction = form.save(commit=False)
+    transaction.owner = request.user
+    transaction.save()
+    return JsonResponse({"ok": True, "transaction": _serialize_transaction(transaction)})
+
+
+@login_required
+@require_POST
+def transaction_import(request):
+    statement_file = request.FILES.get("file")
+    if not statement_file:
+        return JsonResponse({"ok": False, "errors": {"file": ["Envie um arquivo CSV ou OFX."]}}, status=400)
+    try:
+        bank_id = int(request.POST.get("bank", ""))
+    except ValueError:
+        bank_id = None
+    bank = Bank.objects.filter(id=bank_id, owner=request.user).first() if bank_id else None
+    if bank is None:
+        return JsonResponse({"ok": False, "errors": {"bank": ["Banco invalido para este usuario."]}}, status=400)
+
+    try:
+        summary = import_bank_statement(request.user, bank, statement_file.file, file_name=statement_file.name)
+    except ValueError as exc:
+        field, message = exc.args
+        return JsonResponse({"ok": False, "errors": {field: [message]}}, status=400)
+    return JsonResponse({"ok": True, **summary})
+
+
+@login_required
+@require_POST
+def transaction_update(request, transaction_id):
+    transaction = get_object_or_404(Transaction, pk=transaction_id, owner=request.user)
+    form = TransactionForm(request.POST, instance=transaction, user=request.user)
+    if not form.is_valid():
+        return JsonResponse({"ok": False, "errors": _serialize_form_errors(form)}, status=400)
+
+    updated_transaction = form.save(commit=False)
+    updated_transaction.owner = request.user
+    updated_transaction.save()
+    return JsonResponse({"ok": True, "transaction": _serialize_transaction(updated_transaction)})
+
+
+def _add_transaction_rollup_totals(rollup, queryset, sign, bank_id=None, month=None):
+    # Totais do rollup mensal agregados no banco, por banco e mes, sem carregar as transacoes.
+    monthly_rows = (
+        queryset.order_by()
+        .annotate(month=TruncMonth("transaction_date"))
+        .values("bank_id", "month")
+        .annotate(
+            income=Sum("amount", filter=Q(transaction_type=Transaction.TransactionType.INCOME)),
+            expense=Sum("amount", filter=Q(transaction_type=Transaction.TransactionType.EXPENSE)),
+            income_count=Count("id", filter=Q(transaction_type=Transaction.TransactionType.INCOME)),
+            expense_count=Count("id", filter=Q(transaction_type=Transaction.TransactionType.EXPENSE)),
+        )
+    )
+    for row in monthly_rows:
+        totals = rollup[(bank_id or row["bank_id"], month or row["month"])]
+        totals["income"] += (row["income"] or Decimal("0.00")) * sign
+        totals["expense"] += (row["expense"] or Decimal("0.00")) * sign
+        totals["income_count"] += row["income_count"] * sign
+        totals["expense_count"] += row["expense_count"] * sign
+
+
+def _iter_id_chunks(queryset, chunk_size):
+    # Keyset por id: o filtro inteiro nunca vira uma lista de ids em memoria.
+    last_id = 0
+    while True:
+        chunk_ids = list(queryset.filter(id__gt=last_id).order_by("id").values_list("id", flat=True)[:chunk_size])
+        if not chunk_ids:
+            return
+        yield chunk_ids
+        last_id = chunk_ids[-1]
+
+
+def _bulk_update_transactions(user, id_chunks, action, bank=None, transaction_date=None):
+    current_timestamp = timezone.now()
+    rollup = defaultdict(
+        lambda: {"income": Decimal("0.00"), "expense": Decimal("0.00"), "income_count": 0, "expense_count": 0}
+    )
+    affected_ids = []
+    with db_transaction.atomic():
+        if bank:
+            bank_names = dict(Bank.objects.filter(owner=user).values_list("id", "name"))
+            new_bank_text = fold_search_text(bank.name)
+        for chunk_ids in id_chunks:
+            chunk = Transaction.objects.filter(owner=user, id__in=chunk_ids)
+            if action == "change_bank":
+                chunk = chunk.exclude(bank=bank)
+            elif action == "change_date":
+                chunk = chunk.exclude(transaction_date=transaction_date)
+            rows = list(chunk.order_by().values_list("id", "bank_id"))
+            if not rows:
+                continue
+            chunk_ids = [transaction_id for transaction_id, _bank_id in rows]
+            chunk = Transaction.objects.filter(id__in=chunk_ids)
+            _add_transaction_rollup_totals(rollup, chunk, sign=-1)
+
+            if action == "delete":
+                SyncTombstone.objects.bulk_create(
+                    [
+                        SyncTombstone(
+                            owner_id=user.id,
+                            model_name=SyncTombstone.SyncModel.TRANSACTION,
+                            object_id=transaction_id,
+                        )
+                        for transaction_id in chunk_ids
+                    ]
+                )
+                # Rollup, tombstones e versao sao gravados em lote aqui; os signals por linha ficam de fora.
+                with bulk_write():
+                    chunk.delete()
+            elif action == "change_bank":
+                _add_transaction_rollup_totals(rollup, chunk, sign=1, bank_id=bank.id)
+                # O nome do banco e a ultima parte do search_text: troca so o sufixo, banco a banco.
+                ids_by_old_bank = defaultdict(list)
+                for transaction_id, old_bank_id in rows:
+                    ids_by_old_bank[old_bank_id].append(transaction_id)
+                for old_bank_id, bank_group_ids in ids_by_old_bank.items():
+                    bank_group = Transaction.objects.filter(id__in=bank_group_ids)
+                    old_bank_text = fold_search_text(bank_names.get(old_bank_id, ""))
+                    if old_bank_text and new_bank_text:
+                        bank_group.filter(search_text__endswith=old_bank_text).update(
+                            bank=bank,
+                            search_text=Concat(
+                                Left("search_text", Length("search_text") - len(old_bank_text)),
+                                Value(new_bank_text),
+                            ),
+                            updated_at=current_timestamp,
+                        )
+                    # Sem o sufixo esperado (texto vazio ou desatualizado) a linha e recalculada inteira.
+                    stale_ids = list(bank_group.exclude(bank=bank).values_list("id", flat=True))
+                    if stale_ids:
+                        stale_rows = Transaction.objects.filter(id__in=stale_ids)
+                        stale_rows.update(bank=bank, updated_at=current_timestamp)
+                        refresh_search_text_for(stale_rows.select_related("bank"))
+            else:
+                _add_transaction_rollup_totals(rollup, chunk, sign=1, month=transaction_date.replace(day=1))
+                chunk.update(transaction_date=transaction_date, updated_at=current_timestamp)
+            affected_ids.extend(chunk_ids)
+
+        for (bank_id, month), totals in rollup.items():
+            if any(totals.values()):
+                MonthlyBankBalance.objects.apply_delta(user.id, bank_id, month, **totals)
+        if affected_ids:
+            UserDataVersion.objects.bump(user.id)
+            db_transaction.on_commit(
+                lambda: live_update_broker.publish(
+                    user.id,
+                    {"type": "transaction", "action": f"bulk_{action}", "id": None},
+                )
+            )
+    return sorted(affected_ids)
+
+
+@login_required
 @require_POST
 def transaction_delete(request, transaction_id):
     transaction = get_object_or_404(Transaction, pk=transaction_id, owner=request.user)
@@ -950,6 +2890,124 @@ def transaction_delete(request, transaction_id):
     return JsonResponse({"ok": True, "deleted_id": deleted_id})
 
 
+@login_required
+@require_POST
+def transaction_bulk_action(request):
+    try:
+        payload = json.loads(request.body.decode("utf-8"))
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        payload = None
+    if not isinstance(payload, dict):
+        return JsonResponse({"ok": False, "errors": {"payload": ["Payload invalido."]}}, status=400)
+
+    action = payload.get("action")
+    if action not in {"delete", "change_bank", "change_date"}:
+        return JsonResponse({"ok": False, "errors": {"action": ["Acao invalida."]}}, status=400)
+
+    bank = None
+    transaction_date = None
+    if action == "change_bank":
+        try:
+            bank = Bank.objects.filter(id=int(payload.get("bank")), owner=request.user).first()
+        except (TypeError, ValueError):
+            bank = None
+        if bank is None:
+            return JsonResponse({"ok": False, "errors": {"bank": ["Banco nao encontrado."]}}, status=400)
+    elif action == "change_date":
+        raw_date = payload.get("transaction_date")
+        transaction_date = parse_date(raw_date) if isinstance(raw_date, str) else None
+        if not transaction_date:
+            return JsonResponse(
+                {"ok": False, "errors": {"transaction_date": ["Data invalida."]}},
+                status=400,
+            )
+
+    raw_filters = payload.get("filters")
+    if raw_filters is not None:
+        if not isinstance(raw_filters, dict):
+            return JsonResponse({"ok": False, "errors": {"filters": ["Filtros invalidos."]}}, status=400)
+        try:
+            filters = _parse_transaction_filters(
+                request.user,
+                {key: str(value) for key, value in raw_filters.items() if value is not None},
+            )
+        except ValueError as exc:
+            field, message = exc.args
+            return JsonResponse({"ok": False, "errors": {field: [message]}}, status=400)
+        targets = _filter_transactions(Transaction.objects.filter(owner=request.user), filters, timezone.localdate())
+        matched_count = targets.count()
+        # Selecao por filtro pode alcancar o historico inteiro: a tela manda quantas linhas
+        # mostrou na confirmacao e o lote so roda se o servidor encontrar a mesma quantidade.
+        expected_count = payload.get("expected_count")
+        if isinstance(expected_count, bool) or not isinstance(expected_count, int):
+            return JsonResponse(
+                {"ok": False, "errors": {"expected_count": ["Confirme a quantidade de transacoes afetadas."]}},
+                status=400,
+            )
+        if expected_count != matched_count:
+            return JsonResponse(
+                {
+                    "ok": False,
+                    "errors": {
+                        "expected_count": [
+                            f"O filtro agora corresponde a {matched_count} transacoes. Confira e tente novamente."
+                        ]
+                    },
+                    "matched_count": matched_count,
+                },
+                status=409,
+            )
+        id_chunks = _iter_id_chunks(targets, TRANSACTION_BULK_CHUNK_SIZE)
+    else:
+        raw_ids = payload.get("transaction_ids", [])
+        if not isinstance(raw_ids, list) or not raw_ids:
+            return JsonResponse(
+                {"ok": False, "errors": {"transaction_ids": ["Selecione ao menos uma transacao."]}},
+                status=400,
+            )
+        try:
+            transaction_ids = list(dict.fromkeys(int(raw_id) for raw_id in raw_ids))
+        except (TypeError, ValueError):
+            return JsonResponse(
+                {"ok": False, "errors": {"transaction_ids": ["Lista de transacoes invalida."]}},
+                status=400,
+            )
+        transaction_ids = _get_owned_ids(
+            Transaction,
+            request.user,
+            [transaction_id for transaction_id in transaction_ids if transaction_id > 0],
+            TRANSACTION_BULK_CHUNK_SIZE,
+        )
+        matched_count = len(transaction_ids)
+        id_chunks = (
+            transaction_ids[offset:offset + TRANSACTION_BULK_CHUNK_SIZE]
+            for offset in range(0, matched_count, TRANSACTION_BULK_CHUNK_SIZE)
+        )
+
+    if not matched_count:
+        return JsonResponse(
+            {"ok": False, "errors": {"transaction_ids": ["Nenhuma transacao encontrada para o usuario atual."]}},
+            status=404,
+        )
+
+    affected_ids = _bulk_update_transactions(
+        request.user,
+        id_chunks,
+        action,
+        bank=bank,
+        transaction_date=transaction_date,
+    )
+    return JsonResponse(
+        {
+            "ok": True,
+            "action": action,
+            "matched_count": matched_count,
+            "count": len(affected_ids),
+            "transaction_ids": affected_ids,
+        }
+    )
+
+
 @login_required
 @require_POST
 def payable_create(request):
@@ -1001,11 +3059,15 @@ def payable_delete(request, payable_id):
     payable = get_object_or_404(Payable, pk=payable_id, owner=request.user)
     if payable.payable_type == Payable.PayableType.INSTALLMENT and payable.installment_group:
         group_qs = Payable.objects.filter(installment_group=payable.installment_group, owner=request.user)
-        for installment in group_qs:
-            _delete_payable_receipt_file(installment)
-        deleted_ids = list(group_qs.values_list("id", flat=True))
-        deleted_group = str(payable.installment_group)
-        group_qs.delete()
+        with db_transaction.atomic():
+            _release_payable_receipts(
+                group_qs.exclude(payment_receipt="").exclude(payment_receipt__isnull=True).values_list(
+                    "payment_receipt", "receipt_id"
+                )
+            )
+            deleted_ids = list(group_qs.values_list("id", flat=True))
+            deleted_group = str(payable.installment_group)
+            group_qs.delete()
         return JsonResponse({"ok": True, "deleted_ids": deleted_ids, "deleted_group": deleted_group})
 
     _delete_payable_receipt_file(payable)
@@ -1052,7 +3114,7 @@ def payable_status_update(request, payable_id):
     else:
         _apply_payable_status(payable, status=status, clear_receipt=True)
 
-    payable.save(update_fields=["status", "payment_date", "payment_note", "payment_receipt", "updated_at"])
+    payable.save(update_fields=["status", "payment_date", "payment_note", "payment_receipt", "receipt", "updated_at"])
     _create_payable_history_entry(
         payable,
         before_snapshot=before_snapshot,
@@ -1092,7 +3154,8 @@ def payable_installment_bulk_update(request, payable_id):
         )
 
     installments = list(
-        Payable.objects.filter(
+        Payable.objects.select_related("bank", "category")
+        .filter(
             installment_group=reference_payable.installment_group,
             owner=request.user,
         )
@@ -1183,151 +3246,466 @@ def payable_installment_bulk_update(request, payable_id):
                 history_entries.append(history_entry)
 
     if changed_installments:
+        for payable in changed_installments:
+            payable.refresh_search_text()
         Payable.objects.bulk_update(
             changed_installments,
-            ["status", "payment_date", "payment_note", "payment_receipt", "updated_at"],
+            ["status", "payment_date", "payment_note", "payment_receipt", "receipt", "search_text", "updated_at"],
+        )
+    if history_entries:
+        PayableStatusHistory.objects.bulk_create(history_entries)
+    if changed_installments:
+        UserDataVersion.objects.bump(request.user.id)
+
+    refreshed_installments = (
+        Payable.objects.select_related("bank", "category")
+        .filter(installment_group=reference_payable.installment_group, owner=request.user)
+        .order_by("installment_number", "id")
+    )
+    return JsonResponse(
+        {
+            "ok": True,
+            "payables": [_serialize_payable(payable, request=request) for payable in refreshed_installments],
+            "group": str(reference_payable.installment_group),
+        }
+    )
+
+
+@login_required
+@require_POST
+def payable_installment_reschedule(request, payable_id):
+    reference_payable = get_object_or_404(Payable, pk=payable_id, owner=request.user)
+    if (
+        reference_payable.payable_type != Payable.PayableType.INSTALLMENT
+        or not reference_payable.installment_group
+    ):
+        return JsonResponse(
+            {
+                "ok": False,
+                "errors": {
+                    "installment": ["Conta selecionada nao pertence a um grupo de parcelamento."],
+                },
+            },
+            status=400,
         )
-    if history_entries:
-        PayableStatusHistory.objects.bulk_create(history_entries)
 
-    refreshed_installments = (
+    raw_start_date = request.POST.get("start_date")
+    start_date = _parse_optional_date(raw_start_date)
+    if raw_start_date and not start_date:
+        return JsonResponse({"ok": False, "errors": {"start_date": ["Data inicial invalida."]}}, status=400)
+
+    raw_count = request.POST.get("installment_count")
+    installment_count = None
+    if raw_count:
+        try:
+            installment_count = int(raw_count)
+        except (TypeError, ValueError):
+            installment_count = 0
+        if installment_count < 1 or installment_count > INSTALLMENT_RESCHEDULE_MAX_COUNT:
+            return JsonResponse(
+                {
+                    "ok": False,
+                    "errors": {
+                        "installment_count": [
+                            f"Informe entre 1 e {INSTALLMENT_RESCHEDULE_MAX_COUNT} parcelas restantes."
+                        ],
+                    },
+                },
+                status=400,
+            )
+
+    raw_amount = request.POST.get("amount")
+    total_amount = None
+    if raw_amount:
+        try:
+            total_amount = Decimal(raw_amount.replace(",", ".")).quantize(Decimal("0.01"))
+        except InvalidOperation:
+            total_amount = Decimal("0.00")
+        # quantize deixa NaN passar sem erro; valores acima do max_digits do campo so falhariam no banco.
+        if not total_amount.is_finite() or total_amount <= 0 or total_amount > PAYABLE_MAX_AMOUNT:
+            return JsonResponse({"ok": False, "errors": {"amount": ["Valor invalido."]}}, status=400)
+
+    # Uma consulta carrega o plano inteiro; o resto sao escritas em lote, sem depender do tamanho do plano.
+    installments = list(
         Payable.objects.select_related("bank", "category")
         .filter(installment_group=reference_payable.installment_group, owner=request.user)
         .order_by("installment_number", "id")
     )
+    paid_installments = [item for item in installments if item.status == Payable.PayableStatus.PAID]
+    pending_installments = [item for item in installments if item.status != Payable.PayableStatus.PAID]
+    if not pending_installments:
+        return JsonResponse(
+            {"ok": False, "errors": {"installment": ["Nao ha parcelas pendentes para renegociar."]}},
+            status=400,
+        )
+
+    installment_count = installment_count or len(pending_installments)
+    start_date = start_date or pending_installments[0].due_date
+    if total_amount is None:
+        total_amount = sum((item.amount for item in pending_installments), Decimal("0.00"))
+    if total_amount < Decimal("0.01") * installment_count:
+        return JsonResponse(
+            {"ok": False, "errors": {"amount": ["Valor insuficiente para o numero de parcelas."]}},
+            status=400,
+        )
+
+    current_timestamp = timezone.now()
+    installment_total = len(paid_installments) + installment_count
+    # Parcelas pagas ficam no inicio do plano; as restantes sao redistribuidas depois delas.
+    for installment_number, installment in enumerate(paid_installments, start=1):
+        installment.installment_number = installment_number
+        installment.installment_total = installment_total
+        installment.updated_at = current_timestamp
+
+    template = pending_installments[0]
+    kept_installments = pending_installments[:installment_count]
+    removed_installments = pending_installments[installment_count:]
+    created_installments = []
+    amounts = _split_installment_amounts(total_amount, installment_count)
+    for offset, installment_amount in enumerate(amounts):
+        if offset < len(kept_installments):
+            installment = kept_installments[offset]
+        else:
+            installment = Payable(
+                owner=request.user,
+                bank=template.bank,
+                category=template.category,
+                title=template.title,
+                description=template.description,
+                payable_type=Payable.PayableType.INSTALLMENT,
+                status=Payable.PayableStatus.PENDING,
+                installment_group=template.installment_group,
+                is_recurring=False,
+            )
+            installment.refresh_search_text()
+            created_installments.append(installment)
+        installment.amount = installment_amount
+        installment.due_date = _add_months(start_date, offset)
+        installment.installment_number = len(paid_installments) + offset + 1
+        installment.installment_total = installment_total
+        installment.updated_at = current_timestamp
+
+    removed_ids = [installment.id for installment in removed_installments]
+    with db_transaction.atomic():
+        Payable.objects.bulk_update(
+            paid_installments + kept_installments,
+            ["amount", "due_date", "installment_number", "installment_total", "updated_at"],
+        )
+        Payable.objects.bulk_create(created_installments)
+        if removed_ids:
+            SyncTombstone.objects.bulk_create(
+                [
+                    SyncTombstone(
+                        owner_id=request.user.id,
+                        model_name=SyncTombstone.SyncModel.PAYABLE,
+                        object_id=removed_id,
+                    )
+                    for removed_id in removed_ids
+                ]
+            )
+            # Tombstones, versao e aviso ao vivo saem em lote; o delete() cuida das cascatas.
+            with bulk_write():
+                Payable.objects.filter(id__in=removed_ids).delete()
+            _release_payable_receipts(
+                [
+                    (installment.payment_receipt.name, installment.receipt_id)
+                    for installment in removed_installments
+                    if installment.payment_receipt
+                ]
+            )
+
+        refreshed_installments = list(
+            Payable.objects.select_related("bank", "category")
+            .filter(installment_group=reference_payable.installment_group, owner=request.user)
+            .order_by("installment_number", "id")
+        )
+        # Reparcelar muda vencimento e valor, nao o status: o historico de status fica intacto.
+        UserDataVersion.objects.bump(request.user.id)
+        _publish_bulk_payable_update(request.user.id, "installment_reschedule")
+
     return JsonResponse(
         {
             "ok": True,
             "payables": [_serialize_payable(payable, request=request) for payable in refreshed_installments],
+            "deleted_ids": removed_ids,
             "group": str(reference_payable.installment_group),
         }
     )
 
 
+def _get_payable_bulk_filter_ids(user, filters, today):
+    # "Selecionar todos do filtro": as mesmas entidades da listagem, expandidas para todas as parcelas.
+    entities = _build_payable_entities_queryset(user, filters, today)
+    grouped_filter = _payable_grouped_installment_filter()
+    return list(
+        Payable.objects.filter(owner=user)
+        .filter(
+            (grouped_filter & Q(installment_group__in=entities.values("group_key")))
+            | (~grouped_filter & Q(id__in=entities.values("single_key")))
+        )
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+
+
+def _get_owned_ids(model, user, record_ids, chunk_size):
+    owned_ids = []
+    for offset in range(0, len(record_ids), chunk_size):
+        owned_ids.extend(
+            model.objects.filter(owner=user, id__in=record_ids[offset:offset + chunk_size])
+            .order_by()
+            .values_list("id", flat=True)
+        )
+    return sorted(owned_ids)
+
+
+def _delete_receipt_files_on_commit(receipt_names):
+    if not receipt_names:
+        return
+    storage = Payable._meta.get_field("payment_receipt").storage
+
+    def delete_files():
+        for name in receipt_names:
+            storage.delete(name)
+
+    # Arquivo so sai do disco se o banco confirmar; um rollback nao deixa conta sem comprovante.
+    db_transaction.on_commit(delete_files)
+
+
+def _publish_bulk_payable_update(owner_id, action):
+    db_transaction.on_commit(
+        lambda: live_update_broker.publish(owner_id, {"type": "payable", "action": action, "id": None})
+    )
+
+
+def _bulk_set_payable_status(user, payable_ids, action, payment_date=None, payment_note=""):
+    today = timezone.localdate()
+    current_timestamp = timezone.now()
+    if action == "mark_paid":
+        new_status = Payable.PayableStatus.PAID
+        payment_date = payment_date or today
+        unchanged_filter = Q(status=new_status, payment_date=payment_date, payment_note=payment_note)
+        changes = {"status": new_status, "payment_date": payment_date, "payment_note": payment_note}
+    else:
+        new_status = Payable.PayableStatus.PENDING
+        payment_date = None
+        payment_note = ""
+        unchanged_filter = Q(status=new_status, payment_date__isnull=True, payment_note="")
+        unchanged_filter &= Q(payment_receipt="") | Q(payment_receipt__isnull=True)
+        changes = {"status": new_status, "payment_date": None, "payment_note": "", "payment_receipt": "", "receipt": None}
+
+    updated_ids = []
+    receipt_rows = []
+    with db_transaction.atomic():
+        for offset in range(0, len(payable_ids), PAYABLE_BULK_CHUNK_SIZE):
+            rows = list(
+                Payable.objects.filter(owner=user, id__in=payable_ids[offset:offset + PAYABLE_BULK_CHUNK_SIZE])
+                .exclude(unchanged_filter)
+                .order_by()
+                .values("id", "status", "payment_date", "payment_note", "payment_receipt", "receipt_id")
+            )
+            if not rows:
+                continue
+            chunk_ids = [row["id"] for row in rows]
+            if new_status == Payable.PayableStatus.PENDING:
+                receipt_rows.extend(
+                    (row["payment_receipt"], row["receipt_id"]) for row in rows if row["payment_receipt"]
+                )
+            # Desvincular so o comprovante nao muda status, data nem observacao: fica fora do historico.
+            PayableStatusHistory.objects.bulk_create(
+                [
+                    PayableStatusHistory(
+                        payable_id=row["id"],
+                        previous_status=row["status"],
+                        new_status=new_status,
+                        previous_payment_date=row["payment_date"],
+                        new_payment_date=payment_date,
+                        previous_payment_note=row["payment_note"],
+                        new_payment_note=payment_note,
+                        source=f"bulk_{action}",
+                        changed_by=user,
+                    )
+                    for row in rows
+                    if (row["status"], row["payment_date"], row["payment_note"]) != (new_status, payment_date, payment_note)
+                ]
+            )
+            Payable.objects.filter(id__in=chunk_ids).update(**changes, updated_at=current_timestamp)
+            # A observacao do pagamento e a ultima parte do search_text. Sem observacao anterior basta
+            # concatenar a nova no proprio UPDATE; trocar ou apagar uma existente recalcula a linha.
+            appended_note_ids = [row["id"] for row in rows if not row["payment_note"] and payment_note]
+            if appended_note_ids:
+                folded_note = fold_search_text(payment_note)
+                Payable.objects.filter(id__in=appended_note_ids).update(
+                    search_text=Concat(
+                        "search_text",
+                        Case(
+                            When(search_text__endswith="\n", then=Value(folded_note)),
+                            default=Value(f" {folded_note}"),
+                        ),
+                    )
+                )
+            note_changed_ids = [
+                row["id"] for row in rows if row["payment_note"] and row["payment_note"] != payment_note
+            ]
+            if note_changed_ids:
+                refresh_search_text_for(Payable.objects.select_related("bank", "category").filter(id__in=note_changed_ids))
+            updated_ids.extend(chunk_ids)
+
+        if updated_ids:
+            UserDataVersion.objects.bump(user.id)
+            _publish_bulk_payable_update(user.id, "bulk_updated")
+        _release_payable_receipts(receipt_rows)
+    return sorted(updated_ids)
+
+
+def _bulk_delete_payables(user, payable_ids):
+    deleted_ids = []
+    receipt_rows = []
+    with db_transaction.atomic():
+        for offset in range(0, len(payable_ids), PAYABLE_BULK_CHUNK_SIZE):
+            chunk = Payable.objects.filter(owner=user, id__in=payable_ids[offset:offset + PAYABLE_BULK_CHUNK_SIZE])
+            rows = list(chunk.order_by().values_list("id", "payment_receipt", "receipt_id"))
+            if not rows:
+                continue
+            chunk_ids = [payable_id for payable_id, _receipt_name, _receipt_id in rows]
+            receipt_rows.extend(
+                (receipt_name, receipt_id) for _payable_id, receipt_name, receipt_id in rows if receipt_name
+            )
+            SyncTombstone.objects.bulk_create(
+                [
+                    SyncTombstone(owner_id=user.id, model_name=SyncTombstone.SyncModel.PAYABLE, object_id=payable_id)
+                    for payable_id in chunk_ids
+                ]
+            )
+            # O delete() cuida das cascatas (historico etc.); tombstones, versao e aviso ao vivo
+            # sao gravados em lote aqui, por isso os signals por linha ficam de fora.
+            with bulk_write():
+                Payable.objects.filter(id__in=chunk_ids).delete()
+            deleted_ids.extend(chunk_ids)
+
+        if deleted_ids:
+            UserDataVersion.objects.bump(user.id)
+            _publish_bulk_payable_update(user.id, "bulk_deleted")
+        _release_payable_receipts(receipt_rows)
+    return sorted(deleted_ids)
+
+
 @login_required
 @require_POST
 def payable_bulk_action(request):
     try:
         payload = json.loads(request.body.decode("utf-8"))
     except (json.JSONDecodeError, UnicodeDecodeError):
+        payload = None
+    if not isinstance(payload, dict):
         return JsonResponse(
             {"ok": False, "errors": {"payload": ["Payload invalido."]}},
             status=400,
         )
 
     action = payload.get("action")
-    payable_ids_raw = payload.get("payable_ids", [])
     if action not in {"mark_paid", "mark_pending", "delete"}:
         return JsonResponse(
             {"ok": False, "errors": {"action": ["Acao invalida."]}},
             status=400,
         )
-    if not isinstance(payable_ids_raw, list) or not payable_ids_raw:
-        return JsonResponse(
-            {"ok": False, "errors": {"payable_ids": ["Selecione ao menos uma conta."]}},
-            status=400,
-        )
 
-    payable_ids = []
-    for raw_id in payable_ids_raw:
+    payment_date = None
+    payment_note = ""
+    if action == "mark_paid":
+        raw_payment_date = payload.get("payment_date")
+        payment_date = _parse_optional_date(raw_payment_date) if isinstance(raw_payment_date, str) else None
+        if raw_payment_date and not payment_date:
+            return JsonResponse(
+                {"ok": False, "errors": {"payment_date": ["Data de pagamento invalida."]}},
+                status=400,
+            )
+        payment_note = _normalize_payment_note(payload.get("payment_note"))
+
+    raw_filters = payload.get("filters")
+    if raw_filters is not None:
+        if not isinstance(raw_filters, dict):
+            return JsonResponse(
+                {"ok": False, "errors": {"filters": ["Filtros invalidos."]}},
+                status=400,
+            )
+        try:
+            filters = _parse_payable_filters(
+                request.user,
+                {key: str(value) for key, value in raw_filters.items() if value is not None},
+            )
+        except ValueError as exc:
+            field, message = exc.args
+            return JsonResponse({"ok": False, "errors": {field: [message]}}, status=400)
+        target_ids = _get_payable_bulk_filter_ids(request.user, filters, timezone.localdate())
+        if not target_ids:
+            return JsonResponse(
+                {"ok": False, "errors": {"filters": ["Nenhuma conta encontrada para o filtro atual."]}},
+                status=404,
+            )
+    else:
+        payable_ids_raw = payload.get("payable_ids", [])
+        if not isinstance(payable_ids_raw, list) or not payable_ids_raw:
+            return JsonResponse(
+                {"ok": False, "errors": {"payable_ids": ["Selecione ao menos uma conta."]}},
+                status=400,
+            )
         try:
-            parsed_id = int(raw_id)
+            payable_ids = list(dict.fromkeys(int(raw_id) for raw_id in payable_ids_raw))
         except (TypeError, ValueError):
             return JsonResponse(
                 {"ok": False, "errors": {"payable_ids": ["Lista de contas invalida."]}},
                 status=400,
             )
-        if parsed_id > 0 and parsed_id not in payable_ids:
-            payable_ids.append(parsed_id)
-
-    if not payable_ids:
-        return JsonResponse(
-            {"ok": False, "errors": {"payable_ids": ["Selecione ao menos uma conta valida."]}},
-            status=400,
-        )
-
-    target_payables = list(
-        Payable.objects.select_related("bank", "category")
-        .filter(owner=request.user, id__in=payable_ids)
-        .order_by("due_date", "id")
-    )
-    if not target_payables:
-        return JsonResponse(
-            {"ok": False, "errors": {"payable_ids": ["Nenhuma conta encontrada para o usuario atual."]}},
-            status=404,
-        )
-
-    if action == "delete":
-        deleted_ids = [payable.id for payable in target_payables]
-        with db_transaction.atomic():
-            for payable in target_payables:
-                _delete_payable_receipt_file(payable)
-            Payable.objects.filter(owner=request.user, id__in=deleted_ids).delete()
-        return JsonResponse({"ok": True, "action": action, "deleted_ids": deleted_ids})
-
-    raw_payment_date = payload.get("payment_date")
-    payment_date = _parse_optional_date(raw_payment_date)
-    if raw_payment_date and not payment_date:
-        return JsonResponse(
-            {"ok": False, "errors": {"payment_date": ["Data de pagamento invalida."]}},
-            status=400,
-        )
-    payment_note = _normalize_payment_note(payload.get("payment_note"))
-
-    current_timestamp = timezone.now()
-    updated_payables = []
-    history_entries = []
-    with db_transaction.atomic():
-        for payable in target_payables:
-            before_snapshot = _snapshot_payable_status(payable)
-            if action == "mark_paid":
-                _apply_payable_status(
-                    payable,
-                    status=Payable.PayableStatus.PAID,
-                    payment_date=payment_date or timezone.localdate(),
-                    payment_note=payment_note,
-                )
-            else:
-                _apply_payable_status(
-                    payable,
-                    status=Payable.PayableStatus.PENDING,
-                    clear_receipt=True,
-                )
-            payable.updated_at = current_timestamp
-            updated_payables.append(payable)
-            history_entry = _build_payable_history_entry(
-                payable,
-                before_snapshot=before_snapshot,
-                changed_by=request.user,
-                source=f"bulk_{action}",
+        payable_ids = [payable_id for payable_id in payable_ids if payable_id > 0]
+        if not payable_ids:
+            return JsonResponse(
+                {"ok": False, "errors": {"payable_ids": ["Selecione ao menos uma conta valida."]}},
+                status=400,
+            )
+        target_ids = _get_owned_ids(Payable, request.user, payable_ids, PAYABLE_BULK_CHUNK_SIZE)
+        if not target_ids:
+            return JsonResponse(
+                {"ok": False, "errors": {"payable_ids": ["Nenhuma conta encontrada para o usuario atual."]}},
+                status=404,
             )
-            if history_entry:
-                history_entries.append(history_entry)
 
-        Payable.objects.bulk_update(
-            updated_payables,
-            ["status", "payment_date", "payment_note", "payment_receipt", "updated_at"],
-        )
-        if history_entries:
-            PayableStatusHistory.objects.bulk_create(history_entries)
+    if action == "delete":
+        deleted_ids = _bulk_delete_payables(request.user, target_ids)
+        return JsonResponse({"ok": True, "action": action, "count": len(deleted_ids), "deleted_ids": deleted_ids})
 
-    refreshed_payables = (
-        Payable.objects.select_related("bank", "category")
-        .filter(owner=request.user, id__in=[payable.id for payable in updated_payables])
-        .order_by("due_date", "id")
+    updated_ids = _bulk_set_payable_status(
+        request.user,
+        target_ids,
+        action,
+        payment_date=payment_date,
+        payment_note=payment_note,
     )
+    # Resposta compacta: a tela busca os registros alterados pelo /api/sync/.
     return JsonResponse(
         {
             "ok": True,
             "action": action,
-            "payables": [_serialize_payable(payable, request=request) for payable in refreshed_payables],
+            "count": len(updated_ids),
+            "matched_count": len(target_ids),
+            "updated_ids": updated_ids,
         }
     )
 
 
+@csrf_exempt
 @login_required
 @require_POST
 def payable_receipt_upload(request, payable_id):
+    # O handler de hash precisa entrar antes de o corpo ser lido; por isso o CSRF
+    # e verificado depois, no _payable_receipt_upload.
+    hashing_handler = HashingUploadHandler(request)
+    request.upload_handlers.insert(0, hashing_handler)
+    return _payable_receipt_upload(request, payable_id, hashing_handler)
+
+
+@csrf_protect
+def _payable_receipt_upload(request, payable_id, hashing_handler):
     payable = get_object_or_404(Payable, pk=payable_id, owner=request.user)
     if payable.status != Payable.PayableStatus.PAID:
         return JsonResponse(
@@ -1359,11 +3737,19 @@ def payable_receipt_upload(request, payable_id):
             status=400,
         )
 
-    if payable.payment_receipt:
-        _delete_payable_receipt_file(payable)
+    digest = hashing_handler.digests.get("receipt") or _hash_uploaded_file(uploaded_receipt)
+    if payable.receipt_id and payable.receipt.sha256 == digest:
+        # Mesmo arquivo de novo: a conta ja aponta para esse blob.
+        return JsonResponse({"ok": True, "payable": _serialize_payable(payable, request=request)})
 
-    payable.payment_receipt = uploaded_receipt
-    payable.save(update_fields=["payment_receipt", "updated_at"])
+    with db_transaction.atomic():
+        receipt = _acquire_receipt_blob(request.user, uploaded_receipt, digest)
+        if payable.payment_receipt:
+            _delete_payable_receipt_file(payable)
+
+        payable.receipt = receipt
+        payable.payment_receipt = receipt.file.name
+        payable.save(update_fields=["payment_receipt", "receipt", "updated_at"])
     return JsonResponse({"ok": True, "payable": _serialize_payable(payable, request=request)})
 
 
@@ -1378,32 +3764,158 @@ def payable_receipt_delete(request, payable_id):
         )
 
     _delete_payable_receipt_file(payable)
-    payable.save(update_fields=["payment_receipt", "updated_at"])
+    payable.save(update_fields=["payment_receipt", "receipt", "updated_at"])
     return JsonResponse({"ok": True, "payable": _serialize_payable(payable, request=request)})
 
 
+def _receipt_version(receipt_name):
+    # O nome ja identifica o conteudo: blobs novos ficam no diretorio do proprio sha256 e
+    # os arquivos legados nunca sao regravados com o mesmo nome.
+    return hashlib.sha1(receipt_name.encode("utf-8")).hexdigest()[:16]
+
+
+def _parse_byte_range(range_header, file_size):
+    # Um unico intervalo; cabecalho invalido ou com varios intervalos devolve None (resposta completa).
+    unit, _separator, ranges = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+    raw_start, separator, raw_end = ranges.strip().partition("-")
+    if not separator:
+        return None
+    try:
+        if raw_start:
+            start = int(raw_start)
+            end = int(raw_end) if raw_end else file_size - 1
+        else:
+            suffix_length = int(raw_end)
+            start = max(0, file_size - suffix_length)
+            end = file_size - 1 if suffix_length else -1
+    except ValueError:
+        return None
+    if raw_start and raw_end and end < start:
+        return None
+    if start >= file_size or end < start:
+        raise ValueError("range", "Intervalo fora do arquivo.")
+    return start, min(end, file_size - 1)
+
+
+def _if_range_matches(request, etag, last_modified):
+    if_range = request.headers.get("If-Range")
+    if not if_range:
+        return True
+    if if_range.startswith(('"', "W/")):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def _iter_file_range(receipt_file, start, end):
+    remaining = end - start + 1
+    with receipt_file.open("rb") as stream:
+        stream.seek(start)
+        while remaining > 0:
+            chunk = stream.read(min(RECEIPT_STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _build_receipt_response(request, receipt_file, file_size, etag, last_modified):
+    file_name = os.path.basename(receipt_file.name)
+    content_type = mimetypes.guess_type(file_name)[0] or "application/octet-stream"
+    sendfile_mode = getattr(settings, "RECEIPT_SENDFILE_MODE", "")
+    if sendfile_mode in ("x-accel-redirect", "x-sendfile"):
+        # O dono ja foi conferido; bytes, Range e If-Range ficam com o servidor web.
+        response = HttpResponse(content_type=content_type)
+        if sendfile_mode == "x-accel-redirect":
+            prefix = getattr(settings, "RECEIPT_SENDFILE_PREFIX", "/protected-media/").rstrip("/")
+            response["X-Accel-Redirect"] = f"{prefix}/{quote(receipt_file.name)}"
+        else:
+            response["X-Sendfile"] = receipt_file.path
+    else:
+        byte_range = None
+        range_header = request.headers.get("Range")
+        if range_header and _if_range_matches(request, etag, last_modified):
+            try:
+                byte_range = _parse_byte_range(range_header, file_size)
+            except ValueError:
+                response = HttpResponse(status=416)
+                response["Content-Range"] = f"bytes */{file_size}"
+                return response
+        if byte_range is None:
+            response = FileResponse(receipt_file.open("rb"), content_type=content_type)
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                _iter_file_range(receipt_file, start, end),
+                status=206,
+                content_type=content_type,
+            )
+            response["Content-Length"] = str(end - start + 1)
+            response["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+        response["Accept-Ranges"] = "bytes"
+    response["Content-Disposition"] = content_disposition_header(False, file_name)
+    return response
+
+
 @login_required
 def payable_receipt_view(request, payable_id):
     payable = get_object_or_404(Payable, pk=payable_id, owner=request.user)
     if not payable.payment_receipt:
         raise Http404("Comprovante nao encontrado.")
 
-    file_path = payable.payment_receipt.path
-    if not os.path.exists(file_path):
+    receipt_file = payable.payment_receipt
+    try:
+        file_size = receipt_file.storage.size(receipt_file.name)
+        last_modified = int(receipt_file.storage.get_modified_time(receipt_file.name).timestamp())
+    except OSError:
         raise Http404("Comprovante nao encontrado.")
 
-    content_type, _encoding = mimetypes.guess_type(file_path)
-    response = FileResponse(
-        payable.payment_receipt.open("rb"),
-        as_attachment=False,
-        filename=os.path.basename(file_path),
-    )
-    if content_type:
-        response["Content-Type"] = content_type
+    version = _receipt_version(receipt_file.name)
+    etag = f'"{version}"'
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = _build_receipt_response(request, receipt_file, file_size, etag, last_modified)
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    # A URL com ?v= muda junto com o arquivo, entao pode ficar em cache no navegador
+    # por muito tempo; sem ela o navegador revalida pelo ETag.
+    if request.GET.get("v") == version:
+        patch_cache_control(response, private=True, max_age=RECEIPT_CACHE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, private=True, no_cache=True)
     return response
 
 
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_user_data_etag, last_modified_func=_user_data_last_modified)
+def payable_installment_list(request, payable_id):
+    payable = get_object_or_404(
+        Payable.objects.select_related("bank", "category"),
+        pk=payable_id,
+        owner=request.user,
+    )
+    if payable.payable_type == Payable.PayableType.INSTALLMENT and payable.installment_group:
+        installments = (
+            Payable.objects.select_related("bank", "category")
+            .filter(owner=request.user, installment_group=payable.installment_group)
+            .order_by("installment_number", "id")
+        )
+    else:
+        installments = [payable]
+    return JsonResponse(
+        {
+            "ok": True,
+            "payable_id": payable.id,
+            "payables": [_serialize_payable(item, request=request) for item in installments],
+        }
+    )
+
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_user_data_etag, last_modified_func=_user_data_last_modified)
 def payable_history_list(request, payable_id):
     payable = get_object_or_404(Payable, pk=payable_id, owner=request.user)
     history = list(
@@ -1422,69 +3934,82 @@ def payable_history_list(request, payable_id):
 
 @login_required
 def report_export(request):
-    report_type = request.GET.get("report_type", "cashflow")
-    report_format = request.GET.get("format", "csv")
-    bank_param = request.GET.get("bank", "all")
-    detail_level = request.GET.get("detail_level", "both")
-    start_param = request.GET.get("start_date", "")
-    end_param = request.GET.get("end_date", "")
-
-    if report_type not in {"cashflow", "payables"}:
-        return JsonResponse(
-            {"ok": False, "errors": {"report_type": ["Tipo de relatorio invalido."]}},
-            status=400,
-        )
-    if report_format not in {"csv", "excel", "pdf"}:
-        return JsonResponse(
-            {"ok": False, "errors": {"format": ["Formato de exportacao invalido."]}},
-            status=400,
-        )
-    if detail_level not in {"consolidated", "detailed", "both"}:
-        return JsonResponse(
-            {"ok": False, "errors": {"detail_level": ["Nivel de detalhamento invalido."]}},
-            status=400,
-        )
-
     try:
-        selected_bank = _get_report_bank(request.user, bank_param)
-        start_date, end_date = _parse_report_period(start_param, end_param)
+        report_params = _parse_report_request(request.user, request.GET)
     except ValueError as exc:
-        field = "bank"
-        message = str(exc)
-        if "Data inicial" in message:
-            field = "start_date"
-        elif "Data final" in message or "Data inicial nao pode" in message:
-            field = "end_date"
+        field, message = exc.args
         return JsonResponse({"ok": False, "errors": {field: [message]}}, status=400)
 
+    file_name = _get_report_file_name(
+        report_params["report_type"],
+        report_params["report_format"],
+        report_params["bank"],
+        report_params["start_date"],
+        report_params["end_date"],
+        report_params["detail_level"],
+    )
+    content_type = REPORT_CONTENT_TYPES[report_params["report_format"]]
+    data_version = UserDataVersion.objects.get_version(request.user.id)
+    cache_key = _get_report_cache_key(request.user, report_params, data_version)
+    cached_content = caches[REPORT_CACHE_ALIAS].get(cache_key)
+    if cached_content is not None:
+        response = HttpResponse(cached_content, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{file_name}"'
+        return response
+
     title, headers, rows, summary = _build_report_dataset(
-        report_type,
+        report_params["report_type"],
         request.user,
-        selected_bank,
-        start_date,
-        end_date,
-        detail_level,
+        report_params["bank"],
+        report_params["start_date"],
+        report_params["end_date"],
+        report_params["detail_level"],
     )
-    file_name = _get_report_file_name(
-        report_type,
-        report_format,
-        selected_bank,
-        start_date,
-        end_date,
-        detail_level,
+    response = StreamingHttpResponse(
+        _iter_and_cache_report_content(
+            _iter_report_content(report_params["report_format"], title, headers, rows, summary),
+            cache_key,
+            request.user.id,
+            data_version,
+        ),
+        content_type=content_type,
     )
+    response["Content-Disposition"] = f'attachment; filename="{file_name}"'
+    return response
 
-    if report_format == "csv":
-        content = _build_csv_content(title, headers, rows, summary)
-        response = HttpResponse(content, content_type="text/csv; charset=utf-8")
-    elif report_format == "excel":
-        content = _build_excel_content(title, headers, rows, summary)
-        response = HttpResponse(content, content_type="application/vnd.ms-excel")
-    else:
-        content = _build_pdf_content(title, headers, rows, summary)
-        response = HttpResponse(content, content_type="application/pdf")
 
-    response["Content-Disposition"] = f'attachment; filename="{file_name}"'
+@login_required
+@require_POST
+def report_job_create(request):
+    try:
+        report_params = _parse_report_request(request.user, request.POST)
+    except ValueError as exc:
+        field, message = exc.args
+        return JsonResponse({"ok": False, "errors": {field: [message]}}, status=400)
+
+    job, created = _get_or_create_report_job(request.user, report_params)
+    return JsonResponse(
+        {"ok": True, "deduplicated": not created, "job": _serialize_report_job(job)},
+        status=202,
+    )
+
+
+@login_required
+def report_job_detail(request, job_id):
+    job = get_object_or_404(ReportJob, pk=job_id, owner=request.user)
+    return JsonResponse({"ok": True, "job": _serialize_report_job(job)})
+
+
+@login_required
+def report_job_download(request, job_id):
+    job = get_object_or_404(ReportJob, pk=job_id, owner=request.user)
+    if job.status != ReportJob.ReportJobStatus.DONE or not job.file:
+        raise Http404("Relatorio ainda nao esta disponivel.")
+    if not job.file.storage.exists(job.file.name):
+        raise Http404("Relatorio nao encontrado.")
+
+    response = FileResponse(job.file.open("rb"), as_attachment=True, filename=job.file_name)
+    response["Content-Type"] = REPORT_CONTENT_TYPES.get(job.report_format, "application/octet-stream")
     return response
 
 
@@ -1575,8 +4100,61 @@ def _normalize_status(status_value):
     return status_value if status_value in valid_status else Event.EventStatus.PENDING
 
 
+def _read_json_chunk(text_file, buffer, position):
+    chunk = text_file.read(EVENT_IMPORT_READ_CHUNK_SIZE)
+    return buffer[position:] + chunk, 0, not chunk
+
+
+class _EventImportError(Exception):
+    pass
+
+
+def _iter_json_array_items(text_file):
+    # Decodifica a lista item a item com raw_decode sobre um buffer de blocos, sem carregar o arquivo todo.
+    decoder = json.JSONDecoder()
+    buffer, position, eof = "", 0, False
+    state = "start"
+    while True:
+        position = JSON_WHITESPACE_PATTERN.match(buffer, position).end()
+        if position == len(buffer) and not eof:
+            buffer, position, eof = _read_json_chunk(text_file, buffer, position)
+            continue
+        if state == "start":
+            if position == len(buffer) or buffer[position] != "[":
+                raise _EventImportError("Formato inválido. Esperado uma lista de objetos.")
+            position += 1
+            state = "first_item"
+            continue
+        if position == len(buffer):
+            raise _EventImportError("Arquivo JSON inválido.")
+
+        char = buffer[position]
+        if state == "separator" or (state == "first_item" and char == "]"):
+            if char == "]":
+                return
+            if char != ",":
+                raise _EventImportError("Arquivo JSON inválido.")
+            position += 1
+            state = "item"
+            continue
+
+        try:
+            item, item_end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as exc:
+            if eof:
+                raise _EventImportError("Arquivo JSON inválido.") from exc
+            buffer, position, eof = _read_json_chunk(text_file, buffer, position)
+            continue
+        if item_end == len(buffer) and not eof:
+            # Um numero no fim do bloco pode continuar no proximo.
+            buffer, position, eof = _read_json_chunk(text_file, buffer, position)
+            continue
+        yield item
+        position = item_end
+        state = "separator"
+
+
 @login_required
-@transaction.atomic
 def import_events_json(request):
     if request.method == "GET":
         return render(request, "events/import_events.html")
@@ -1590,65 +4168,94 @@ def import_events_json(request):
         messages.error(request, "Envie um arquivo JSON.")
         return redirect("import_events_json")
 
-    try:
-        payload = json.load(json_file)
-    except json.JSONDecodeError:
-        if is_ajax:
-            return JsonResponse({"message": "Arquivo JSON inválido.", "errors": []}, status=400)
-        messages.error(request, "Arquivo JSON inválido.")
-        return redirect("import_events_json")
-
-    if not isinstance(payload, list):
-        if is_ajax:
-            return JsonResponse({"message": "Formato inválido. Esperado uma lista de objetos.", "errors": []}, status=400)
-        messages.error(request, "Formato inválido. Esperado uma lista de objetos.")
-        return redirect("import_events_json")
-
     imported = 0
     skipped = 0
     errors = []
+    batch = []
 
-    for idx, item in enumerate(payload, start=1):
-        try:
-            fields = item.get("fields", {}) if isinstance(item, dict) else {}
-
-            title = (fields.get("title") or "").strip()
-            if not title:
-                skipped += 1
-                errors.append(f"Item {idx}: título vazio.")
-                continue
-
-            starts_at = _parse_event_datetime(fields.get("event_date"))
+    def add_error(message):
+        nonlocal skipped
+        skipped += 1
+        if len(errors) < EVENT_IMPORT_MAX_ERRORS:
+            errors.append(message)
 
-            event = Event(
-                owner=request.user,
-                title=title[:140],
-                creator_name=(fields.get("creator_name") or "").strip()[:120],
-                starts_at=starts_at,
-                description=(fields.get("description") or "").strip()[:500],
-                color=(fields.get("color") or "#4F46E5")[:7],
-                status=_normalize_status(fields.get("status")),
-                importance=Event.EventImportance.MEDIUM,
-                reminder_minutes_before=60,
-                all_day=False,
-                location="",
-                ends_at=None,
-            )
+    text_file = io.TextIOWrapper(json_file.file, encoding="utf-8-sig")
+    try:
+        with transaction.atomic():
+            for idx, item in enumerate(_iter_json_array_items(text_file), start=1):
+                try:
+                    fields = item.get("fields", {}) if isinstance(item, dict) else {}
+
+                    title = (fields.get("title") or "").strip()
+                    if not title:
+                        add_error(f"Item {idx}: título vazio.")
+                        continue
+
+                    starts_at = _parse_event_datetime(fields.get("event_date"))
+
+                    event = Event(
+                        owner=request.user,
+                        title=title[:140],
+                        creator_name=(fields.get("creator_name") or "").strip()[:120],
+                        starts_at=starts_at,
+                        description=(fields.get("description") or "").strip()[:500],
+                        color=(fields.get("color") or "#4F46E5")[:7],
+                        status=_normalize_status(fields.get("status")),
+                        importance=Event.EventImportance.MEDIUM,
+                        reminder_minutes_before=60,
+                        all_day=False,
+                        location="",
+                        ends_at=None,
+                    )
 
-            event.full_clean()
-            event.save()
+                    # owner e o proprio usuario e Event nao tem unique nem constraints:
+                    # pular essas validacoes evita uma consulta por item.
+                    event.full_clean(exclude=["owner"], validate_unique=False, validate_constraints=False)
+                    # bulk_create nao passa pelo save(), que e quem calcula o remind_at.
+                    event.sync_remind_at()
+                    batch.append(event)
+
+                except ValidationError as e:
+                    if hasattr(e, "message_dict"):
+                        add_error(f"Item {idx}: erro de validação -> {e.message_dict}")
+                    else:
+                        add_error(f"Item {idx}: erro de validação -> {e.messages}")
+                    continue
+                except Exception as e:
+                    add_error(f"Item {idx}: erro inesperado -> {str(e)}")
+                    continue
 
-            imported += 1
+                if len(batch) >= EVENT_IMPORT_BATCH_SIZE:
+                    Event.objects.bulk_create(batch)
+                    imported += len(batch)
+                    batch = []
+
+            if batch:
+                Event.objects.bulk_create(batch)
+                imported += len(batch)
+            if imported:
+                # bulk_create nao dispara signals: invalida caches/ETags e avisa as telas abertas aqui.
+                UserDataVersion.objects.bump(request.user.id)
+                transaction.on_commit(
+                    lambda: live_update_broker.publish(
+                        request.user.id,
+                        {"type": "event", "action": "imported", "id": None},
+                    )
+                )
+    except UnicodeDecodeError:
+        error_message = "Arquivo JSON inválido."
+    except _EventImportError as exc:
+        error_message = str(exc)
+    else:
+        error_message = None
+    finally:
+        text_file.detach()
 
-        except ValidationError as e:
-            skipped += 1
-            if hasattr(e, "message_dict"):
-                errors.append(f"Item {idx}: erro de validação -> {e.message_dict}")
-            else:
-                errors.append(f"Item {idx}: erro de validação -> {e.messages}")
-        except Exception as e:
-            skipped += 1
-            errors.append(f"Item {idx}: erro inesperado -> {str(e)}")
+    if error_message:
+        if is_ajax:
+            return JsonResponse({"message": error_message, "errors": []}, status=400)
+        messages.error(request, error_message)
+        return redirect("import_events_json")
 
     success_message = f"Importação concluída. Importados: {imported} | Ignorados: {skipped}"
 
@@ -1658,9 +4265,10 @@ def import_events_json(request):
             "message": success_message,
             "imported": imported,
             "skipped": skipped,
-            "errors": errors[:100],
+            "errors": errors,
+            "error_count": skipped,
         }, status=200)
 
     messages.success(request, success_message)
-    request.session["import_events_errors"] = errors[:100]
-    return redirect("import_events_json")
\ No newline at end of file
+    request.session["import_events_errors"] = errors
+    return redirect("import_events_json")
@@ -7,6 +7,33 @@ let payables = initialData.payables || [];
 let banks = initialData.banks || [];
 let events = initialData.events || [];
 let payableCategories = initialData.categories || [];
+let transactionsPaginated = Boolean(initialData.transactions_paginated);
+let syncToken = initialData.sync_token || "";
+let syncInFlight = false;
+let syncPending = false;
+let syncDebounceId = null;
+let transactionPage = initialData.transactions_page || {
+    next_cursor: null,
+    has_more: false,
+    summary: initialData.transaction_summary || null,
+    bank_transaction_counts: {},
+};
+let transactionRequestId = 0;
+let transactionSummaryRequestId = 0;
+let transactionSummaryDebounceId = null;
+let payablesPaginated = Boolean(initialData.payables_paginated);
+let payablePage = initialData.payables_page || {
+    entities: [],
+    next_cursor: null,
+    has_more: false,
+    summary: null,
+    usage: null,
+};
+let payableRequestId = 0;
+let payableReloadDebounceId = null;
+const payableCalendarCache = new Map();
+let payableCalendarLoadingMonth = "";
+let transactionSearchDebounceId = null;
 let activeBankFilter = "all";
 let transactionSearchQuery = "";
 let transactionTypeFilter = "all";
@@ -97,6 +124,13 @@ const transactionSearchInput = document.getElementById("transactionSearchInput")
 const transactionTypeFilterSelect = document.getElementById("transactionTypeFilter");
 const transactionPeriodFilterSelect = document.getElementById("transactionPeriodFilter");
 const clearTransactionFiltersBtn = document.getElementById("clearTransactionFilters");
+const transactionBulkActionField = document.getElementById("transactionBulkActionField");
+const transactionBulkBankWrap = document.getElementById("transactionBulkBankWrap");
+const transactionBulkBankField = document.getElementById("transactionBulkBankField");
+const transactionBulkDateWrap = document.getElementById("transactionBulkDateWrap");
+const transactionBulkDateField = document.getElementById("transactionBulkDateField");
+const applyTransactionBulkActionBtn = document.getElementById("applyTransactionBulkActionBtn");
+const transactionBulkActionError = document.getElementById("transactionBulkActionError");
 const summaryEventTotal = document.getElementById("summaryEventTotal");
 const summaryEventPending = document.getElementById("summaryEventPending");
 const summaryEventCompleted = document.getElementById("summaryEventCompleted");
@@ -210,10 +244,12 @@ const payablePaymentNoteField = document.getElementById("payablePaymentNoteField
 const payableInstallmentNumberField = document.getElementById("payableInstallmentNumberField");
 const payableInstallmentTotalField = document.getElementById("payableInstallmentTotalField");
 const payableRecurringField = document.getElementById("payableRecurringField");
+const payableRecurrencePeriodField = document.getElementById("payableRecurrencePeriodField");
 const payableDescriptionField = document.getElementById("payableDescriptionField");
 const installmentFields = document.getElementById("installmentFields");
 const installmentAmountPreview = document.getElementById("installmentAmountPreview");
 const recurringFieldRow = document.getElementById("recurringFieldRow");
+const recurrencePeriodRow = document.getElementById("recurrencePeriodRow");
 const payableFormError = document.getElementById("payableFormError");
 const openPayableModalBtn = document.getElementById("openPayableModal");
 const confirmPayableDeleteBtn = document.getElementById("confirmPayableDeleteBtn");
@@ -226,6 +262,10 @@ const installmentBulkUntilSelect = document.getElementById("installmentBulkUntil
 const installmentPayUntilBtn = document.getElementById("installmentPayUntilBtn");
 const installmentPayAllBtn = document.getElementById("installmentPayAllBtn");
 const installmentReopenAllBtn = document.getElementById("installmentReopenAllBtn");
+const installmentRescheduleStartField = document.getElementById("installmentRescheduleStart");
+const installmentRescheduleCountField = document.getElementById("installmentRescheduleCount");
+const installmentRescheduleAmountField = document.getElementById("installmentRescheduleAmount");
+const installmentRescheduleBtn = document.getElementById("installmentRescheduleBtn");
 const installmentBulkError = document.getElementById("installmentBulkError");
 const receiptPromptModal = document.getElementById("receiptPromptModal");
 const receiptPromptMessage = document.getElementById("receiptPromptMessage");
@@ -1106,6 +1146,9 @@ const buildPayableSearchBlob = (payable) => {
 };
 
 const getFilteredTransactions = () => {
+    if (transactionsPaginated) {
+        return transactions;
+    }
     return transactions.filter((transaction) => {
         if (activeBankFilter !== "all" && String(transaction.bank.id) !== activeBankFilter) {
             return false;
@@ -1223,6 +1266,124 @@ const renderReportBankOptions = () => {
     reportBankFilterSelect.value = isValidCurrent ? currentValue : "all";
 };
 
+const renderTransactionBulkBankOptions = () => {
+    if (!transactionBulkBankField) {
+        return;
+    }
+    const currentValue = transactionBulkBankField.value;
+    transactionBulkBankField.innerHTML = banks
+        .map((bank) => `<option value="${bank.id}">${bank.name}</option>`)
+        .join("");
+    if (banks.some((bank) => String(bank.id) === currentValue)) {
+        transactionBulkBankField.value = currentValue;
+    }
+};
+
+const syncTransactionBulkActionFields = () => {
+    if (!transactionBulkActionField) {
+        return;
+    }
+    const action = transactionBulkActionField.value || "delete";
+    if (transactionBulkBankWrap) {
+        transactionBulkBankWrap.classList.toggle("is-hidden", action !== "change_bank");
+    }
+    if (transactionBulkDateWrap) {
+        transactionBulkDateWrap.classList.toggle("is-hidden", action !== "change_date");
+    }
+};
+
+const submitTransactionBulkAction = async () => {
+    if (!bodyData.transactionBulkActionUrl || !transactionBulkActionField) {
+        return;
+    }
+    if (transactionBulkActionError) {
+        transactionBulkActionError.textContent = "";
+    }
+
+    const action = transactionBulkActionField.value || "delete";
+    const payload = { action };
+    // Com paginacao a tela so conhece a primeira pagina: o servidor aplica o mesmo filtro e
+    // confere a quantidade que o resumo mostrou antes de mexer em qualquer linha.
+    if (transactionsPaginated) {
+        payload.filters = Object.fromEntries(buildTransactionListParams().entries());
+        payload.expected_count = transactionPage.summary?.count || 0;
+    } else {
+        payload.transaction_ids = getFilteredTransactions().map((transaction) => transaction.id);
+    }
+    const matchedCount = transactionsPaginated ? payload.expected_count : payload.transaction_ids.length;
+    if (!matchedCount) {
+        if (transactionBulkActionError) {
+            transactionBulkActionError.textContent = "Nenhuma transacao no resultado filtrado.";
+        }
+        return;
+    }
+    if (action === "change_bank") {
+        payload.bank = transactionBulkBankField?.value || "";
+    } else if (action === "change_date") {
+        payload.transaction_date = transactionBulkDateField?.value || "";
+    } else if (
+        !window.confirm(
+            `Deseja excluir ${matchedCount} transacoes da lista filtrada? Essa acao nao pode ser desfeita.`
+        )
+    ) {
+        return;
+    }
+
+    if (applyTransactionBulkActionBtn) {
+        applyTransactionBulkActionBtn.disabled = true;
+    }
+    try {
+        const response = await fetch(bodyData.transactionBulkActionUrl, {
+            method: "POST",
+            headers: {
+                "Content-Type": "application/json",
+                "X-CSRFToken": getCookie("csrftoken"),
+            },
+            body: JSON.stringify(payload),
+        });
+        const responsePayload = await response.json();
+        if (!response.ok || !responsePayload.ok) {
+            if (transactionBulkActionError) {
+                transactionBulkActionError.textContent = collectFirstError(responsePayload.errors || {});
+            }
+            // O filtro mudou desde a confirmacao: recarrega para o proximo clique mostrar a contagem certa.
+            if (response.status === 409 && transactionsPaginated) {
+                loadTransactionsFromApi();
+            }
+            return;
+        }
+
+        triggerSuccessFeedback(applyTransactionBulkActionBtn);
+        if (transactionsPaginated) {
+            loadTransactionsFromApi();
+            return;
+        }
+        const affectedIds = new Set((responsePayload.transaction_ids || []).map((id) => Number(id)));
+        if (action === "delete") {
+            transactions = transactions.filter((transaction) => !affectedIds.has(transaction.id));
+        } else {
+            const targetBank = banks.find((bank) => String(bank.id) === String(payload.bank));
+            transactions = transactions.map((transaction) => {
+                if (!affectedIds.has(transaction.id)) {
+                    return transaction;
+                }
+                return action === "change_bank"
+                    ? { ...transaction, bank: targetBank || transaction.bank }
+                    : { ...transaction, transaction_date: payload.transaction_date };
+            });
+        }
+        refreshDashboard();
+    } catch (_error) {
+        if (transactionBulkActionError) {
+            transactionBulkActionError.textContent = "Erro de conexao. Tente novamente.";
+        }
+    } finally {
+        if (applyTransactionBulkActionBtn) {
+            applyTransactionBulkActionBtn.disabled = false;
+        }
+    }
+};
+
 const buildBankFilter = () => {
     if (!bankFilterContainer) {
         return;
@@ -1249,21 +1410,22 @@ const syncFilterButtons = () => {
 };
 
 const updateSummary = (filteredTransactions) => {
-    const income = filteredTransactions
-        .filter((transaction) => transaction.transaction_type === "income")
-        .reduce((total, transaction) => total + Number(transaction.amount), 0);
-    const expense = filteredTransactions
-        .filter((transaction) => transaction.transaction_type === "expense")
-        .reduce((total, transaction) => total + Number(transaction.amount), 0);
+    // Totais sempre do /api/summary/ (ou do resumo que vem com a pagina): o navegador nao soma o historico.
+    const serverSummary = transactionPage.summary || { income: 0, expense: 0, count: 0 };
+    const income = Number(serverSummary.income || 0);
+    const expense = Number(serverSummary.expense || 0);
     const balance = income - expense;
+    const matchedCount = serverSummary.count || 0;
 
     summaryBalance.textContent = formatCurrency(balance);
     summaryIncome.textContent = formatCurrency(income);
     summaryExpense.textContent = formatCurrency(expense);
-    summaryCount.textContent = String(filteredTransactions.length);
+    summaryCount.textContent = String(matchedCount);
 
     if (!hasActiveTransactionFilters()) {
-        transactionsSubtitle.textContent = "Visualizando todas";
+        transactionsSubtitle.textContent = transactionsPaginated
+            ? `Exibindo ${filteredTransactions.length} de ${matchedCount}`
+            : "Visualizando todas";
         return;
     }
 
@@ -1289,46 +1451,16 @@ const updateSummary = (filteredTransactions) => {
     if (queryTokens(transactionSearchQuery).length) {
         parts.push(`Busca: "${transactionSearchQuery.trim()}"`);
     }
-    transactionsSubtitle.textContent = `Exibindo ${filteredTransactions.length} de ${transactions.length} | ${parts.join(" | ")}`;
+    const totalCount = transactionsPaginated ? matchedCount : transactions.length;
+    transactionsSubtitle.textContent = `Exibindo ${filteredTransactions.length} de ${totalCount} | ${parts.join(" | ")}`;
 };
 
-const getMonthKey = (dateValue) => {
-    const date = new Date(`${dateValue}T00:00:00`);
-    return `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, "0")}`;
-};
-
-const buildChartSeries = (filteredTransactions) => {
-    const months = [];
-    const now = new Date();
-
-    for (let offset = 5; offset >= 0; offset -= 1) {
-        const monthDate = new Date(now.getFullYear(), now.getMonth() - offset, 1);
-        const key = `${monthDate.getFullYear()}-${String(monthDate.getMonth() + 1).padStart(2, "0")}`;
-        months.push({ key, label: monthLabels[monthDate.getMonth()] });
-    }
-
-    const map = {};
-    months.forEach((month) => {
-        map[month.key] = { income: 0, expense: 0 };
-    });
-
-    filteredTransactions.forEach((transaction) => {
-        const key = getMonthKey(transaction.transaction_date);
-        if (!map[key]) {
-            return;
-        }
-        const amount = Number(transaction.amount);
-        if (transaction.transaction_type === "income") {
-            map[key].income += amount;
-        } else {
-            map[key].expense += amount;
-        }
-    });
-
+const buildChartSeries = () => {
+    const chartMonths = transactionPage.summary?.chart || [];
     return {
-        categories: months.map((month) => month.label),
-        incomeData: months.map((month) => Number(map[month.key].income.toFixed(2))),
-        expenseData: months.map((month) => Number(map[month.key].expense.toFixed(2))),
+        categories: chartMonths.map((month) => monthLabels[Number(month.month.split("-")[1]) - 1]),
+        incomeData: chartMonths.map((month) => Number(Number(month.income).toFixed(2))),
+        expenseData: chartMonths.map((month) => Number(Number(month.expense).toFixed(2))),
     };
 };
 
@@ -1373,11 +1505,11 @@ const initChart = () => {
     chart.render();
 };
 
-const updateChart = (filteredTransactions) => {
+const updateChart = () => {
     if (!chart) {
         return;
     }
-    const series = buildChartSeries(filteredTransactions);
+    const series = buildChartSeries();
     chart.updateOptions({ xaxis: { categories: series.categories } });
     chart.updateSeries([
         { name: "Entradas", data: series.incomeData },
@@ -1402,6 +1534,17 @@ const renderTransactionsTable = (filteredTransactions) => {
         return a.transaction_date < b.transaction_date ? 1 : -1;
     });
 
+    const loadMoreRow =
+        transactionsPaginated && transactionPage.has_more
+            ? `
+                <tr>
+                    <td class="empty" colspan="6">
+                        <button type="button" class="btn btn-ghost" data-action="load-more">Carregar mais</button>
+                    </td>
+                </tr>
+            `
+            : "";
+
     transactionsBody.innerHTML = sorted
         .map((transaction) => {
             const isIncome = transaction.transaction_type === "income";
@@ -1435,14 +1578,101 @@ const renderTransactionsTable = (filteredTransactions) => {
                 </tr>
             `;
         })
-        .join("");
+        .join("") + loadMoreRow;
+};
+
+const buildTransactionListParams = (cursor = null) => {
+    const params = new URLSearchParams({
+        bank: activeBankFilter,
+        type: transactionTypeFilter,
+        period: transactionPeriodFilter,
+        q: transactionSearchQuery.trim(),
+    });
+    if (cursor) {
+        params.set("cursor", cursor);
+    }
+    return params;
+};
+
+const loadTransactionsFromApi = async ({ append = false } = {}) => {
+    if (!bodyData.transactionListUrl) {
+        return;
+    }
+    transactionRequestId += 1;
+    const requestId = transactionRequestId;
+    const cursor = append ? transactionPage.next_cursor : null;
+    try {
+        const response = await fetch(`${bodyData.transactionListUrl}?${buildTransactionListParams(cursor)}`, {
+            method: "GET",
+        });
+        const payload = await response.json();
+        if (requestId !== transactionRequestId || !response.ok || !payload.ok) {
+            return;
+        }
+        const rows = Array.isArray(payload.transactions) ? payload.transactions : [];
+        transactions = append ? [...transactions, ...rows] : rows;
+        transactionPage = {
+            ...transactionPage,
+            next_cursor: payload.next_cursor,
+            has_more: Boolean(payload.has_more),
+            summary: payload.summary || transactionPage.summary,
+        };
+        refreshDashboard();
+    } catch (_error) {
+        // noop
+    }
+};
+
+const applyTransactionFilters = () => {
+    if (!transactionsPaginated) {
+        refreshDashboard();
+        return;
+    }
+    syncFilterButtons();
+    loadTransactionsFromApi();
+};
+
+const adjustBankTransactionCount = (bankId, delta) => {
+    if (!transactionsPaginated || !bankId) {
+        return;
+    }
+    const counts = transactionPage.bank_transaction_counts || {};
+    counts[String(bankId)] = Math.max(0, (counts[String(bankId)] || 0) + delta);
+    transactionPage.bank_transaction_counts = counts;
+};
+
+const loadTransactionSummaryFromApi = async () => {
+    if (!bodyData.transactionSummaryUrl) {
+        return;
+    }
+    transactionSummaryRequestId += 1;
+    const requestId = transactionSummaryRequestId;
+    try {
+        const response = await fetch(`${bodyData.transactionSummaryUrl}?${buildTransactionListParams()}`, {
+            method: "GET",
+        });
+        const payload = await response.json();
+        if (requestId !== transactionSummaryRequestId || !response.ok || !payload.ok) {
+            return;
+        }
+        transactionPage = { ...transactionPage, summary: payload.summary };
+        updateSummary(getFilteredTransactions());
+        updateChart();
+    } catch (_error) {
+        // noop
+    }
 };
 
-const refreshDashboard = () => {
+const refreshDashboard = ({ reloadSummary = true } = {}) => {
     const filteredTransactions = getFilteredTransactions();
+    // No modo paginado o resumo chega junto com a pagina; sem ele, filtros e escritas pedem um novo.
+    if (!transactionsPaginated && reloadSummary) {
+        window.clearTimeout(transactionSummaryDebounceId);
+        transactionSummaryDebounceId = window.setTimeout(loadTransactionSummaryFromApi, 250);
+    }
     syncFilterButtons();
     updateSummary(filteredTransactions);
-    updateChart(filteredTransactions);
+    updateChart();
     renderTransactionsTable(filteredTransactions);
     updateDashboardReminders();
     refreshBanksTab();
@@ -2842,34 +3072,48 @@ const updatePayablesSummary = (filteredEntities, totalEntities) => {
     let pending = 0;
     let overdue = 0;
     let paid = 0;
-
-    filteredEntities.forEach((entity) => {
-        entity.members.forEach((payable) => {
-            const amount = Number(payable.amount);
-            if (payable.status === "paid") {
-                paid += amount;
-                return;
-            }
-            if (isPayableOverdue(payable)) {
-                overdue += amount;
-                return;
-            }
-            pending += amount;
+    let entityCount = filteredEntities.length;
+    let totalEntityCount = totalEntities.length;
+    let overdueEntityCount = 0;
+
+    if (payablesPaginated) {
+        // A tabela so tem as paginas ja carregadas: os totais vem do resumo do servidor.
+        const summary = payablePage.summary || {};
+        pending = Number(summary.pending_amount || 0);
+        overdue = Number(summary.overdue_amount || 0);
+        paid = Number(summary.paid_amount || 0);
+        entityCount = summary.entity_count || 0;
+        totalEntityCount = summary.total_entity_count || 0;
+        overdueEntityCount = summary.overdue_entity_count || 0;
+    } else {
+        filteredEntities.forEach((entity) => {
+            entity.members.forEach((payable) => {
+                const amount = Number(payable.amount);
+                if (payable.status === "paid") {
+                    paid += amount;
+                    return;
+                }
+                if (isPayableOverdue(payable)) {
+                    overdue += amount;
+                    return;
+                }
+                pending += amount;
+            });
         });
-    });
+        overdueEntityCount = filteredEntities.filter((entity) => entity.status_state === "overdue").length;
+    }
 
     summaryPayablePending.textContent = formatCurrency(pending);
     summaryPayableOverdue.textContent = formatCurrency(overdue);
     summaryPayablePaid.textContent = formatCurrency(paid);
-    summaryPayableCount.textContent = String(filteredEntities.length);
+    summaryPayableCount.textContent = String(entityCount);
 
-    const overdueEntityCount = filteredEntities.filter((entity) => entity.status_state === "overdue").length;
     if (!hasActivePayableFilters()) {
-        payablesSubtitle.textContent = `${filteredEntities.length} contas (${overdueEntityCount} vencidas)`;
+        payablesSubtitle.textContent = `${entityCount} contas (${overdueEntityCount} vencidas)`;
         return;
     }
 
-    payablesSubtitle.textContent = `Exibindo ${filteredEntities.length} de ${totalEntities.length} contas (${overdueEntityCount} vencidas)`;
+    payablesSubtitle.textContent = `Exibindo ${entityCount} de ${totalEntityCount} contas (${overdueEntityCount} vencidas)`;
 };
 
 const renderPayablesTable = (filteredEntities) => {
@@ -2884,12 +3128,26 @@ const renderPayablesTable = (filteredEntities) => {
         return;
     }
 
-    const sorted = [...filteredEntities].sort((a, b) => {
-        if (a.due_date === b.due_date) {
-            return b.id - a.id;
-        }
-        return a.due_date > b.due_date ? 1 : -1;
-    });
+    // As paginas do servidor ja chegam ordenadas; reordenar aqui embaralharia o "Carregar mais".
+    const sorted = payablesPaginated
+        ? filteredEntities
+        : [...filteredEntities].sort((a, b) => {
+              if (a.due_date === b.due_date) {
+                  return b.id - a.id;
+              }
+              return a.due_date > b.due_date ? 1 : -1;
+          });
+
+    const loadMoreRow =
+        payablesPaginated && payablePage.has_more
+            ? `
+                <tr>
+                    <td class="empty" colspan="8">
+                        <button type="button" class="btn btn-ghost" data-payable-action="load-more">Carregar mais</button>
+                    </td>
+                </tr>
+            `
+            : "";
 
     payablesBody.innerHTML = sorted
         .map((entity) => {
@@ -2953,10 +3211,13 @@ const renderPayablesTable = (filteredEntities) => {
                 </tr>
             `;
         })
-        .join("");
+        .join("") + loadMoreRow;
 };
 
 const getCurrentPayableFiltering = () => {
+    if (payablesPaginated) {
+        return { payableEntities: payablePage.entities, filteredEntities: payablePage.entities };
+    }
     const payableEntities = buildPayableEntities();
     const filteredEntities = getFilteredPayables(payableEntities);
     return { payableEntities, filteredEntities };
@@ -2989,17 +3250,33 @@ const renderPayableCalendar = () => {
     }).format(new Date(calendarYear, calendarMonth, 1));
     payableCalendarMonthLabel.textContent = monthLabel.charAt(0).toUpperCase() + monthLabel.slice(1);
 
-    const payableMapByDate = new Map();
-    payables.forEach((payable) => {
-        const isoDate = payable.due_date;
-        if (!payableMapByDate.has(isoDate)) {
-            payableMapByDate.set(isoDate, []);
+    const dayStatsByDate = new Map();
+    if (payablesPaginated) {
+        const monthKey = getPayableCalendarMonthKey();
+        const monthDays = payableCalendarCache.get(monthKey);
+        if (!monthDays) {
+            loadPayableCalendarMonth(monthKey);
         }
-        payableMapByDate.get(isoDate).push(payable);
-    });
+        Object.entries(monthDays || {}).forEach(([isoDate, stats]) => dayStatsByDate.set(isoDate, stats));
+    } else {
+        payables.forEach((payable) => {
+            const isoDate = payable.due_date;
+            const stats = dayStatsByDate.get(isoDate) || { total: 0, pending: 0, paid: 0, overdue: 0 };
+            stats.total += 1;
+            if (payable.status === "paid") {
+                stats.paid += 1;
+            } else if (payable.status === "pending") {
+                stats.pending += 1;
+                if (payable.due_date < initialData.today) {
+                    stats.overdue += 1;
+                }
+            }
+            dayStatsByDate.set(isoDate, stats);
+        });
+    }
 
     if (payableExactDateFilter) {
-        const count = payableMapByDate.get(payableExactDateFilter)?.length || 0;
+        const count = dayStatsByDate.get(payableExactDateFilter)?.total || 0;
         payableCalendarSelectionLabel.textContent = `${formatDate(payableExactDateFilter)} selecionado (${count} contas)`;
     } else {
         payableCalendarSelectionLabel.textContent = "Nenhum dia selecionado";
@@ -3020,13 +3297,13 @@ const renderPayableCalendar = () => {
         }
 
         const isoDate = toIsoDate(new Date(calendarYear, calendarMonth, dayNumber));
-        const dayPayables = payableMapByDate.get(isoDate) || [];
-        const pendingCount = dayPayables.filter((item) => item.status === "pending").length;
-        const paidCount = dayPayables.filter((item) => item.status === "paid").length;
+        const dayStats = dayStatsByDate.get(isoDate) || { total: 0, pending: 0, paid: 0, overdue: 0 };
+        const pendingCount = dayStats.pending;
+        const paidCount = dayStats.paid;
         const isSelected = payableExactDateFilter === isoDate;
         const isToday = isoDate === initialData.today;
-        const hasOverdue = dayPayables.some((item) => item.status === "pending" && item.due_date < initialData.today);
-        const hasPending = dayPayables.some((item) => item.status === "pending" && item.due_date >= initialData.today);
+        const hasOverdue = dayStats.overdue > 0;
+        const hasPending = dayStats.pending > dayStats.overdue;
         let toneClass = "";
         if (hasOverdue) {
             toneClass = "is-overdue";
@@ -3036,9 +3313,9 @@ const renderPayableCalendar = () => {
             toneClass = "is-paid";
         }
 
-        const countLabel = dayPayables.length ? `${dayPayables.length} contas` : "Sem contas";
+        const countLabel = dayStats.total ? `${dayStats.total} contas` : "Sem contas";
         const detailsLabel =
-            dayPayables.length > 0
+            dayStats.total > 0
                 ? `<small>${pendingCount} pend. | ${paidCount} pag.</small>`
                 : '<small>Sem lancamentos</small>';
         dayCells.push(`
@@ -3076,14 +3353,29 @@ const updatePayableBulkSummary = (filteredEntities) => {
     if (!payableBulkSummary) {
         return;
     }
-    const members = getFilteredPayableMembers(filteredEntities);
-    const pendingCount = members.filter((payable) => payable.status === "pending").length;
-    const paidCount = members.filter((payable) => payable.status === "paid").length;
-    const overdueCount = members.filter((payable) => isPayableOverdue(payable)).length;
-    const totalAmount = members.reduce((sum, payable) => sum + Number(payable.amount), 0);
-    payableBulkSummary.textContent = `${members.length} parcelas filtradas | ${pendingCount} pendentes | ${paidCount} pagas | ${overdueCount} vencidas | Total ${formatCurrency(totalAmount)}`;
+    let memberCount = 0;
+    let pendingCount = 0;
+    let paidCount = 0;
+    let overdueCount = 0;
+    let totalAmount = 0;
+    if (payablesPaginated) {
+        const summary = payablePage.summary || {};
+        memberCount = summary.member_count || 0;
+        pendingCount = summary.pending_count || 0;
+        paidCount = summary.paid_count || 0;
+        overdueCount = summary.overdue_count || 0;
+        totalAmount = Number(summary.amount_total || 0);
+    } else {
+        const members = getFilteredPayableMembers(filteredEntities);
+        memberCount = members.length;
+        pendingCount = members.filter((payable) => payable.status === "pending").length;
+        paidCount = members.filter((payable) => payable.status === "paid").length;
+        overdueCount = members.filter((payable) => isPayableOverdue(payable)).length;
+        totalAmount = members.reduce((sum, payable) => sum + Number(payable.amount), 0);
+    }
+    payableBulkSummary.textContent = `${memberCount} parcelas filtradas | ${pendingCount} pendentes | ${paidCount} pagas | ${overdueCount} vencidas | Total ${formatCurrency(totalAmount)}`;
     if (applyPayableBulkActionBtn) {
-        applyPayableBulkActionBtn.disabled = members.length === 0;
+        applyPayableBulkActionBtn.disabled = memberCount === 0;
     }
 };
 
@@ -3095,29 +3387,32 @@ const submitPayableBulkAction = async () => {
         payableBulkActionError.textContent = "";
     }
 
-    const { filteredEntities } = getCurrentPayableFiltering();
-    const members = getFilteredPayableMembers(filteredEntities);
-    if (!members.length) {
+    const action = payableBulkActionField.value || "mark_paid";
+    const payload = { action };
+    // Com paginacao a tela so conhece as paginas carregadas: o servidor aplica o mesmo filtro.
+    if (payablesPaginated) {
+        payload.filters = Object.fromEntries(buildPayableListParams().entries());
+    } else {
+        const { filteredEntities } = getCurrentPayableFiltering();
+        payload.payable_ids = getFilteredPayableMembers(filteredEntities).map((member) => member.id);
+    }
+    const memberCount = payablesPaginated ? payablePage.summary?.member_count || 0 : payload.payable_ids.length;
+    if (!memberCount) {
         if (payableBulkActionError) {
             payableBulkActionError.textContent = "Nenhuma conta no resultado filtrado.";
         }
         return;
     }
 
-    const action = payableBulkActionField.value || "mark_paid";
     if (action === "delete") {
         const confirmed = window.confirm(
-            `Deseja excluir ${members.length} contas da lista filtrada? Essa acao nao pode ser desfeita.`
+            `Deseja excluir ${memberCount} contas da lista filtrada? Essa acao nao pode ser desfeita.`
         );
         if (!confirmed) {
             return;
         }
     }
 
-    const payload = {
-        action,
-        payable_ids: members.map((member) => member.id),
-    };
     if (action === "mark_paid") {
         payload.payment_date = payableBulkPaymentDateField?.value || initialData.today;
         payload.payment_note = payableBulkPaymentNoteField?.value || "";
@@ -3143,16 +3438,35 @@ const submitPayableBulkAction = async () => {
             return;
         }
 
+        triggerSuccessFeedback(applyPayableBulkActionBtn);
         if (action === "delete") {
-            const deletedIds = Array.isArray(responsePayload.deleted_ids)
-                ? responsePayload.deleted_ids.map((id) => Number(id))
-                : [];
-            payables = payables.filter((payable) => !deletedIds.includes(payable.id));
+            const deletedIds = new Set(
+                Array.isArray(responsePayload.deleted_ids) ? responsePayload.deleted_ids.map((id) => Number(id)) : []
+            );
+            payables = payables.filter((payable) => !deletedIds.has(payable.id));
+            refreshPayables();
         } else {
-            mergeUpdatedPayables(responsePayload.payables || []);
+            // A resposta traz so os ids: aplica o novo status localmente e confirma pelo /api/sync/.
+            const updatedIds = new Set(
+                Array.isArray(responsePayload.updated_ids) ? responsePayload.updated_ids.map((id) => Number(id)) : []
+            );
+            const isPaid = action === "mark_paid";
+            payables = payables.map((payable) => {
+                if (!updatedIds.has(payable.id)) {
+                    return payable;
+                }
+                return {
+                    ...payable,
+                    status: isPaid ? "paid" : "pending",
+                    payment_date: isPaid ? payload.payment_date || initialData.today : null,
+                    payment_note: isPaid ? payload.payment_note.trim() : "",
+                    payment_receipt_url: isPaid ? payable.payment_receipt_url : null,
+                    payment_receipt_name: isPaid ? payable.payment_receipt_name : null,
+                };
+            });
+            refreshPayables();
+            syncChangesFromApi();
         }
-        triggerSuccessFeedback(applyPayableBulkActionBtn);
-        refreshPayables();
     } catch (_error) {
         if (payableBulkActionError) {
             payableBulkActionError.textContent = "Erro de conexao. Tente novamente.";
@@ -3233,16 +3547,136 @@ const submitPayableCategoryDelete = async (categoryId) => {
     }
 };
 
-const refreshPayables = () => {
+const buildPayableListParams = (cursor = null) => {
+    const params = new URLSearchParams({
+        status: payableStatusFilter,
+        type: payableTypeFilter,
+        category: payableCategoryFilter,
+        bank: payableBankFilter,
+        period: payablePeriodFilter,
+        q: payableSearchQuery.trim(),
+    });
+    if (payableExactDateFilter) {
+        params.set("date", payableExactDateFilter);
+    }
+    if (cursor) {
+        params.set("cursor", cursor);
+    }
+    return params;
+};
+
+const getPayableCalendarMonthKey = () =>
+    `${payableCalendarCursorDate.getFullYear()}-${String(payableCalendarCursorDate.getMonth() + 1).padStart(2, "0")}`;
+
+const loadPayableCalendarMonth = async (monthKey) => {
+    if (!bodyData.payableCalendarUrl || payableCalendarLoadingMonth === monthKey) {
+        return;
+    }
+    payableCalendarLoadingMonth = monthKey;
+    try {
+        const params = new URLSearchParams({ month: monthKey });
+        const response = await fetch(`${bodyData.payableCalendarUrl}?${params.toString()}`, { method: "GET" });
+        const payload = await response.json();
+        if (!response.ok || !payload.ok) {
+            return;
+        }
+        payableCalendarCache.set(payload.month, payload.days || {});
+        if (payload.month === getPayableCalendarMonthKey()) {
+            renderPayableCalendar();
+        }
+    } catch (_error) {
+        // noop
+    } finally {
+        if (payableCalendarLoadingMonth === monthKey) {
+            payableCalendarLoadingMonth = "";
+        }
+    }
+};
+
+const renderPayableListing = () => {
     const { payableEntities, filteredEntities } = getCurrentPayableFiltering();
     updatePayablesSummary(filteredEntities, payableEntities);
     renderPayablesTable(filteredEntities);
-    updateDashboardReminders();
-    updateReconciliationCard();
     updatePayableBulkSummary(filteredEntities);
     renderPayableCategoryList();
-    renderPayableCalendar();
     refreshBanksTab();
+};
+
+const loadPayablesFromApi = async ({ append = false } = {}) => {
+    if (!bodyData.payableListUrl) {
+        return;
+    }
+    payableRequestId += 1;
+    const requestId = payableRequestId;
+    const cursor = append ? payablePage.next_cursor : null;
+    try {
+        const response = await fetch(`${bodyData.payableListUrl}?${buildPayableListParams(cursor)}`, {
+            method: "GET",
+        });
+        const payload = await response.json();
+        if (requestId !== payableRequestId || !response.ok || !payload.ok) {
+            return;
+        }
+        const rows = Array.isArray(payload.entities) ? payload.entities : [];
+        payablePage = {
+            entities: append ? [...payablePage.entities, ...rows] : rows,
+            next_cursor: payload.next_cursor,
+            has_more: Boolean(payload.has_more),
+            summary: payload.summary || payablePage.summary,
+            usage: payload.usage || payablePage.usage,
+        };
+        renderPayableListing();
+    } catch (_error) {
+        // noop
+    }
+};
+
+const reloadPayablePage = () => {
+    // Filtros e escritas chegam em rajadas (digitacao, lote); uma unica ida ao servidor cobre todas.
+    window.clearTimeout(payableReloadDebounceId);
+    payableReloadDebounceId = window.setTimeout(() => {
+        const monthKey = getPayableCalendarMonthKey();
+        const currentMonthDays = payableCalendarCache.get(monthKey);
+        payableCalendarCache.clear();
+        if (currentMonthDays) {
+            payableCalendarCache.set(monthKey, currentMonthDays);
+        }
+        loadPayablesFromApi();
+        loadPayableCalendarMonth(monthKey);
+    }, 250);
+};
+
+const loadPayableInstallments = async (payableId) => {
+    if (!payablesPaginated) {
+        return true;
+    }
+    if (!bodyData.payableInstallmentsUrlTemplate) {
+        return false;
+    }
+    try {
+        const response = await fetch(getResourceUrl(bodyData.payableInstallmentsUrlTemplate, payableId), {
+            method: "GET",
+        });
+        const payload = await response.json();
+        if (!response.ok || !payload.ok) {
+            return false;
+        }
+        payables = mergeSyncedRecords(payables, payload.payables || []);
+        return true;
+    } catch (_error) {
+        return false;
+    }
+};
+
+const refreshPayables = ({ reload = true } = {}) => {
+    if (payablesPaginated && reload) {
+        reloadPayablePage();
+    } else {
+        renderPayableListing();
+    }
+    updateDashboardReminders();
+    updateReconciliationCard();
+    renderPayableCalendar();
     if (activeInstallmentDetailsId) {
         renderInstallmentDetails(activeInstallmentDetailsId);
     }
@@ -3254,21 +3688,37 @@ const getBankUsageMap = () => {
         usageMap.set(bank.id, { transactions: 0, payables: 0 });
     });
 
-    transactions.forEach((transaction) => {
-        const bankId = transaction.bank?.id;
-        if (!usageMap.has(bankId)) {
-            return;
-        }
-        usageMap.get(bankId).transactions += 1;
-    });
+    if (transactionsPaginated) {
+        Object.entries(transactionPage.bank_transaction_counts || {}).forEach(([bankId, total]) => {
+            if (usageMap.has(Number(bankId))) {
+                usageMap.get(Number(bankId)).transactions = total;
+            }
+        });
+    } else {
+        transactions.forEach((transaction) => {
+            const bankId = transaction.bank?.id;
+            if (!usageMap.has(bankId)) {
+                return;
+            }
+            usageMap.get(bankId).transactions += 1;
+        });
+    }
 
-    payables.forEach((payable) => {
-        const bankId = payable.bank?.id;
-        if (!usageMap.has(bankId)) {
-            return;
-        }
-        usageMap.get(bankId).payables += 1;
-    });
+    if (payablesPaginated) {
+        Object.entries(payablePage.usage?.banks || {}).forEach(([bankId, total]) => {
+            if (usageMap.has(Number(bankId))) {
+                usageMap.get(Number(bankId)).payables = total;
+            }
+        });
+    } else {
+        payables.forEach((payable) => {
+            const bankId = payable.bank?.id;
+            if (!usageMap.has(bankId)) {
+                return;
+            }
+            usageMap.get(bankId).payables += 1;
+        });
+    }
 
     return usageMap;
 };
@@ -3342,6 +3792,14 @@ const refreshBanksTab = () => {
 const getCategoryUsageMap = () => {
     const usageMap = new Map();
     payableCategories.forEach((category) => usageMap.set(category.id, 0));
+    if (payablesPaginated) {
+        Object.entries(payablePage.usage?.categories || {}).forEach(([categoryId, total]) => {
+            if (usageMap.has(Number(categoryId))) {
+                usageMap.set(Number(categoryId), total);
+            }
+        });
+        return usageMap;
+    }
     payables.forEach((payable) => {
         const categoryId = payable.category?.id;
         if (!usageMap.has(categoryId)) {
@@ -3431,6 +3889,7 @@ const syncBankUiState = () => {
     renderPayableCategoryOptions();
     renderPayableCategoryFilterOptions();
     renderReportBankOptions();
+    renderTransactionBulkBankOptions();
     buildBankFilter();
 
     if (openCreateModalBtn) {
@@ -3529,6 +3988,9 @@ const togglePayableConditionalFields = () => {
 
     installmentFields.classList.toggle("is-hidden", !isInstallment);
     recurringFieldRow.classList.toggle("is-hidden", !isSubscription);
+    if (recurrencePeriodRow) {
+        recurrencePeriodRow.classList.toggle("is-hidden", !isSubscription);
+    }
     if (payableAmountLabel) {
         payableAmountLabel.textContent = isInstallment ? "Valor total" : "Valor";
     }
@@ -3546,6 +4008,9 @@ const togglePayableConditionalFields = () => {
 
     if (!isSubscription) {
         payableRecurringField.checked = false;
+        if (payableRecurrencePeriodField) {
+            payableRecurrencePeriodField.value = "monthly";
+        }
     }
 };
 
@@ -3614,7 +4079,7 @@ const clearTransactionFilters = () => {
     if (transactionPeriodFilterSelect) {
         transactionPeriodFilterSelect.value = "all";
     }
-    refreshDashboard();
+    applyTransactionFilters();
 };
 
 const clearPayableFilters = () => {
@@ -3674,6 +4139,9 @@ const openPayableEditModal = (payableId) => {
     payableInstallmentNumberField.value = payable.installment_number || "1";
     payableInstallmentTotalField.value = payable.installment_total || "";
     payableRecurringField.checked = Boolean(payable.is_recurring);
+    if (payableRecurrencePeriodField) {
+        payableRecurrencePeriodField.value = payable.recurrence_period || "monthly";
+    }
     payableDescriptionField.value = payable.description || "";
     payableFormError.textContent = "";
     togglePayableConditionalFields();
@@ -3707,14 +4175,21 @@ const submitTransaction = async (event) => {
         }
 
         if (isEdit) {
+            const previousTransaction = transactions.find((transaction) => transaction.id === payload.transaction.id);
+            adjustBankTransactionCount(previousTransaction?.bank?.id, -1);
             transactions = transactions.map((transaction) =>
                 transaction.id === payload.transaction.id ? payload.transaction : transaction
             );
         } else {
             transactions.unshift(payload.transaction);
         }
+        adjustBankTransactionCount(payload.transaction.bank?.id, 1);
 
         closeModal("formModal");
+        if (transactionsPaginated) {
+            loadTransactionsFromApi();
+            return;
+        }
         refreshDashboard();
     } catch (_error) {
         formError.textContent = "Erro de conexao. Tente novamente.";
@@ -3737,9 +4212,15 @@ const submitDelete = async () => {
             return;
         }
 
+        const deletedTransaction = transactions.find((transaction) => transaction.id === payload.deleted_id);
+        adjustBankTransactionCount(deletedTransaction?.bank?.id, -1);
         transactions = transactions.filter((transaction) => transaction.id !== payload.deleted_id);
         deleteCandidateId = null;
         closeModal("deleteModal");
+        if (transactionsPaginated) {
+            loadTransactionsFromApi();
+            return;
+        }
         refreshDashboard();
     } catch (_error) {
         // noop
@@ -4132,6 +4613,48 @@ const submitInstallmentBulkAction = async (action) => {
     }
 };
 
+const submitInstallmentReschedule = async () => {
+    if (!activeInstallmentDetailsId || !bodyData.payableInstallmentRescheduleUrlTemplate) {
+        return;
+    }
+    const endpoint = getResourceUrl(bodyData.payableInstallmentRescheduleUrlTemplate, activeInstallmentDetailsId);
+    const formData = new FormData();
+    // Campos vazios mantem a data, a quantidade e o valor atuais das parcelas restantes.
+    formData.set("start_date", installmentRescheduleStartField?.value || "");
+    formData.set("installment_count", installmentRescheduleCountField?.value || "");
+    formData.set("amount", installmentRescheduleAmountField?.value || "");
+    if (installmentBulkError) {
+        installmentBulkError.textContent = "";
+    }
+
+    try {
+        const response = await fetch(endpoint, {
+            method: "POST",
+            headers: { "X-CSRFToken": getCookie("csrftoken") },
+            body: formData,
+        });
+        const payload = await response.json();
+
+        if (!response.ok || !payload.ok) {
+            if (installmentBulkError) {
+                installmentBulkError.textContent = collectFirstError(payload.errors || {});
+            }
+            return;
+        }
+
+        const deletedIds = (payload.deleted_ids || []).map((id) => Number(id));
+        payables = mergeSyncedRecords(payables, payload.payables || [], deletedIds);
+        if (deletedIds.includes(activeInstallmentDetailsId) && payload.payables?.length) {
+            activeInstallmentDetailsId = payload.payables[0].id;
+        }
+        refreshPayables();
+    } catch (_error) {
+        if (installmentBulkError) {
+            installmentBulkError.textContent = "Erro de conexao. Tente novamente.";
+        }
+    }
+};
+
 const submitReportExport = async () => {
     if (
         !reportTypeFilterSelect ||
@@ -4308,34 +4831,50 @@ const initEvents = () => {
                 return;
             }
             activeBankFilter = filterButton.dataset.filter;
-            refreshDashboard();
+            applyTransactionFilters();
         });
     }
 
     if (transactionSearchInput) {
         transactionSearchInput.addEventListener("input", () => {
             transactionSearchQuery = transactionSearchInput.value;
-            refreshDashboard();
+            if (!transactionsPaginated) {
+                refreshDashboard();
+                return;
+            }
+            window.clearTimeout(transactionSearchDebounceId);
+            transactionSearchDebounceId = window.setTimeout(applyTransactionFilters, 300);
         });
     }
 
     if (transactionTypeFilterSelect) {
         transactionTypeFilterSelect.addEventListener("change", () => {
             transactionTypeFilter = transactionTypeFilterSelect.value;
-            refreshDashboard();
+            applyTransactionFilters();
         });
     }
 
     if (transactionPeriodFilterSelect) {
         transactionPeriodFilterSelect.addEventListener("change", () => {
             transactionPeriodFilter = transactionPeriodFilterSelect.value;
-            refreshDashboard();
+            applyTransactionFilters();
         });
     }
 
     if (clearTransactionFiltersBtn) {
         clearTransactionFiltersBtn.addEventListener("click", clearTransactionFilters);
     }
+    if (transactionBulkActionField) {
+        transactionBulkActionField.addEventListener("change", () => {
+            syncTransactionBulkActionFields();
+            if (transactionBulkActionError) {
+                transactionBulkActionError.textContent = "";
+            }
+        });
+    }
+    if (applyTransactionBulkActionBtn) {
+        applyTransactionBulkActionBtn.addEventListener("click", submitTransactionBulkAction);
+    }
 
     if (exportReportBtn) {
         exportReportBtn.addEventListener("click", submitReportExport);
@@ -4551,6 +5090,10 @@ const initEvents = () => {
 
     if (transactionsBody) {
         transactionsBody.addEventListener("click", (event) => {
+            if (event.target.closest('[data-action="load-more"]')) {
+                loadTransactionsFromApi({ append: true });
+                return;
+            }
             const actionButton = event.target.closest(".action-btn");
             if (!actionButton) {
                 return;
@@ -4569,19 +5112,28 @@ const initEvents = () => {
     }
 
     if (payablesBody) {
-        payablesBody.addEventListener("click", (event) => {
+        payablesBody.addEventListener("click", async (event) => {
             const actionButton = event.target.closest("[data-payable-action]");
             if (!actionButton) {
                 return;
             }
             const action = actionButton.dataset.payableAction;
+            if (action === "load-more") {
+                loadPayablesFromApi({ append: true });
+                return;
+            }
             const payableId = Number(actionButton.dataset.id);
             if (action === "details") {
-                openInstallmentDetailsModal(payableId);
+                // No modo paginado as parcelas do grupo ainda nao estao no navegador.
+                if (await loadPayableInstallments(payableId)) {
+                    openInstallmentDetailsModal(payableId);
+                }
                 return;
             }
             if (action === "edit") {
-                openPayableEditModal(payableId);
+                if (await loadPayableInstallments(payableId)) {
+                    openPayableEditModal(payableId);
+                }
                 return;
             }
             if (action === "delete") {
@@ -4767,6 +5319,9 @@ const initEvents = () => {
             submitInstallmentBulkAction("reopen_all");
         });
     }
+    if (installmentRescheduleBtn) {
+        installmentRescheduleBtn.addEventListener("click", submitInstallmentReschedule);
+    }
     if (installmentDetailsExpandBtn) {
         installmentDetailsExpandBtn.addEventListener("click", toggleInstallmentDetailsModalExpanded);
     }
@@ -4831,6 +5386,99 @@ const initEvents = () => {
     });
 };
 
+const mergeSyncedRecords = (items, changed = [], deletedIds = []) => {
+    const deleted = new Set(deletedIds);
+    const changedById = new Map(changed.map((item) => [item.id, item]));
+    const merged = items
+        .filter((item) => !deleted.has(item.id))
+        .map((item) => {
+            const updated = changedById.get(item.id);
+            changedById.delete(item.id);
+            return updated || item;
+        });
+    // Registros novos entram no topo, como nas criacoes feitas pela propria tela.
+    return [...Array.from(changedById.values()).filter((item) => !deleted.has(item.id)), ...merged];
+};
+
+const applySyncPayload = (payload) => {
+    if (payload.full_reload) {
+        if (transactionsPaginated) {
+            loadTransactionsFromApi();
+        }
+        if (payablesPaginated) {
+            loadPayablesFromApi();
+        }
+        loadEventsFromApi();
+        return;
+    }
+    const changes = payload.changes || {};
+    const deleted = payload.deleted || {};
+    const hasChanges = (key) => (changes[key] || []).length || (deleted[key] || []).length;
+
+    if (hasChanges("banks") || hasChanges("categories")) {
+        banks = mergeSyncedRecords(banks, changes.banks, deleted.banks);
+        payableCategories = mergeSyncedRecords(payableCategories, changes.categories, deleted.categories);
+        syncBankUiState();
+        refreshBanksTab();
+    }
+    if (hasChanges("transactions")) {
+        if (transactionsPaginated) {
+            loadTransactionsFromApi();
+        } else {
+            transactions = mergeSyncedRecords(transactions, changes.transactions, deleted.transactions);
+            refreshDashboard();
+        }
+    }
+    if (hasChanges("payables")) {
+        payables = mergeSyncedRecords(payables, changes.payables, deleted.payables);
+        refreshPayables();
+    }
+    if (hasChanges("events")) {
+        events = mergeSyncedRecords(events, changes.events, deleted.events);
+        refreshEvents();
+    }
+};
+
+const syncChangesFromApi = async () => {
+    if (!bodyData.syncUrl) {
+        return;
+    }
+    if (syncInFlight) {
+        syncPending = true;
+        return;
+    }
+    syncInFlight = true;
+    try {
+        const params = new URLSearchParams({ since: syncToken });
+        const response = await fetch(`${bodyData.syncUrl}?${params.toString()}`, { method: "GET" });
+        const payload = await response.json();
+        if (response.ok && payload.ok) {
+            syncToken = payload.token;
+            applySyncPayload(payload);
+        }
+    } catch (_error) {
+        // noop
+    } finally {
+        syncInFlight = false;
+        if (syncPending) {
+            syncPending = false;
+            syncChangesFromApi();
+        }
+    }
+};
+
+const initLiveUpdates = () => {
+    if (!bodyData.liveUpdatesUrl || !window.EventSource) {
+        return;
+    }
+    const source = new EventSource(bodyData.liveUpdatesUrl);
+    source.addEventListener("change", () => {
+        // Acoes em lote geram varias notificacoes seguidas; uma unica busca ao /api/sync/ cobre todas.
+        window.clearTimeout(syncDebounceId);
+        syncDebounceId = window.setTimeout(syncChangesFromApi, 300);
+    });
+};
+
 const init = () => {
     if (!dateField.value) {
         dateField.value = initialData.today;
@@ -4844,6 +5492,9 @@ const init = () => {
     if (payableBulkPaymentDateField && !payableBulkPaymentDateField.value) {
         payableBulkPaymentDateField.value = initialData.today;
     }
+    if (transactionBulkDateField && !transactionBulkDateField.value) {
+        transactionBulkDateField.value = initialData.today;
+    }
     if (eventStartsAtField && !eventStartsAtField.value) {
         const now = new Date();
         eventStartsAtField.value = toDatetimeLocalInputValue(now.toISOString());
@@ -4859,16 +5510,18 @@ const init = () => {
     syncBankUiState();
     resetPayableCategoryForm();
     syncPayableBulkActionFields();
+    syncTransactionBulkActionFields();
     syncPayablePaymentFields();
     initChart();
     initTabs();
     initEvents();
     setActiveTab(activeTab);
-    refreshDashboard();
+    refreshDashboard({ reloadSummary: false });
     refreshEvents();
     loadEventsFromApi();
-    refreshPayables();
+    refreshPayables({ reload: false });
     refreshBanksTab();
+    initLiveUpdates();
 };
 
 init();